@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of the import time of 'tugmeteo' in fresh interpreters.
+
+Every case runs in a new Python process, like a cron script would, and
+reports the best wall time of '--repeat' processes (interpreter start up
+included, 'python' is the bare interpreter) and the heavy modules
+(pandas, numpy, bs4) that the case loaded. Importing the package and
+reading the live readings must not load any of them; the script exits
+with status 1 if they do.
+
+Results can be saved as JSON and compared against a saved baseline.
+Cases slower than the baseline by more than '--threshold' are reported
+as regressions and the script exits with status 1.
+
+Usage
+-----
+    python benchmarks/bench_import.py [--repeat 10]
+    python benchmarks/bench_import.py --save baseline.json
+    python benchmarks/bench_import.py --baseline baseline.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+
+from benchutil import compare
+
+
+_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+_heavy_modules = ('pandas', 'numpy', 'bs4')
+
+_template = '''
+import sys
+{code}
+print(','.join(m for m in {heavy!r} if m in sys.modules))
+'''
+
+# (name, code, heavy modules allowed)
+_cases = [
+    ('python', 'pass', False),
+    ('import tugmeteo', 'import tugmeteo', False),
+    ('TugMeteo()', 'import tugmeteo\ntugmeteo.TugMeteo()', False),
+    ('parse_meteo_page',
+     'from tugmeteo.helper import parse_meteo_page\n'
+     'from tugmeteo.synthetic import generate_meteo_page\n'
+     'parse_meteo_page(generate_meteo_page("T100"), "T100")', False),
+    ('parse_meteo_archive',
+     'from tugmeteo.helper import parse_meteo_archive\n'
+     'from tugmeteo.synthetic import generate_meteo_archive\n'
+     'from datetime import date\n'
+     'parse_meteo_archive(generate_meteo_archive("T100", date.today()))',
+     True)]
+
+
+def measure(code, repeat):
+    source = _template.format(code=code, heavy=_heavy_modules)
+    env = dict(os.environ, PYTHONPATH=_root)
+
+    best = None
+    loaded = ''
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, '-c', source], env=env,
+                                check=True, capture_output=True,
+                                text=True).stdout
+        elapsed = time.perf_counter() - start
+
+        best = elapsed if best is None else min(best, elapsed)
+        loaded = output.strip()
+
+    return best, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--save', help='write results to a JSON file')
+    parser.add_argument('--baseline', help='compare with a JSON file')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='relative slowdown reported as a regression')
+    args = parser.parse_args()
+
+    print('python {}'.format(platform.python_version()))
+    print()
+    print('{:<24} {:>10}  {}'.format('case', 'time', 'heavy modules'))
+
+    results = dict()
+    failed = False
+
+    for name, code, heavy in _cases:
+        elapsed, loaded = measure(code, args.repeat)
+        results[name] = {'time': elapsed, 'loaded': loaded}
+
+        flag = ''
+        if loaded and not heavy:
+            flag = '  UNEXPECTED'
+            failed = True
+
+        print('{:<24} {:>8.1f}ms  {}{}'.format(
+            name, elapsed * 1e3, loaded or '-', flag))
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+        if compare(results, baseline, args.threshold, width=24, digits=1):
+            failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
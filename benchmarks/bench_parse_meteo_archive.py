@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of 'parse_meteo_archive' on a year of synthetic archive files.
+
+Compares the current single-pass parser with the previous implementation
+(pandas dtype inference, unit row dropped afterwards, per-column
+'pd.to_numeric').
+
+Usage
+-----
+    python benchmarks/bench_parse_meteo_archive.py [--days 365] [--repeat 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+from io import StringIO
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from tugmeteo.helper import parse_meteo_archive  # noqa: E402
+from tugmeteo.synthetic import generate_meteo_archive  # noqa: E402
+
+
+def parse_meteo_archive_previous(raw_archive):
+    t = pd.read_csv(StringIO(raw_archive), sep='\t')
+
+    t.rename(columns={'--Timestamp---': 'Timestamp'}, inplace=True)
+    t['Timestamp'] = pd.to_datetime(t['Timestamp'], format='%Y%m%d %H:%M',
+                                    errors='coerce')
+
+    t = t.drop(t.index[0])
+    t.index = np.arange(0, len(t))
+
+    mask = t['Timestamp'].notna()
+    t = t[mask]
+
+    for key in t.columns[1:].values:
+        t[key] = pd.to_numeric(t[key])
+
+    return t
+
+
+def run(parser, raw_archives, repeat):
+    best = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for raw_archive in raw_archives:
+            parser(raw_archive)
+        elapsed = time.perf_counter() - start
+
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--telescope', default='T100')
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    start = date(2019, 1, 1)
+    raw_archives = [
+        generate_meteo_archive(args.telescope, start + timedelta(days=i))
+        for i in range(args.days)]
+
+    size = sum(len(raw_archive) for raw_archive in raw_archives)
+    print('{} files, {:.1f} MB'.format(len(raw_archives), size / 2 ** 20))
+
+    previous = run(parse_meteo_archive_previous, raw_archives, args.repeat)
+    current = run(parse_meteo_archive, raw_archives, args.repeat)
+
+    print('previous : {:8.3f} s'.format(previous))
+    print('current  : {:8.3f} s'.format(current))
+    print('speedup  : {:8.2f}x'.format(previous / current))
+
+
+if __name__ == '__main__':
+    main()
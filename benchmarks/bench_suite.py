@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+
+"""
+Micro-benchmark suite of the parsing and URL generation hot paths.
+
+Every case runs on synthetic fixtures ('tugmeteo.synthetic') at several
+sizes and reports the best wall time of '--repeat' runs and the peak
+memory allocated during one run (tracemalloc, measured separately so
+that tracing does not distort the timings).
+
+Results can be saved as JSON and compared against a saved baseline.
+Cases slower than the baseline by more than '--threshold' are reported
+as regressions and the script exits with status 1.
+
+Usage
+-----
+    python benchmarks/bench_suite.py [--filter archive] [--quick]
+    python benchmarks/bench_suite.py --save baseline.json
+    python benchmarks/bench_suite.py --baseline baseline.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from tugmeteo.helper import parse_meteo_page, parse_meteo_archive, \
+    concat_meteo_archive, generate_meteo_archive_urls  # noqa: E402
+from tugmeteo.synthetic import generate_meteo_page, \
+    generate_meteo_archive  # noqa: E402
+
+from benchutil import compare  # noqa: E402
+
+
+_start = date(2019, 1, 1)
+
+
+def _archives(telescope, days, invalid_rate=0.0):
+    return [generate_meteo_archive(telescope, _start + timedelta(days=i),
+                                   invalid_rate=invalid_rate)
+            for i in range(days)]
+
+
+def _concat_reference(tables):
+    # concat_meteo_archive before the aligned schema: a plain pd.concat
+    # and a mask chained column by column. It is the 'before' case.
+    t = pd.concat(tables, ignore_index=True)
+
+    mask = t.iloc[:, 1] > -50
+    for column in t.columns[2:]:
+        mask &= t[column] > -50
+
+    return t[mask]
+
+
+def page_case(telescope, pages):
+    html = [generate_meteo_page(telescope, seed=i) for i in range(pages)]
+
+    def run():
+        for page in html:
+            parse_meteo_page(page, telescope)
+
+    return run
+
+
+def archive_case(telescope, days):
+    raw_archives = _archives(telescope, days)
+
+    def run():
+        for raw_archive in raw_archives:
+            parse_meteo_archive(raw_archive)
+
+    return run
+
+
+def concat_case(telescope, days, invalid_rate=0.0,
+                concat=concat_meteo_archive):
+    tables = [parse_meteo_archive(raw)
+              for raw in _archives(telescope, days, invalid_rate)]
+
+    def run():
+        concat(tables)
+
+    return run
+
+
+def urls_case(telescope, days):
+    end_date = (_start + timedelta(days=days)).strftime('%Y-%m-%d')
+
+    def run():
+        generate_meteo_archive_urls(telescope, _start.strftime('%Y-%m-%d'),
+                                    end_date, '%Y-%m-%d')
+
+    return run
+
+
+# (name, fixture factory, sizes, quick sizes)
+_cases = [
+    ('parse_meteo_page[RTT150]', lambda n: page_case('RTT150', n),
+     [10, 100, 1000], [10, 100]),
+    ('parse_meteo_page[T100]', lambda n: page_case('T100', n),
+     [10, 100, 1000], [10, 100]),
+    ('parse_meteo_page[T60]', lambda n: page_case('T60', n),
+     [10, 100, 1000], [10, 100]),
+    ('parse_meteo_archive[RTT150]', lambda n: archive_case('RTT150', n),
+     [1, 30, 365], [1, 30]),
+    ('parse_meteo_archive[T100]', lambda n: archive_case('T100', n),
+     [1, 30, 365], [1, 30]),
+    ('concat_meteo_archive[T100]', lambda n: concat_case('T100', n),
+     [30, 365, 1095], [30, 365]),
+    ('concat_meteo_archive[T100,5% bad]',
+     lambda n: concat_case('T100', n, 0.05), [30, 365, 1095], [30, 365]),
+    ('concat_reference[T100]',
+     lambda n: concat_case('T100', n, concat=_concat_reference),
+     [30, 365, 1095], [30, 365]),
+    ('concat_reference[T100,5% bad]',
+     lambda n: concat_case('T100', n, 0.05, _concat_reference),
+     [30, 365, 1095], [30, 365]),
+    ('generate_meteo_archive_urls[T60]', lambda n: urls_case('T60', n),
+     [30, 365, 3650], [30, 365])]
+
+
+def measure(run, repeat):
+    run()
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--filter', default='',
+                        help='run only cases whose name contains this')
+    parser.add_argument('--quick', action='store_true',
+                        help='skip the largest sizes')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--save', help='write results to a JSON file')
+    parser.add_argument('--baseline', help='compare with a JSON file')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='relative slowdown reported as a regression')
+    args = parser.parse_args()
+
+    print('python {}, numpy {}, pandas {}'.format(
+        platform.python_version(), np.__version__, pd.__version__))
+    print()
+    print('{:<40} {:>10} {:>12} {:>10}'.format(
+        'case', 'time', 'per item', 'peak'))
+
+    results = dict()
+
+    for name, factory, sizes, quick_sizes in _cases:
+        if args.filter not in name:
+            continue
+
+        for n in (quick_sizes if args.quick else sizes):
+            elapsed, peak = measure(factory(n), args.repeat)
+
+            key = '{} n={}'.format(name, n)
+            results[key] = {'time': elapsed, 'peak': peak, 'n': n}
+
+            print('{:<40} {:>8.2f}ms {:>10.1f}us {:>8.2f}MB'.format(
+                key, elapsed * 1e3, elapsed / n * 1e6, peak / 2 ** 20))
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
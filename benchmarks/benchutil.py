@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+
+"""
+Helpers shared by the benchmark scripts.
+"""
+
+
+def compare(results, baseline, threshold, width=40, digits=2):
+    """
+    Prints results next to a saved baseline and returns the keys of the
+    cases slower than the baseline by more than 'threshold'.
+
+    'results' and 'baseline' map case names to dicts with a 'time' in
+    seconds. Times are printed in milliseconds with 'digits' decimals.
+    """
+
+    regressions = list()
+
+    print()
+    print('{:<{w}} {:>10} {:>10} {:>8}'.format(
+        'case', 'baseline', 'current', 'change', w=width))
+
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+
+        before = baseline[key]['time']
+        change = result['time'] / before - 1
+
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressions.append(key)
+
+        print('{:<{w}} {:>8.{d}f}ms {:>8.{d}f}ms {:>+7.1%}{}'.format(
+            key, before * 1e3, result['time'] * 1e3, change, flag,
+            w=width, d=digits))
+
+    return regressions
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+
+"""
+'ArchiveCache' expiry, eviction and recovery, offline against the stand-in
+server.
+"""
+
+import os
+import time
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from tugmeteo import TugMeteo, ArchiveCache
+from tugmeteo.standin import StandInServer
+from tugmeteo.synthetic import generate_meteo_archive
+
+
+@pytest.fixture(scope='module')
+def server():
+    with StandInServer() as s:
+        yield s
+
+
+def _set_times(path, atime=None, mtime=None):
+    st = os.stat(path)
+
+    os.utime(path, (st.st_atime if atime is None else atime,
+                    st.st_mtime if mtime is None else mtime))
+
+
+def test_past_day_is_kept(tmp_path):
+    cache = ArchiveCache(str(tmp_path), today_ttl=60)
+
+    day = date(2019, 1, 1)
+    raw = generate_meteo_archive('T100', day)
+
+    cache.set('T100', day, raw)
+
+    # Written after the day was over, so it never expires.
+    _set_times(cache._get_path('T100', day),
+               mtime=datetime(2019, 1, 3).timestamp())
+
+    assert cache.contains('T100', day)
+    assert cache.get('T100', day) == raw
+
+
+def test_today_expires(tmp_path):
+    cache = ArchiveCache(str(tmp_path), today_ttl=60)
+
+    today = date.today()
+    raw = generate_meteo_archive('T100', today)
+
+    cache.set('T100', today, raw)
+
+    assert cache.contains('T100', today)
+    assert cache.get('T100', today) == raw
+
+    _set_times(cache._get_path('T100', today), mtime=time.time() - 120)
+
+    assert not cache.contains('T100', today)
+    assert cache.get('T100', today) is None
+
+
+def test_day_cached_before_its_end_expires(tmp_path):
+    cache = ArchiveCache(str(tmp_path), today_ttl=60)
+
+    day = date.today() - timedelta(days=2)
+
+    cache.set('T100', day, generate_meteo_archive('T100', day))
+
+    # Cached at noon of that day, while the file was still growing.
+    _set_times(cache._get_path('T100', day),
+               mtime=datetime(day.year, day.month, day.day, 12).timestamp())
+
+    assert cache.get('T100', day) is None
+
+
+def test_least_recently_used_files_are_evicted(tmp_path):
+    days = [date(2019, 1, 1), date(2019, 1, 2), date(2019, 1, 3)]
+    raws = [generate_meteo_archive('T100', d) for d in days]
+    sizes = [len(raw.encode()) for raw in raws]
+
+    # Room for any two of the files, not for all three.
+    max_size = sizes[0] + max(sizes[1], sizes[2])
+
+    cache = ArchiveCache(str(tmp_path), max_size=max_size)
+
+    cache.set('T100', days[0], raws[0])
+    cache.set('T100', days[1], raws[1])
+
+    _set_times(cache._get_path('T100', days[0]), atime=1000)
+    _set_times(cache._get_path('T100', days[1]), atime=2000)
+
+    # Reading the older file makes the other one the least recently used.
+    assert cache.get('T100', days[0]) == raws[0]
+
+    cache.set('T100', days[2], raws[2])
+
+    assert cache.contains('T100', days[0])
+    assert not cache.contains('T100', days[1])
+    assert cache.contains('T100', days[2])
+    assert cache.size <= max_size
+
+
+def test_cached_days_are_not_downloaded_again(tmp_path, server):
+    met = TugMeteo(archive_cache=str(tmp_path), base_urls=server.url)
+
+    first = met.get_meteo_archives('T100', '2019-01-01', '2019-01-05')
+
+    server.reset_stats()
+    second = met.get_meteo_archives('T100', '2019-01-01', '2019-01-05')
+
+    assert server.stats['requests'] == 0
+    assert second.equals(first)
+
+
+@pytest.mark.parametrize('content', [
+    b'\xff\xfe\x00\x81 not utf-8',
+    b'',
+    b'--Timestamp---\t   Temp ',
+    b'--Timestamp---\t   Temp \r\nyyyymm'])
+def test_damaged_file_is_downloaded_again(tmp_path, server, content):
+    cache = ArchiveCache(str(tmp_path))
+
+    day = date(2019, 1, 1)
+    path = cache._get_path('T100', day)
+
+    os.makedirs(os.path.dirname(path))
+    with open(path, 'wb') as f:
+        f.write(content)
+
+    assert cache.get('T100', day) is None
+    assert not os.path.exists(path)
+
+    with open(path, 'wb') as f:
+        f.write(content)
+
+    met = TugMeteo(archive_cache=cache, base_urls=server.url)
+
+    t = met.get_meteo_archives('T100', '2019-01-01', '2019-01-02')
+    expected = TugMeteo(base_urls=server.url).get_meteo_archives(
+        'T100', '2019-01-01', '2019-01-02')
+
+    assert t.equals(expected)
+    assert cache.get('T100', day) == generate_meteo_archive('T100', day)
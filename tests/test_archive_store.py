@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+
+"""
+'ArchiveStore' round-trips and missing day detection, and
+'query_meteo_archives' against the stand-in server.
+"""
+
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from tugmeteo import TugMeteo, ArchiveStore
+from tugmeteo.helper import parse_meteo_archive, concat_meteo_archive
+from tugmeteo.standin import StandInServer
+from tugmeteo.synthetic import generate_meteo_archive
+
+
+_formats = ('parquet', 'feather')
+
+
+@pytest.fixture(scope='module')
+def server():
+    with StandInServer(missing_days=['2019-01-03']) as s:
+        yield s
+
+
+def _days(first, n):
+    return [first + timedelta(days=i) for i in range(n)]
+
+
+def _archive(telescope, days):
+    return concat_meteo_archive([
+        parse_meteo_archive(generate_meteo_archive(telescope, d))
+        for d in days])
+
+
+def _set_checked(store, telescope, d, checked):
+    path = store._get_path(telescope, date(d.year, d.month, 1))
+    schema = store._read_schema(path)
+
+    not_found = store._get_not_found(schema)
+    not_found[d] = checked
+
+    store._write_table(path, store._read_table(path),
+                       store._get_days(schema), not_found)
+
+
+@pytest.mark.parametrize('format', _formats)
+def test_round_trip(tmp_path, format):
+    store = ArchiveStore(str(tmp_path), format)
+
+    # Across a month boundary, so two partitions are written.
+    days = _days(date(2019, 1, 30), 4)
+    t = _archive('T100', days)
+
+    store.write('T100', t, days)
+
+    r = store.read('T100', datetime(2019, 1, 1), datetime(2019, 3, 1))
+
+    pd.testing.assert_frame_equal(r, t)
+    assert sorted(p.name for p in (tmp_path / 'T100').iterdir()) == [
+        '2019-01.' + format, '2019-02.' + format]
+
+
+@pytest.mark.parametrize('format', _formats)
+def test_read_range_and_columns(tmp_path, format):
+    store = ArchiveStore(str(tmp_path), format)
+
+    days = _days(date(2019, 1, 30), 4)
+    t = _archive('T100', days)
+
+    store.write('T100', t, days)
+
+    start = datetime(2019, 1, 31, 18)
+    end = datetime(2019, 2, 1, 6)
+
+    r = store.read('T100', start, end, columns=['Temp', 'NoSuchColumn'])
+
+    expected = t[(t['Timestamp'] >= start) & (t['Timestamp'] < end)]
+    expected = expected.reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(r[['Timestamp', 'Temp']],
+                                  expected[['Timestamp', 'Temp']])
+    assert r['NoSuchColumn'].isna().all()
+
+    assert store.read('T100', end, start) is None
+    assert store.read('T100', datetime(2019, 3, 1),
+                      datetime(2019, 4, 1)) is None
+
+
+def test_write_merges_days(tmp_path):
+    store = ArchiveStore(str(tmp_path))
+
+    days = _days(date(2019, 1, 1), 4)
+
+    store.write('T100', _archive('T100', days[2:]), days[2:])
+    store.write('T100', _archive('T100', days[:3]), days[:3])
+
+    r = store.read('T100', datetime(2019, 1, 1), datetime(2019, 2, 1))
+
+    pd.testing.assert_frame_equal(r, _archive('T100', days))
+
+
+def test_missing_days(tmp_path):
+    store = ArchiveStore(str(tmp_path))
+
+    days = _days(date(2019, 1, 30), 4)
+
+    assert store.missing('T100', days) == days
+
+    store.write('T100', _archive('T100', days[1:3]), days[1:3])
+
+    assert store.missing('T100', days) == [days[0], days[3]]
+    assert store.missing('T60', days) == days
+
+    # A day without rows is still stored.
+    store.write('T100', None, days[3:])
+
+    assert store.missing('T100', days) == [days[0]]
+
+    store.clear('T100')
+
+    assert store.missing('T100', days) == days
+
+
+def test_not_found_days(tmp_path):
+    store = ArchiveStore(str(tmp_path), not_found_ttl=60)
+
+    old = date(2019, 1, 1)
+    recent = date.today() - timedelta(days=2)
+
+    store.write('T100', None, [], not_found=[old, recent])
+
+    assert store.missing('T100', [old, recent]) == []
+
+    # A recent day is asked for again after 'not_found_ttl'.
+    _set_checked(store, 'T100', recent, time.time() - 120)
+
+    assert store.missing('T100', [old, recent]) == [recent]
+
+    # A day that was missing a week after it ended is never asked again.
+    _set_checked(store, 'T100', old, time.time() - 120)
+
+    assert store.missing('T100', [old]) == []
+
+    # A day that is uploaded late is stored.
+    store.write('T100', _archive('T100', [recent]), [recent])
+
+    assert not store._get_not_found(store._read_schema(
+        store._get_path('T100', recent.replace(day=1))))
+    assert store.missing('T100', [recent]) == []
+
+
+def test_invalid_arguments(tmp_path):
+    with pytest.raises(ValueError):
+        ArchiveStore(str(tmp_path), 'csv')
+
+    with pytest.raises(ValueError):
+        ArchiveStore(str(tmp_path), not_found_ttl=-1)
+
+
+def test_query_downloads_missing_days_once(tmp_path, server):
+    met = TugMeteo(base_urls=server.url,
+                   archive_store=ArchiveStore(str(tmp_path)))
+
+    server.reset_stats()
+    first = met.query_meteo_archives('T100', '2019-01-01', '2019-01-06')
+
+    # The day before the range holds the row of midnight.
+    assert server.stats['requests'] == 6
+    assert server.stats['status'] == {200: 5, 404: 1}
+
+    server.reset_stats()
+    second = met.query_meteo_archives('T100', '2019-01-01', '2019-01-06')
+
+    # Neither the stored days nor the day without a file are downloaded.
+    assert server.stats['requests'] == 0
+    pd.testing.assert_frame_equal(second, first)
+
+    expected = met.get_meteo_archives('T100', '2018-12-31', '2019-01-06')
+    expected = expected[
+        (expected['Timestamp'] >= datetime(2019, 1, 1)) &
+        (expected['Timestamp'] < datetime(2019, 1, 6))]
+
+    pd.testing.assert_frame_equal(first, expected.reset_index(drop=True))
+    # Rows of the day without a file are missing.
+    assert not ((first['Timestamp'] > datetime(2019, 1, 3)) &
+                (first['Timestamp'] <= datetime(2019, 1, 4))).any()
+
+
+def test_query_retries_failed_days(tmp_path):
+    store = ArchiveStore(str(tmp_path))
+
+    with StandInServer(error_rate=1.0) as server:
+        met = TugMeteo(base_urls=server.url, archive_store=store,
+                       retries=0, failure_threshold=100)
+
+        assert met.query_meteo_archives(
+            'T100', '2019-01-01', '2019-01-03') is None
+
+    assert store.missing('T100', _days(date(2018, 12, 31), 3)) == \
+        _days(date(2018, 12, 31), 3)
+
+
+def test_query_columns(tmp_path, server):
+    met = TugMeteo(base_urls=server.url,
+                   archive_store=ArchiveStore(str(tmp_path)))
+
+    t = met.query_meteo_archives('T100', '2019-01-01', '2019-01-02',
+                                 columns=['Temp', 'Humidity'])
+
+    assert list(t.columns) == ['Timestamp', 'Temp', 'Humidity']
+    assert np.isfinite(t['Temp']).all()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+
+"""
+'CircuitBreaker' state transitions, driven by a fake clock, and the breaker
+of a host that answers with server errors.
+"""
+
+import types
+
+import pytest
+
+from tugmeteo import TugMeteo, CircuitBreaker
+from tugmeteo import breaker as breaker_module
+from tugmeteo.standin import StandInServer
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+
+    fake = types.SimpleNamespace(monotonic=lambda: now[0])
+    monkeypatch.setattr(breaker_module, 'time', fake)
+
+    return now
+
+
+def _open(breaker, failures=3):
+    for _ in range(failures):
+        assert breaker.allow()
+        breaker.record_failure()
+
+
+def test_closed_open_half_open_closed(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10)
+
+    assert breaker.state == 'closed'
+
+    _open(breaker, 2)
+    assert breaker.state == 'closed'
+
+    _open(breaker, 1)
+    assert breaker.state == 'open'
+    assert not breaker.allow()
+
+    clock[0] += 9.9
+    assert breaker.state == 'open'
+    assert not breaker.allow()
+
+    clock[0] += 0.1
+    assert breaker.state == 'half-open'
+
+    # Only a single probe is let through.
+    assert breaker.allow()
+    assert not breaker.allow()
+    assert breaker.state == 'half-open'
+
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    assert breaker.allow()
+
+
+def test_success_resets_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10)
+
+    _open(breaker, 2)
+    breaker.record_success()
+    _open(breaker, 2)
+
+    assert breaker.state == 'closed'
+
+
+def test_failed_probes_double_timeout_up_to_max(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10,
+                             max_reset_timeout=35)
+
+    _open(breaker, 1)
+
+    for timeout in (20, 35, 35):
+        clock[0] += breaker._timeout
+        assert breaker.allow()
+        breaker.record_failure()
+
+        assert breaker._timeout == timeout
+
+        clock[0] += timeout - 0.1
+        assert breaker.state == 'open'
+        assert not breaker.allow()
+
+        clock[0] += 0.1
+        assert breaker.state == 'half-open'
+        clock[0] -= timeout
+
+    # A successful probe starts over from 'reset_timeout'.
+    clock[0] += breaker._timeout
+    assert breaker.allow()
+    breaker.record_success()
+
+    _open(breaker, 1)
+    clock[0] += 10
+    assert breaker.state == 'half-open'
+
+
+def test_release_gives_back_probe_slot(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+
+    _open(breaker, 1)
+    clock[0] += 10
+
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.release()
+
+    # Neither closed nor opened again, the next request is the probe.
+    assert breaker.state == 'half-open'
+    assert breaker._timeout == 10
+    assert breaker.allow()
+
+
+def test_release_of_closed_breaker_does_nothing(clock):
+    breaker = CircuitBreaker()
+
+    breaker.release()
+
+    assert breaker.state == 'closed'
+    assert breaker.allow()
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'failure_threshold': 0},
+    {'failure_threshold': 1.5},
+    {'reset_timeout': -1},
+    {'reset_timeout': '30'}])
+def test_invalid_arguments(kwargs):
+    with pytest.raises(ValueError):
+        CircuitBreaker(**kwargs)
+
+
+def test_server_errors_open_breaker():
+    with StandInServer(error_rate=1.0) as server:
+        met = TugMeteo(base_urls=server.url, retries=2, backoff=0,
+                       failure_threshold=3, reset_timeout=60)
+
+        assert met.get_meteo_archives(
+            'T100', '2019-01-01', '2019-01-02') is None
+        assert set(met.breakers.values()) == {'open'}
+
+        # The open breaker fails fast without asking the host.
+        server.reset_stats()
+        met.get_meteo_archives('T100', '2019-01-02', '2019-01-03')
+
+        assert server.stats['requests'] == 0
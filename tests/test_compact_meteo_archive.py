@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+
+"""
+A compact archive frame must expand back to exactly the readings it was
+made of.
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tugmeteo import TugMeteo
+from tugmeteo.helper import (parse_meteo_archive, compact_meteo_archive,
+                             expand_meteo_archive)
+from tugmeteo.standin import StandInServer
+from tugmeteo.synthetic import generate_meteo_archive
+
+
+_telescopes = ('RTT150', 'T100', 'T60')
+
+_dtypes = ('float32', 'int16')
+
+
+def _archive(telescope, days=2):
+    tables = [parse_meteo_archive(generate_meteo_archive(
+        telescope, date(2019, 1, 1 + i), invalid_rate=0.05))
+        for i in range(days)]
+
+    return pd.concat(tables, ignore_index=True)
+
+
+def _assert_round_trip(t, dtype):
+    c = compact_meteo_archive(t, dtype)
+    r = expand_meteo_archive(c)
+
+    pd.testing.assert_frame_equal(r, t.reset_index(drop=True),
+                                  check_dtype=False)
+
+    return c
+
+
+@pytest.mark.parametrize('dtype', _dtypes)
+@pytest.mark.parametrize('telescope', _telescopes)
+def test_round_trip(telescope, dtype):
+    t = _archive(telescope)
+    c = _assert_round_trip(t, dtype)
+
+    assert set(c.attrs['decimals']) == set(c.columns)
+    assert c.memory_usage(index=False).sum() < \
+        t.drop(columns='Timestamp').memory_usage(index=False).sum()
+
+    # Columns that do not fit in 'int16' fall back to 'float32'.
+    for key in c.columns:
+        if key in c.attrs['scales']:
+            assert c[key].dtype == np.int16
+        else:
+            assert c[key].dtype == np.float32
+
+    if dtype == 'int16':
+        assert c.attrs['scales']
+    else:
+        assert not c.attrs['scales']
+
+
+@pytest.mark.parametrize('dtype', _dtypes)
+def test_missing_values_round_trip(dtype):
+    t = _archive('T100')
+    t.iloc[::7, 1] = np.nan
+    t.iloc[:, 2] = np.nan
+
+    _assert_round_trip(t, dtype)
+
+
+def test_out_of_int16_range_falls_back_to_float32():
+    t = _archive('T100')
+    t.iloc[0, 1] = 4000.5
+
+    c = _assert_round_trip(t, 'int16')
+    key = t.columns[1]
+
+    assert c[key].dtype == np.float32
+    assert key not in c.attrs['scales']
+
+
+def test_unrepresentable_values_stay_float64():
+    t = _archive('T100')
+    t.iloc[:, 1] = np.linspace(0, 1, len(t)) / 3
+
+    c = _assert_round_trip(t, 'float32')
+    key = t.columns[1]
+
+    assert c[key].dtype == np.float64
+    assert key not in c.attrs['decimals']
+
+
+def test_unsorted_archive_is_sorted():
+    t = _archive('T100')
+    shuffled = t.sample(frac=1, random_state=0)
+
+    r = expand_meteo_archive(compact_meteo_archive(shuffled))
+
+    pd.testing.assert_frame_equal(r, t, check_dtype=False)
+
+
+def test_invalid_dtype():
+    with pytest.raises(ValueError):
+        compact_meteo_archive(_archive('T100', 1), 'float16')
+
+
+@pytest.mark.parametrize('compact', (True, 'int16'))
+def test_compact_archives_match(compact):
+    with StandInServer() as server:
+        met = TugMeteo(base_urls=server.url)
+
+        t = met.get_meteo_archives('T100', '2019-01-01', '2019-01-04')
+        c = met.get_meteo_archives('T100', '2019-01-01', '2019-01-04',
+                                   compact=compact)
+
+    pd.testing.assert_frame_equal(expand_meteo_archive(c), t,
+                                  check_dtype=False)
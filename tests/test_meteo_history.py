@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+
+"""
+'MeteoHistory' windows and how long their views stay valid.
+"""
+
+import numpy as np
+import pytest
+
+from tugmeteo.history import MeteoHistory
+
+
+def _history(capacity, n):
+    h = MeteoHistory(capacity, ['TEMP'])
+
+    for i in range(n):
+        h.append({'TEMP': float(i)}, t=float(i))
+
+    return h
+
+
+@pytest.mark.parametrize('n', (0, 3, 10, 25))
+def test_window_keeps_latest_readings(n):
+    times, values = _history(10, n).window()
+
+    expected = np.arange(max(0, n - 10), n, dtype=float)
+
+    np.testing.assert_array_equal(times, expected)
+    np.testing.assert_array_equal(values[:, 0], expected)
+
+
+def test_window_seconds_and_count():
+    h = _history(10, 25)
+
+    np.testing.assert_array_equal(h.get('TEMP', seconds=3)[1],
+                                  [21.0, 22.0, 23.0, 24.0])
+    np.testing.assert_array_equal(h.get('TEMP', count=2)[1], [23.0, 24.0])
+
+
+@pytest.mark.parametrize('start', (10, 13, 17))
+@pytest.mark.parametrize('size', (1, 4, 10))
+def test_view_is_valid_for_capacity_minus_size_appends(start, size):
+    capacity = 10
+    h = _history(capacity, start)
+
+    times, _ = h.window(count=size)
+    expected = times.copy()
+
+    for i in range(capacity - size):
+        h.append({'TEMP': -1.0}, t=-1.0)
+
+    np.testing.assert_array_equal(times, expected)
+
+    h.append({'TEMP': -1.0}, t=-1.0)
+
+    assert not np.array_equal(times, expected)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+
+"""
+Chunked 'get_meteo_statistics' must give the same statistics as resampling
+the whole archive in memory.
+"""
+
+import pandas as pd
+import pytest
+
+from tugmeteo import TugMeteo
+from tugmeteo.helper import resample_meteo_archive
+from tugmeteo.standin import StandInServer
+
+
+_stats = ('count', 'min', 'mean', 'max', 'std', 'first', 'last')
+
+_percentiles = (0.1, 0.5, 0.9)
+
+
+@pytest.fixture(scope='module')
+def met():
+    # A missing day leaves a gap inside the range.
+    with StandInServer(missing_days=['2019-01-05']) as server:
+        yield TugMeteo(base_urls=server.url)
+
+
+def _in_memory(met, freq, columns=None):
+    t = met.get_meteo_archives('T100', '2019-01-01', '2019-01-15')
+
+    if columns is not None:
+        t = t[['Timestamp'] + columns]
+
+    return resample_meteo_archive(t, freq, _stats, _percentiles)
+
+
+@pytest.mark.parametrize('chunk_days', (1, 3, 30))
+@pytest.mark.parametrize('freq', ('1h', '1D', '3D', 'W', 'MS'))
+def test_matches_in_memory(met, freq, chunk_days):
+    s = met.get_meteo_statistics('T100', '2019-01-01', '2019-01-15',
+                                 freq=freq, stats=_stats,
+                                 percentiles=_percentiles,
+                                 chunk_days=chunk_days)
+
+    pd.testing.assert_frame_equal(s, _in_memory(met, freq))
+
+
+def test_columns(met):
+    s = met.get_meteo_statistics('T100', '2019-01-01', '2019-01-15',
+                                 freq='1D', stats=_stats,
+                                 percentiles=_percentiles,
+                                 columns=['Temp', 'Humid'], chunk_days=4)
+
+    pd.testing.assert_frame_equal(
+        s, _in_memory(met, '1D', ['Temp', 'Humid']))
+
+
+def test_empty_range(met):
+    assert met.get_meteo_statistics('T100', '2019-01-05', '2019-01-06',
+                                    chunk_days=1) is None
+
+
+def test_unknown_statistic(met):
+    with pytest.raises(ValueError):
+        met.get_meteo_statistics('T100', '2019-01-01', '2019-01-02',
+                                 stats=('mode',))
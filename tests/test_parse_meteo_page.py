@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+
+"""
+The 'fast' page engine must give the same readings as the 'bs4' engine.
+"""
+
+import re
+
+import pytest
+
+from tugmeteo.helper import parse_meteo_page
+from tugmeteo.synthetic import generate_meteo_page
+
+
+_telescopes = ('RTT150', 'T100', 'T60')
+
+
+def _parse(html, telescope, engine):
+    try:
+        meteo = parse_meteo_page(html, telescope, engine=engine)
+    except Exception as error:
+        return type(error)
+
+    # Both engines stamp the reading with the current time.
+    meteo.pop('timestamp')
+
+    return meteo
+
+
+def _assert_same(html, telescope):
+    assert _parse(html, telescope, 'fast') == \
+        _parse(html, telescope, 'bs4')
+
+
+def _remove_nth(pattern, html, n):
+    matches = list(re.finditer(pattern, html))
+    m = matches[n % len(matches)]
+
+    return html[:m.start()] + html[m.end():]
+
+
+@pytest.mark.parametrize('telescope', _telescopes)
+def test_pages(telescope):
+    for seed in range(200):
+        html = generate_meteo_page(telescope, seed=seed)
+
+        meteo = _parse(html, telescope, 'fast')
+
+        assert isinstance(meteo, dict)
+        assert meteo == _parse(html, telescope, 'bs4')
+
+
+@pytest.mark.parametrize('telescope', _telescopes)
+def test_values(telescope):
+    values = dict()
+    html = generate_meteo_page(telescope, values, seed=1)
+
+    meteo = _parse(html, telescope, 'fast')
+
+    for keyword, value in meteo.items():
+        if keyword != 'telescope':
+            assert value == values[keyword]
+
+
+@pytest.mark.parametrize('telescope', _telescopes)
+def test_markup_variants(telescope):
+    html = generate_meteo_page(telescope, seed=7)
+
+    variants = [
+        re.sub(r'</?(?:table|strong|b)\b', lambda m: m.group(0).upper(),
+               html),
+        html.replace('<b>', '<b class="x">'),
+        html.replace('<strong>', '<STRONG >'),
+        html.replace('\n', '\r\n'),
+        html.replace('<body', '<!-- <b>1</b> --><script>"<b>"</script><body'),
+        html.replace('cellspacing="1"', "cellspacing='1'")]
+
+    for variant in variants:
+        _assert_same(variant, telescope)
+
+
+@pytest.mark.parametrize('telescope', _telescopes)
+def test_missing_elements(telescope):
+    html = generate_meteo_page(telescope, seed=3)
+
+    for n in range(20):
+        _assert_same(_remove_nth(r'<strong>.*?</strong>', html, n),
+                     telescope)
+        _assert_same(_remove_nth(r'<b>.*?</b>', html, n), telescope)
+
+
+@pytest.mark.parametrize('telescope', _telescopes)
+def test_malformed_pages(telescope):
+    html = generate_meteo_page(telescope, seed=5)
+
+    pages = [
+        '',
+        '<html><body>Service Unavailable</body></html>',
+        html.replace('cellspacing="1"', 'cellspacing="2"'),
+        html.replace('</table>', '', 1),
+        html.replace('</b>', '', 1),
+        html.replace('</strong>', '', 1),
+        html[:len(html) // 2],
+        re.sub(r'= [-\d.]+', '= n/a', html, count=1),
+        re.sub(r'<b>[-\d.]+', '<b>n/a', html, count=1)]
+
+    for page in pages:
+        _assert_same(page, telescope)
+
+    assert _parse('', telescope, 'fast') is IndexError
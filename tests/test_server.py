@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+
+"""
+'MeteoServer' error responses, offline against the stand-in server.
+"""
+
+import json
+import threading
+
+import pytest
+import requests
+
+from tugmeteo import TugMeteo
+from tugmeteo.server import MeteoServer
+from tugmeteo.standin import StandInServer
+
+
+@pytest.fixture
+def upstream():
+    with StandInServer(missing_days=['2019-01-02']) as s:
+        yield s
+
+
+@pytest.fixture
+def gateway(upstream):
+    meteo = TugMeteo(base_urls=upstream.url, retries=0,
+                     failure_threshold=100)
+    server = MeteoServer(port=0, meteo=meteo)
+
+    thread = threading.Thread(target=server._httpd.serve_forever,
+                              daemon=True)
+    thread.start()
+
+    yield server, 'http://{}:{}'.format(*server.address)
+
+    server.shutdown()
+    thread.join()
+
+
+def _get(url):
+    respond = requests.get(url, timeout=5)
+
+    return respond.status_code, json.loads(respond.content)
+
+
+def test_archive(gateway):
+    server, url = gateway
+
+    status, body = _get(url + '/archive/T100?start=2019-01-01&end=2019-01-02')
+
+    assert status == 200
+    assert len(body['data']) == 288
+    assert len(server._cache) == 1
+
+
+def test_missing_archive_is_not_found(gateway):
+    server, url = gateway
+
+    status, body = _get(url + '/archive/T100?start=2019-01-02&end=2019-01-03')
+
+    assert status == 404
+    assert 'error' in body
+    assert len(server._cache) == 0
+
+
+def test_failed_archive_is_not_cached(gateway, upstream):
+    server, url = gateway
+    path = '/archive/T100?start=2019-01-01&end=2019-01-02'
+
+    upstream._error_rate = 1.0
+
+    status, body = _get(url + path)
+
+    assert status == 502
+    assert 'error' in body
+    assert len(server._cache) == 0
+
+    upstream._error_rate = 0.0
+
+    status, body = _get(url + path)
+
+    assert status == 200
+    assert len(body['data']) == 288
+
+
+def test_partly_failed_archive_is_not_cached(gateway, upstream,
+                                             monkeypatch):
+    server, url = gateway
+    meteo = server._meteo
+
+    get_meteo_archive = meteo._get_meteo_archive
+
+    def fail_first_day(telescope, date, not_found=None):
+        if date.day == 1:
+            return None
+
+        return get_meteo_archive(telescope, date, not_found)
+
+    monkeypatch.setattr(meteo, '_get_meteo_archive', fail_first_day)
+
+    status, body = _get(url + '/archive/T100?start=2019-01-01&end=2019-01-04')
+
+    assert status == 200
+    assert len(body['data']) == 288
+    assert len(server._cache) == 0
+
+
+def test_upstream_exception_is_bad_gateway(gateway, monkeypatch):
+    server, url = gateway
+
+    def get_last_meteo(telescope='all'):
+        raise requests.exceptions.ConnectionError('unreachable')
+
+    monkeypatch.setattr(server._meteo, 'get_last_meteo', get_last_meteo)
+
+    status, body = _get(url + '/meteo/T100')
+
+    assert status == 502
+    assert 'unreachable' in body['error']
+
+
+def test_unexpected_exception_is_internal_error(gateway, monkeypatch):
+    server, url = gateway
+
+    def get_last_meteo(telescope='all'):
+        raise RuntimeError('broken')
+
+    monkeypatch.setattr(server._meteo, 'get_last_meteo', get_last_meteo)
+
+    status, body = _get(url + '/meteo/T100')
+
+    assert status == 500
+    assert body == {'error': 'internal error'}
+
+
+def test_bad_request(gateway):
+    server, url = gateway
+
+    assert _get(url + '/archive/T100?start=2019-13-01')[0] == 400
+    assert _get(url + '/archive/T200?start=2019-01-01')[0] == 400
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'interval': 0},
+    {'archive_ttl': -1},
+    {'archive_ttl': '300'}])
+def test_invalid_arguments(kwargs):
+    with pytest.raises(ValueError):
+        MeteoServer(port=0, **kwargs)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+
+"""
+'update_meteo_archive' must read only the appended rows with a range
+request, and fall back to the whole file when the host answers 416 or
+ignores the range.
+"""
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from tugmeteo import TugMeteo
+from tugmeteo.helper import parse_meteo_archive, concat_meteo_archive
+from tugmeteo.standin import StandInServer
+from tugmeteo.synthetic import generate_meteo_archive
+
+
+_day = date(2019, 1, 1)
+
+_lines = generate_meteo_archive('T100', _day).encode().splitlines(True)
+
+_other_lines = generate_meteo_archive(
+    'T100', _day, seed=1).encode().splitlines(True)
+
+
+@pytest.fixture
+def files(monkeypatch):
+    files = dict()
+
+    with StandInServer() as server:
+        monkeypatch.setattr(server, '_get_archive',
+                            lambda telescope, day: files.get(day))
+        files['server'] = server
+
+        yield files
+
+
+def _rows(n, lines=_lines):
+    return b''.join(lines[:2 + n])
+
+
+def _expected(body):
+    return concat_meteo_archive([parse_meteo_archive(body.decode())])
+
+
+def _update(met, new_only=False):
+    return met.update_meteo_archive('T100', _day.isoformat(),
+                                    new_only=new_only)
+
+
+def test_appended_rows_are_read_with_range(files):
+    server = files['server']
+    met = TugMeteo(base_urls=server.url)
+
+    files[_day] = _rows(100)
+    pd.testing.assert_frame_equal(_update(met), _expected(_rows(100)))
+
+    files[_day] = _rows(150)
+    server.reset_stats()
+
+    new = _update(met, new_only=True)
+
+    assert server.stats['status'] == {206: 1}
+    # Only the last read line and the appended rows are sent.
+    assert server.stats['bytes'] == len(_rows(150)) - len(_rows(99))
+    assert len(new) == 50
+
+    pd.testing.assert_frame_equal(_update(met), _expected(_rows(150)))
+
+
+def test_unchanged_file_adds_no_rows(files):
+    met = TugMeteo(base_urls=files['server'].url)
+
+    files[_day] = _rows(100)
+    _update(met)
+
+    assert _update(met, new_only=True) is None
+    pd.testing.assert_frame_equal(_update(met), _expected(_rows(100)))
+
+
+def test_incomplete_line_is_read_again(files):
+    met = TugMeteo(base_urls=files['server'].url)
+
+    files[_day] = _rows(100) + _lines[102][:10]
+    pd.testing.assert_frame_equal(_update(met), _expected(_rows(100)))
+
+    files[_day] = _rows(120)
+    pd.testing.assert_frame_equal(_update(met), _expected(_rows(120)))
+
+
+def test_shorter_file_falls_back_after_416(files):
+    server = files['server']
+    met = TugMeteo(base_urls=server.url)
+
+    files[_day] = _rows(100)
+    _update(met)
+
+    files[_day] = _rows(20, _other_lines)
+    server.reset_stats()
+
+    t = _update(met)
+
+    assert server.stats['status'] == {416: 1, 200: 1}
+    pd.testing.assert_frame_equal(t, _expected(_rows(20, _other_lines)))
+
+
+def test_replaced_file_falls_back_to_whole_file(files):
+    server = files['server']
+    met = TugMeteo(base_urls=server.url)
+
+    files[_day] = _rows(100)
+    _update(met)
+
+    files[_day] = _rows(150, _other_lines)
+    server.reset_stats()
+
+    t = _update(met)
+
+    assert server.stats['status'] == {206: 1, 200: 1}
+    pd.testing.assert_frame_equal(t, _expected(_rows(150, _other_lines)))
+
+
+def test_ignored_range_falls_back_to_whole_file(files):
+    server = files['server']
+    server.ranges = False
+    met = TugMeteo(base_urls=server.url)
+
+    files[_day] = _rows(100)
+    _update(met)
+
+    files[_day] = _rows(150)
+    server.reset_stats()
+
+    new = _update(met, new_only=True)
+
+    assert server.stats['status'] == {200: 1}
+    assert len(new) == 50
+    pd.testing.assert_frame_equal(_update(met), _expected(_rows(150)))
+
+    # A host without range support may also serve a replaced file.
+    files[_day] = _rows(150, _other_lines)
+
+    pd.testing.assert_frame_equal(_update(met),
+                                  _expected(_rows(150, _other_lines)))
+
+
+def test_missing_file(files):
+    met = TugMeteo(base_urls=files['server'].url)
+
+    assert _update(met) is None
@@ -26,3 +26,19 @@ __maintainer__ = 'Oğuzhan OKUYAN'
 __email__ = 'ookuyan@gmail.com, oguzhan.okuyan@tubitak.gov.tr'
 
 from .core import *
+from .aio import *
+from .cache import *
+from .store import *
+from .metrics import *
+from .breaker import *
+
+
+def __getattr__(name):
+    # 'MeteoHistory' needs numpy, so it is imported on first use.
+    if name == 'MeteoHistory':
+        from .history import MeteoHistory
+
+        return MeteoHistory
+
+    raise AttributeError(
+        "module 'tugmeteo' has no attribute '{}'".format(name))
@@ -0,0 +1,9 @@
+#!/usr/bin/env python
+
+import sys
+
+from .cli import main
+
+
+if __name__ == '__main__':
+    sys.exit(main())
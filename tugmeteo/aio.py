@@ -0,0 +1,813 @@
+#!/usr/bin/env python
+
+__all__ = ['AsyncTugMeteo']
+
+import asyncio
+from functools import partial
+
+from .core import TugMeteo, _sensors
+from .helper import align_meteo_archives
+
+
+class AsyncTugMeteo(object):
+
+    def __init__(self, workers=8, archive_cache=None, max_age=0, history=0,
+                 base_urls=None, metrics=None, retries=2, backoff=0.25,
+                 failure_threshold=3, reset_timeout=30, archive_store=None,
+                 meteo=None):
+        """
+        AsyncTugMeteo
+
+        Asyncio counterpart of 'TugMeteo'.
+
+        It wraps a 'TugMeteo' client and runs its blocking calls in the
+        default executor of the running loop. Every method that may
+        download, parse or wait is a coroutine; 'get_meteo_status',
+        'get_meteo_age', 'get_meteo_history' and the properties only read
+        memory and are plain methods.
+        Meteorological stations are polled at the same time, so the
+        worst-case latency of a call with telescope='all' is a single
+        station's timeout.
+
+        Parameters
+        ----------
+        workers : int
+            Maximum number of concurrent archive downloads.
+            Default value is 8.
+
+        archive_cache : str or 'ArchiveCache'
+            On-disk cache of the daily archive files.
+            If None, archives are always downloaded.
+
+        max_age : int, float or dict
+            Maximum age of the cached station readings in seconds.
+            Default value is 0 (always download).
+
+        history : int
+            Number of readings kept per station in a 'MeteoHistory'.
+            Default value is 0 (no history).
+
+        base_urls : str or dict
+            Base URLs of the stations. See 'TugMeteo'.
+
+        metrics : 'MetricsRegistry'
+            Registry of the request, parse and cache metrics.
+
+        retries, backoff, failure_threshold, reset_timeout
+            Retry and circuit breaker settings. See 'TugMeteo'.
+
+        archive_store : str or 'ArchiveStore'
+            Columnar store of the parsed archives. See 'TugMeteo'.
+
+        meteo : 'TugMeteo'
+            Client to wrap, e.g. one shared with synchronous code. If
+            given, the other parameters are not used.
+            If None, a new client is created from them.
+
+        Examples
+        --------
+        >>> import asyncio
+        >>>
+        >>> from tugmeteo import AsyncTugMeteo
+        >>>
+        >>> async def main():
+        ...     met = AsyncTugMeteo()
+        ...     data = await met.get_last_meteo('all')
+        ...     t = await met.get_temperature('T100')
+        ...     table = await met.get_meteo_archives(start_date='2019-05-01',
+        ...                                          end_date='2019-05-31')
+        >>>
+        >>> asyncio.run(main())
+        """
+
+        super(AsyncTugMeteo, self).__init__()
+
+        if meteo is None:
+            meteo = TugMeteo(
+                workers=workers, archive_cache=archive_cache,
+                max_age=max_age, history=history, base_urls=base_urls,
+                metrics=metrics, retries=retries, backoff=backoff,
+                failure_threshold=failure_threshold,
+                reset_timeout=reset_timeout, archive_store=archive_store)
+
+        if not isinstance(meteo, TugMeteo):
+            raise TypeError("'meteo' should be a 'TugMeteo' object.")
+
+        self._meteo = meteo
+
+    @property
+    def meteo(self):
+        """
+        Wrapped 'TugMeteo' client.
+        """
+
+        return self._meteo
+
+    @property
+    def polling(self):
+        """
+        Telescopes that are polled in the background.
+        """
+
+        return self._meteo.polling
+
+    @property
+    def breakers(self):
+        """
+        States of the circuit breakers keyed by host.
+        """
+
+        return self._meteo.breakers
+
+    @property
+    def metrics(self):
+        """
+        'MetricsRegistry' of the client.
+        """
+
+        return self._meteo.metrics
+
+    async def _run(self, func, *args):
+        """
+        Internal using only.
+        """
+
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(None, partial(func, *args))
+
+    async def _get_sensor_info(self, sensor, telescope):
+        """
+        Internal using only.
+        """
+
+        info_keywords = _sensors[sensor]
+
+        if await self.get_last_meteo(telescope) is not None:
+            return self._meteo._collect_meteo_info(
+                telescope, info_keywords, info_keywords['info'])
+        else:
+            return None
+
+    async def get_meteo_archives(self, telescope='RTT150', start_date='',
+                                 end_date='', date_format='%Y-%m-%d',
+                                 workers=None, compact=False):
+        """
+        Gets meteorology archive from database with 5 min interval.
+
+        Coroutine version of 'TugMeteo.get_meteo_archives'.
+        Daily archive files are downloaded concurrently and are always
+        returned in date order.
+
+        Parameters
+        ----------
+        telescope : str
+            The name of the meteorological station (telescope names).
+            Default value is 'RTT150'.
+
+        start_date : str
+            Start date of the archive.
+
+        end_date : str
+            End date of the archive.
+
+        date_format : str
+            Date format for 'start_date' and 'end_date' parameters.
+
+        workers : int
+            Number of concurrent downloads.
+            If None, the value given to the constructor is used.
+
+        compact : bool or str
+            False, True, 'float32' or 'int16'.
+            See 'TugMeteo.get_meteo_archives'.
+
+        Returns
+        -------
+        'pandas.DataFrame'
+            Returned archive.
+        """
+
+        meteo = self._meteo
+
+        telescope, dates = meteo._get_meteo_archive_dates(
+            telescope, start_date, end_date, date_format, workers)
+
+        if dates is None:
+            return None
+
+        if workers is None:
+            workers = meteo._workers
+
+        semaphore = asyncio.Semaphore(workers)
+
+        async def download(date):
+            async with semaphore:
+                return await self._run(meteo._get_meteo_archive, telescope,
+                                       date)
+
+        raw_archives = await asyncio.gather(*[download(d) for d in dates])
+
+        return await self._run(meteo._build_meteo_archive, telescope,
+                               raw_archives, compact)
+
+    async def get_aligned_meteo_archives(self, telescopes='all',
+                                         start_date='', end_date='',
+                                         date_format='%Y-%m-%d',
+                                         freq='5min', tolerance='150s',
+                                         workers=None):
+        """
+        Gets meteorology archives of several telescopes on a common time grid.
+
+        Coroutine version of 'TugMeteo.get_aligned_meteo_archives'.
+
+        Parameters
+        ----------
+        telescopes : str or list
+            Telescope name(s).
+            Default value is 'all'.
+
+        start_date : str
+            Start date of the archive.
+
+        end_date : str
+            End date of the archive.
+
+        date_format : str
+            Date format for 'start_date' and 'end_date' parameters.
+
+        freq : str
+            Spacing of the time grid.
+            Default value is '5min'.
+
+        tolerance : str
+            Maximum distance between a reading and its grid point.
+            Default value is '150s'.
+
+        workers : int
+            Number of concurrent downloads per telescope.
+            If None, the value given to the constructor is used.
+
+        Returns
+        -------
+        'pandas.DataFrame'
+            Aligned archive.
+        """
+
+        telescopes = self._meteo._get_telescopes_arg(telescopes)
+
+        tables = await asyncio.gather(*[
+            self.get_meteo_archives(tel, start_date, end_date, date_format,
+                                    workers)
+            for tel in telescopes])
+
+        return await self._run(align_meteo_archives,
+                               dict(zip(telescopes, tables)), freq, tolerance)
+
+    async def iter_meteo_archives(self, telescope='RTT150', start_date='',
+                                  end_date='', date_format='%Y-%m-%d',
+                                  chunk_days=1, workers=None):
+        """
+        Iterates over meteorology archive in chunks of days.
+
+        Asynchronous generator version of 'TugMeteo.iter_meteo_archives'.
+        Every chunk is downloaded and parsed in the executor.
+
+        Parameters
+        ----------
+        telescope : str
+            The name of the meteorological station (telescope names).
+            Default value is 'RTT150'.
+
+        start_date : str
+            Start date of the archive.
+
+        end_date : str
+            End date of the archive.
+
+        date_format : str
+            Date format for 'start_date' and 'end_date' parameters.
+
+        chunk_days : int
+            Number of days in each yielded chunk.
+            Default value is 1.
+
+        workers : int
+            Number of concurrent downloads.
+            If None, the value given to the constructor is used.
+
+        Yields
+        ------
+        'pandas.DataFrame'
+            Archive of the next chunk of days.
+        """
+
+        chunks = self._meteo.iter_meteo_archives(
+            telescope, start_date, end_date, date_format, chunk_days, workers)
+
+        done = object()
+
+        try:
+            while True:
+                chunk = await self._run(next, chunks, done)
+
+                if chunk is done:
+                    break
+
+                yield chunk
+        finally:
+            await self._run(chunks.close)
+
+    async def get_meteo_statistics(self, telescope='RTT150', start_date='',
+                                   end_date='', date_format='%Y-%m-%d',
+                                   freq='1D', stats=('min', 'mean', 'max'),
+                                   percentiles=None, columns=None,
+                                   chunk_days=30, workers=None):
+        """
+        Returns resampled statistics of meteorology archive.
+
+        Coroutine version of 'TugMeteo.get_meteo_statistics'.
+
+        Parameters
+        ----------
+        telescope : str
+            The name of the meteorological station (telescope names).
+            Default value is 'RTT150'.
+
+        start_date : str
+            Start date of the archive.
+
+        end_date : str
+            End date of the archive.
+
+        date_format : str
+            Date format for 'start_date' and 'end_date' parameters.
+
+        freq, stats, percentiles, columns, chunk_days
+            See 'TugMeteo.get_meteo_statistics'.
+
+        workers : int
+            Number of concurrent downloads.
+            If None, the value given to the constructor is used.
+
+        Returns
+        -------
+        'pandas.DataFrame'
+            Statistics of every period.
+        """
+
+        return await self._run(
+            self._meteo.get_meteo_statistics, telescope, start_date,
+            end_date, date_format, freq, stats, percentiles, columns,
+            chunk_days, workers)
+
+    async def query_meteo_archives(self, telescope='RTT150', start_date='',
+                                   end_date='', date_format='%Y-%m-%d',
+                                   columns=None, workers=None):
+        """
+        Gets meteorology archive of a time range from the archive store.
+
+        Coroutine version of 'TugMeteo.query_meteo_archives'.
+
+        Parameters
+        ----------
+        telescope : str
+            The name of the meteorological station (telescope names).
+            Default value is 'RTT150'.
+
+        start_date : str or 'datetime.datetime'
+            Start of the range.
+
+        end_date : str or 'datetime.datetime'
+            End of the range (excluded).
+
+        date_format : str
+            Date format for 'start_date' and 'end_date' parameters.
+
+        columns : list
+            Columns besides 'Timestamp'. If None, all columns are
+            returned.
+
+        workers : int
+            Number of concurrent downloads of the missing days.
+            If None, the value given to the constructor is used.
+
+        Returns
+        -------
+        'pandas.DataFrame'
+            Returned archive.
+        """
+
+        return await self._run(
+            self._meteo.query_meteo_archives, telescope, start_date,
+            end_date, date_format, columns, workers)
+
+    async def update_meteo_archive(self, telescope='RTT150', date='',
+                                   date_format='%Y-%m-%d', new_only=False):
+        """
+        Updates archive of a single day with the rows appended since the
+        previous call.
+
+        Coroutine version of 'TugMeteo.update_meteo_archive'.
+
+        Parameters
+        ----------
+        telescope : str
+            The name of the meteorological station (telescope names).
+            Default value is 'RTT150'.
+
+        date : str
+            Date of the archive. If empty, today's archive is updated.
+
+        date_format : str
+            Date format for 'date' parameter.
+
+        new_only : bool
+            If True, only the rows read by this call are returned.
+            Default value is False.
+
+        Returns
+        -------
+        'pandas.DataFrame'
+            Archive of the day read so far.
+        """
+
+        return await self._run(
+            self._meteo.update_meteo_archive, telescope, date, date_format,
+            new_only)
+
+    async def get_last_meteo(self, telescope='all', refresh=False):
+        """
+        Return current all meteorological data.
+
+        Coroutine version of 'TugMeteo.get_last_meteo'.
+        With telescope='all' every station is fetched at the same time.
+
+        Parameters
+        ----------
+        telescope : str
+            Telescope name.
+            'telescope' must be one of 'RTT150', 'T100', 'T60' or 'all'.
+            Default value is 'all'.
+
+        refresh : bool
+            If True, cached readings are ignored.
+            Default value is False.
+
+        Returns
+        -------
+        Type of 'dict'
+        """
+
+        meteo = self._meteo
+
+        telescope = telescope.upper()
+
+        if telescope == 'ALL':
+            telescopes = list(meteo._telescopes)
+        elif telescope in meteo._telescopes:
+            telescopes = [telescope]
+        else:
+            return None
+
+        await asyncio.gather(*[self._run(meteo._refresh, tel, refresh)
+                               for tel in telescopes])
+
+        if telescope == 'ALL':
+            return meteo._last_meteos
+
+        return meteo._last_meteos[telescope]
+
+    async def get_last_meteo_within(self, deadline, telescope='all',
+                                    refresh=False):
+        """
+        Returns current meteorological data that arrives within a
+        deadline, with the status of every station.
+
+        Coroutine version of 'TugMeteo.get_last_meteo_within'.
+
+        Parameters
+        ----------
+        deadline : int or float
+            Maximum duration of the call in seconds.
+
+        telescope : str
+            Telescope name.
+            'telescope' must be one of 'RTT150', 'T100', 'T60' or 'all'.
+            Default value is 'all'.
+
+        refresh : bool
+            If True, cached readings are ignored.
+            Default value is False.
+
+        Returns
+        -------
+        type of 'tuple'
+            Readings and their status.
+        """
+
+        if not isinstance(deadline, (int, float)) or deadline < 0:
+            raise ValueError("'deadline' should be a non-negative number.")
+
+        meteo = self._meteo
+
+        telescope = telescope.upper()
+
+        if telescope == 'ALL':
+            telescopes = list(meteo._telescopes)
+        elif telescope in meteo._telescopes:
+            telescopes = [telescope]
+        else:
+            return None
+
+        # The refreshes are shared with 'TugMeteo.get_last_meteo_within',
+        # so a station that missed the last deadline is not fetched twice.
+        futures = [asyncio.wrap_future(meteo._submit_refresh(tel, refresh))
+                   for tel in telescopes]
+
+        await asyncio.wait(futures, timeout=deadline)
+
+        meteos = dict()
+        status = dict()
+
+        for tel, future in zip(telescopes, futures):
+            updated = future.done() and future.exception() is None and \
+                future.result()
+
+            meteos[tel] = meteo._last_meteos[tel]
+            status[tel] = meteo._get_meteo_status(tel, updated)
+
+        if telescope == 'ALL':
+            return meteos, status
+
+        return meteos[telescope], status[telescope]
+
+    def get_meteo_status(self, telescope='all'):
+        """
+        Returns status of the readings in memory.
+
+        See 'TugMeteo.get_meteo_status'.
+        """
+
+        return self._meteo.get_meteo_status(telescope)
+
+    def get_meteo_age(self, telescope='all'):
+        """
+        Returns age of the latest readings in seconds.
+
+        See 'TugMeteo.get_meteo_age'.
+        """
+
+        return self._meteo.get_meteo_age(telescope)
+
+    def get_meteo_history(self, telescope):
+        """
+        Returns history of the live readings of a station.
+
+        See 'TugMeteo.get_meteo_history'.
+        """
+
+        return self._meteo.get_meteo_history(telescope)
+
+    async def start_polling(self, interval=60, jitter=0.1, telescopes='all'):
+        """
+        Starts polling meteorological stations in the background.
+
+        Coroutine version of 'TugMeteo.start_polling'. Polling that is
+        already running is stopped first.
+        """
+
+        await self._run(self._meteo.start_polling, interval, jitter,
+                        telescopes)
+
+    async def stop_polling(self, timeout=None):
+        """
+        Stops background polling.
+
+        Coroutine version of 'TugMeteo.stop_polling'.
+        """
+
+        await self._run(self._meteo.stop_polling, timeout)
+
+    async def close(self):
+        """
+        Stops polling and releases the threads and connections.
+
+        Coroutine version of 'TugMeteo.close'.
+        """
+
+        await self._run(self._meteo.close)
+
+    async def get_sensor_trend(self, sensor, telescope='all', seconds=600):
+        """
+        Returns trend of a sensor over the latest readings.
+
+        Coroutine version of 'TugMeteo.get_sensor_trend'.
+        """
+
+        return await self._run(self._meteo.get_sensor_trend, sensor,
+                               telescope, seconds)
+
+    async def get_temperature(self, telescope='all'):
+        """
+        Returns current temperature.
+        Unit is Celsius [C].
+
+        Coroutine version of 'TugMeteo.get_temperature'.
+        """
+
+        return await self._get_sensor_info('temperature', telescope)
+
+    async def get_dome_temperature(self, telescope='all'):
+        """
+        Returns current dome temperature.
+        Unit is Celsius [C].
+
+        Coroutine version of 'TugMeteo.get_dome_temperature'.
+        """
+
+        return await self._get_sensor_info('dome_temperature', telescope)
+
+    async def get_humidity(self, telescope='all'):
+        """
+        Returns current humidity.
+        Unit is RH [%].
+
+        Coroutine version of 'TugMeteo.get_humidity'.
+        """
+
+        return await self._get_sensor_info('humidity', telescope)
+
+    async def get_dome_humidity(self, telescope='all'):
+        """
+        Returns current dome humidity.
+        Unit is RH [%].
+
+        Coroutine version of 'TugMeteo.get_dome_humidity'.
+        """
+
+        return await self._get_sensor_info('dome_humidity', telescope)
+
+    async def get_pressure(self, telescope='all'):
+        """
+        Returns current pressure.
+        Unit is millibar [mb].
+
+        Coroutine version of 'TugMeteo.get_pressure'.
+        """
+
+        return await self._get_sensor_info('pressure', telescope)
+
+    async def get_wind_speed(self, telescope='all'):
+        """
+        Returns current wind speed.
+        Unit is km/h.
+
+        Coroutine version of 'TugMeteo.get_wind_speed'.
+        """
+
+        return await self._get_sensor_info('wind_speed', telescope)
+
+    async def get_wind_chill(self, telescope='all'):
+        """
+        Returns current wind chill.
+        Unit is Celsius [C].
+
+        Coroutine version of 'TugMeteo.get_wind_chill'.
+        """
+
+        return await self._get_sensor_info('wind_chill', telescope)
+
+    async def get_wind_direction(self, telescope='all'):
+        """
+        Returns current wind direction (azimuth -> from North).
+        Unit is Degree.
+
+        Coroutine version of 'TugMeteo.get_wind_direction'.
+        """
+
+        return await self._get_sensor_info('wind_direction', telescope)
+
+    async def get_dew_point(self, telescope='all'):
+        """
+        Returns current dew point.
+        Unit is Celsius [C].
+
+        Coroutine version of 'TugMeteo.get_dew_point'.
+        """
+
+        return await self._get_sensor_info('dew_point', telescope)
+
+    async def get_cumulus_base(self, telescope='all'):
+        """
+        Returns current cumulus cloud base.
+        Unit is meter [m].
+
+        Coroutine version of 'TugMeteo.get_cumulus_base'.
+        """
+
+        return await self._get_sensor_info('cumulus_base', telescope)
+
+    async def get_rain(self, telescope='all'):
+        """
+        Returns current rain precipitation.
+        Unit is mm/h.
+
+        Coroutine version of 'TugMeteo.get_rain'.
+        """
+
+        return await self._get_sensor_info('rain', telescope)
+
+    async def get_uv_index(self, telescope='all'):
+        """
+        Returns current uv index.
+        Unit is index.
+
+        Coroutine version of 'TugMeteo.get_uv_index'.
+        """
+
+        return await self._get_sensor_info('uv_index', telescope)
+
+    async def get_solar_radiation(self, telescope='all'):
+        """
+        Returns current solar radiation.
+        Unit is W / m^2.
+
+        Coroutine version of 'TugMeteo.get_solar_radiation'.
+        """
+
+        return await self._get_sensor_info('solar_radiation', telescope)
+
+    async def get_air_density(self, telescope='all'):
+        """
+        Returns current air density.
+        Unit is kg / m^3.
+
+        Coroutine version of 'TugMeteo.get_air_density'.
+        """
+
+        return await self._get_sensor_info('air_density', telescope)
+
+    async def get_sensor_data(self, sensor, telescope='all'):
+        """
+        Return current meteorological data.
+
+        Coroutine version of 'TugMeteo.get_sensor_data'.
+
+        Parameters
+        ----------
+        sensor : str
+            Sensor name.
+
+        telescope : str
+            Telescope name.
+            'telescope' must be one of 'RTT150', 'T100', 'T60' or 'all'.
+            Default value is 'all'.
+
+        Returns
+        -------
+        type of 'dict'
+            Sensor data.
+        """
+
+        if sensor in _sensors:
+            return await self._get_sensor_info(sensor, telescope)
+
+        return {}
+
+    async def get_sensors(self, sensors='all', telescopes='all',
+                          as_frame=True):
+        """
+        Return current data of several sensors at once.
+
+        Coroutine version of 'TugMeteo.get_sensors'.
+        The requested stations are fetched at the same time.
+
+        Parameters
+        ----------
+        sensors : str or list
+            Sensor name(s) accepted by 'get_sensor_data' or 'all'.
+            Default value is 'all'.
+
+        telescopes : str or list
+            Telescope name(s).
+            Default value is 'all'.
+
+        as_frame : bool
+            If True, returns a tidy 'pandas.DataFrame'.
+            Default value is True.
+
+        Returns
+        -------
+        'pandas.DataFrame' or type of 'dict'
+            Sensor data.
+        """
+
+        meteo = self._meteo
+
+        sensors, telescopes = meteo._get_sensors_args(sensors, telescopes)
+
+        await asyncio.gather(*[self._run(meteo._refresh, tel)
+                               for tel in telescopes])
+
+        return meteo._collect_sensors(sensors, telescopes, as_frame)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+
+__all__ = ['CircuitBreaker']
+
+import time
+import threading
+
+
+class CircuitBreaker(object):
+
+    def __init__(self, failure_threshold=3, reset_timeout=30,
+                 max_reset_timeout=300):
+        """
+        CircuitBreaker
+
+        Circuit breaker of a single host.
+
+        After 'failure_threshold' consecutive failures the breaker opens
+        and requests fail immediately instead of waiting for a timeout.
+        After 'reset_timeout' seconds a single probe request is let
+        through (half-open). If it succeeds the breaker closes, otherwise
+        it opens again for twice as long, up to 'max_reset_timeout'.
+
+        Parameters
+        ----------
+        failure_threshold : int
+            Consecutive failures that open the breaker.
+            Default value is 3.
+
+        reset_timeout : int or float
+            Seconds before the first probe of an open breaker.
+            Default value is 30.
+
+        max_reset_timeout : int or float
+            Maximum seconds between probes.
+            Default value is 300.
+        """
+
+        super(CircuitBreaker, self).__init__()
+
+        if not isinstance(failure_threshold, int) or failure_threshold < 1:
+            raise ValueError(
+                "'failure_threshold' should be a positive 'int' object.")
+
+        if not isinstance(reset_timeout, (int, float)) or reset_timeout < 0:
+            raise ValueError(
+                "'reset_timeout' should be a non-negative number.")
+
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._max_reset_timeout = max(reset_timeout, max_reset_timeout)
+
+        self._lock = threading.Lock()
+
+        self._failures = 0
+        self._opened = None
+        self._timeout = reset_timeout
+        self._probing = False
+
+    @property
+    def state(self):
+        """
+        'closed', 'open' or 'half-open'.
+        """
+
+        with self._lock:
+            if self._opened is None:
+                return 'closed'
+
+            if self._probing or \
+                    time.monotonic() - self._opened >= self._timeout:
+                return 'half-open'
+
+            return 'open'
+
+    def allow(self):
+        """
+        Returns True if a request may be sent.
+
+        Only one request is allowed while the breaker is half-open.
+        """
+
+        with self._lock:
+            if self._opened is None:
+                return True
+
+            if self._probing or \
+                    time.monotonic() - self._opened < self._timeout:
+                return False
+
+            self._probing = True
+
+            return True
+
+    def record_success(self):
+        """
+        Records a successful request and closes the breaker.
+        """
+
+        with self._lock:
+            self._failures = 0
+            self._opened = None
+            self._timeout = self._reset_timeout
+            self._probing = False
+
+    def release(self):
+        """
+        Gives back the probe slot of a half-open breaker without recording
+        a result, e.g. if the request could not be sent at all.
+        """
+
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self):
+        """
+        Records a failed request.
+        """
+
+        with self._lock:
+            self._failures += 1
+
+            if self._probing:
+                self._probing = False
+                self._opened = time.monotonic()
+                self._timeout = min(2 * self._timeout,
+                                    self._max_reset_timeout)
+            elif self._opened is None and \
+                    self._failures >= self._failure_threshold:
+                self._opened = time.monotonic()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python
+
+__all__ = ['ArchiveCache']
+
+import os
+import time
+import tempfile
+import threading
+from datetime import datetime, timedelta
+
+
+class ArchiveCache(object):
+
+    def __init__(self, directory, today_ttl=300, max_size=None):
+        """
+        ArchiveCache
+
+        On-disk cache of daily 'ARC-YYYY-MM-DD.txt' archive files, keyed by
+        telescope and date.
+
+        Files are stored as '<directory>/<telescope>/ARC-YYYY-MM-DD.txt'.
+        A file that was written after its day was over never changes again
+        and is kept permanently. Files of the current day (or a past day
+        that was cached before it was over) expire after 'today_ttl'
+        seconds. A file that cannot be decoded or lacks the header and
+        unit lines (e.g. truncated or damaged outside the cache) is
+        removed when it is read, so it is downloaded again.
+
+        Parameters
+        ----------
+        directory : str
+            Cache directory. It is created if it does not exist.
+
+        today_ttl : int or float
+            Lifetime of the still growing archive files in seconds.
+            Default value is 300.
+
+        max_size : int
+            Maximum total size of the cache in bytes. When it is exceeded
+            the least recently used files are removed.
+            If None, the cache is not limited.
+
+        Examples
+        --------
+        >>> from tugmeteo import TugMeteo, ArchiveCache
+        >>>
+        >>> cache = ArchiveCache('~/.cache/tugmeteo', max_size=500 * 2**20)
+        >>> met = TugMeteo(archive_cache=cache)
+        >>>
+        >>> # Only the days missing in the cache are downloaded.
+        >>> t = met.get_meteo_archives(telescope='T100',
+                                       start_date='2019-01-01',
+                                       end_date='2019-06-01')
+        """
+
+        super(ArchiveCache, self).__init__()
+
+        if not isinstance(directory, str):
+            raise TypeError("'directory' should be a 'str' object.")
+
+        if not isinstance(today_ttl, (int, float)) or today_ttl < 0:
+            raise ValueError("'today_ttl' should be a non-negative number.")
+
+        if max_size is not None and (not isinstance(max_size, int) or
+                                     max_size < 1):
+            raise ValueError("'max_size' should be a positive 'int' object.")
+
+        self._directory = os.path.abspath(os.path.expanduser(directory))
+        self._today_ttl = today_ttl
+        self._max_size = max_size
+
+        self._lock = threading.Lock()
+
+        os.makedirs(self._directory, exist_ok=True)
+
+    @property
+    def directory(self):
+        return self._directory
+
+    def _get_path(self, telescope, date):
+        """
+        Internal using only.
+        """
+
+        return os.path.join(self._directory, telescope,
+                            'ARC-' + date.strftime('%Y-%m-%d') + '.txt')
+
+    def _is_fresh(self, date, mtime):
+        """
+        Internal using only.
+        """
+
+        day_end = datetime(date.year, date.month, date.day) + \
+            timedelta(days=1, hours=1)
+
+        if datetime.fromtimestamp(mtime) >= day_end:
+            return True
+
+        return time.time() - mtime <= self._today_ttl
+
+    def contains(self, telescope, date):
+        """
+        Returns True if the archive is cached and not expired.
+
+        Unlike 'get', the file is not read.
+
+        Parameters
+        ----------
+        telescope : str
+            Telescope name.
+
+        date : 'datetime.date'
+            Date of the archive.
+
+        Returns
+        -------
+        type of 'bool'
+        """
+
+        try:
+            mtime = os.stat(self._get_path(telescope, date)).st_mtime
+        except OSError:
+            return False
+
+        return self._is_fresh(date, mtime)
+
+    def get(self, telescope, date):
+        """
+        Returns cached raw archive or None if it is missing or expired.
+
+        Parameters
+        ----------
+        telescope : str
+            Telescope name.
+
+        date : 'datetime.date'
+            Date of the archive.
+
+        Returns
+        -------
+        type of 'str'
+        """
+
+        path = self._get_path(telescope, date)
+
+        try:
+            mtime = os.stat(path).st_mtime
+
+            if not self._is_fresh(date, mtime):
+                return None
+
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                raw_archive = f.read()
+        except OSError:
+            return None
+        except UnicodeDecodeError:
+            raw_archive = None
+
+        # The header and unit lines come first in every archive file.
+        if raw_archive is None or raw_archive.count('\n') < 2:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+            return None
+
+        try:
+            os.utime(path, (time.time(), mtime))
+        except OSError:
+            return None
+
+        return raw_archive
+
+    def set(self, telescope, date, raw_archive):
+        """
+        Stores raw archive of a day.
+
+        Parameters
+        ----------
+        telescope : str
+            Telescope name.
+
+        date : 'datetime.date'
+            Date of the archive.
+
+        raw_archive : str
+            Content of the archive file.
+        """
+
+        path = self._get_path(telescope, date)
+        directory = os.path.dirname(path)
+
+        os.makedirs(directory, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+                f.write(raw_archive)
+
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        if self._max_size is not None:
+            self._evict()
+
+    def _get_files(self):
+        """
+        Internal using only.
+        """
+
+        files = list()
+
+        for root, _, names in os.walk(self._directory):
+            for name in names:
+                if not (name.startswith('ARC-') and name.endswith('.txt')):
+                    continue
+
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+
+                files.append((st.st_atime, st.st_size, path))
+
+        return files
+
+    def _evict(self):
+        """
+        Internal using only.
+        """
+
+        with self._lock:
+            files = self._get_files()
+            size = sum(f[1] for f in files)
+
+            for _, file_size, path in sorted(files):
+                if size <= self._max_size:
+                    break
+
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+
+                size -= file_size
+
+    @property
+    def size(self):
+        """
+        Total size of the cached files in bytes.
+        """
+
+        return sum(f[1] for f in self._get_files())
+
+    def clear(self, telescope=None):
+        """
+        Removes cached files.
+
+        Parameters
+        ----------
+        telescope : str
+            Telescope name. If None, all telescopes are cleared.
+        """
+
+        with self._lock:
+            for _, _, path in self._get_files():
+                if telescope is not None and \
+                        os.path.basename(os.path.dirname(path)) != telescope:
+                    continue
+
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+
+__all__ = ['sync_meteo_archives', 'main']
+
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .core import TugMeteo
+from .cache import ArchiveCache
+from .helper import generate_meteo_archive_dates
+
+
+def sync_meteo_archives(directory, telescopes='all', start_date='',
+                        end_date='', date_format='%Y-%m-%d', workers=8,
+                        progress=None, base_urls=None):
+    """
+    Mirrors daily archive files of a date range into a local directory.
+
+    Files are stored in the layout of 'ArchiveCache'
+    ('<directory>/<telescope>/ARC-YYYY-MM-DD.txt') and every file is
+    written atomically, so an interrupted sync leaves only complete
+    files behind. Days that are already mirrored are skipped, so running
+    the same sync again resumes it. Files of days that were not over
+    when they were mirrored are downloaded again.
+
+    Parameters
+    ----------
+    directory : str
+        Mirror directory. It is created if it does not exist.
+
+    telescopes : str or list
+        Telescope name(s).
+        Default value is 'all'.
+
+    start_date : str
+        Start date of the range.
+
+    end_date : str
+        End date of the range (excluded). If empty, the range ends today.
+
+    date_format : str
+        Date format for 'start_date' and 'end_date' parameters.
+
+    workers : int
+        Number of concurrent downloads.
+        Default value is 8.
+
+    progress : callable
+        Called as progress(done, total) after every day.
+
+    base_urls : str or dict
+        Base URLs of the stations. See 'TugMeteo'.
+
+    Returns
+    -------
+    type of 'dict'
+        Number of 'downloaded', 'skipped' and 'failed' days, downloaded
+        'bytes' and 'elapsed' seconds.
+
+    Examples
+    --------
+    >>> from tugmeteo.cli import sync_meteo_archives
+    >>>
+    >>> summary = sync_meteo_archives('~/tugmeteo', 'T100',
+                                      start_date='2018-01-01',
+                                      end_date='2019-01-01')
+    """
+
+    t0 = time.perf_counter()
+
+    cache = ArchiveCache(directory, today_ttl=0)
+    meteo = TugMeteo(workers=workers, archive_cache=cache,
+                     base_urls=base_urls)
+
+    telescopes = meteo._get_telescopes_arg(telescopes)
+
+    dates = generate_meteo_archive_dates(start_date, end_date, date_format)
+
+    if dates is None:
+        dates = list()
+
+    days = [(tel, d) for tel in telescopes for d in dates]
+    missing = [(tel, d) for tel, d in days if not cache.contains(tel, d)]
+
+    summary = {'downloaded': 0, 'skipped': len(days) - len(missing),
+               'failed': 0, 'bytes': 0}
+
+    done = summary['skipped']
+
+    if progress is not None:
+        progress(done, len(days))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(meteo._get_meteo_archive, tel, d)
+                   for tel, d in missing]
+
+        try:
+            for future in as_completed(futures):
+                raw_archive = future.result()
+
+                if raw_archive is None:
+                    summary['failed'] += 1
+                else:
+                    summary['downloaded'] += 1
+                    summary['bytes'] += len(raw_archive)
+
+                done += 1
+
+                if progress is not None:
+                    progress(done, len(days))
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    summary['elapsed'] = time.perf_counter() - t0
+
+    return summary
+
+
+def _print_progress(done, total):
+    if sys.stderr.isatty():
+        sys.stderr.write('\r{}/{} days'.format(done, total))
+        sys.stderr.flush()
+
+
+def _sync(args):
+    try:
+        summary = sync_meteo_archives(
+            args.directory, args.telescopes, args.start, args.end,
+            workers=args.workers,
+            progress=None if args.quiet else _print_progress,
+            base_urls=args.base_url)
+    except KeyboardInterrupt:
+        sys.stderr.write('\nInterrupted. Run again to resume.\n')
+        return 130
+
+    if not args.quiet and sys.stderr.isatty():
+        sys.stderr.write('\n')
+
+    elapsed = summary['elapsed']
+
+    print('{} downloaded, {} skipped, {} failed in {:.1f} s'.format(
+        summary['downloaded'], summary['skipped'], summary['failed'],
+        elapsed))
+
+    if summary['downloaded'] and elapsed > 0:
+        print('{:.1f} days/s, {:.2f} MB/s'.format(
+            summary['downloaded'] / elapsed,
+            summary['bytes'] / elapsed / 2 ** 20))
+
+    return 1 if summary['failed'] else 0
+
+
+def _serve(args):
+    from .server import main as serve
+
+    argv = ['--host', args.host, '--port', str(args.port),
+            '--interval', str(args.interval)]
+
+    if args.archive_cache is not None:
+        argv += ['--archive-cache', args.archive_cache]
+
+    if args.base_url is not None:
+        argv += ['--base-url', args.base_url]
+
+    serve(argv)
+
+    return 0
+
+
+def _standin(args):
+    from .standin import main as standin
+
+    argv = ['--host', args.host, '--port', str(args.port), '--latency'] + \
+        [str(latency) for latency in args.latency] + \
+        ['--error-rate', str(args.error_rate),
+         '--missing-rate', str(args.missing_rate)]
+
+    if args.bandwidth is not None:
+        argv += ['--bandwidth', str(args.bandwidth)]
+
+    standin(argv)
+
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m tugmeteo',
+        description='TUG meteorology command-line tools.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    sync = commands.add_parser(
+        'sync', help='mirror daily archive files into a directory')
+    sync.add_argument('directory', help='mirror directory')
+    sync.add_argument('-t', '--telescopes', nargs='+', default=['all'],
+                      help="'RTT150', 'T100', 'T60' or 'all'")
+    sync.add_argument('-s', '--start', default='',
+                      help='start date, YYYY-MM-DD')
+    sync.add_argument('-e', '--end', default='',
+                      help='end date (excluded), YYYY-MM-DD; default today')
+    sync.add_argument('-w', '--workers', type=int, default=8,
+                      help='concurrent downloads')
+    sync.add_argument('--base-url', default=None,
+                      help='base URL of a stand-in server')
+    sync.add_argument('-q', '--quiet', action='store_true')
+    sync.set_defaults(func=_sync)
+
+    serve = commands.add_parser(
+        'serve', help='run the caching HTTP/JSON gateway')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8080)
+    serve.add_argument('--interval', type=float, default=60)
+    serve.add_argument('--archive-cache', default=None)
+    serve.add_argument('--base-url', default=None)
+    serve.set_defaults(func=_serve)
+
+    standin = commands.add_parser(
+        'standin', help='run a local stand-in of the observatory hosts')
+    standin.add_argument('--host', default='127.0.0.1')
+    standin.add_argument('--port', type=int, default=8000)
+    standin.add_argument('--latency', type=float, nargs='+', default=[0.0])
+    standin.add_argument('--bandwidth', type=int, default=None)
+    standin.add_argument('--error-rate', type=float, default=0.0)
+    standin.add_argument('--missing-rate', type=float, default=0.0)
+    standin.set_defaults(func=_standin)
+
+    args = parser.parse_args(argv)
+
+    return args.func(args)
@@ -2,30 +2,278 @@
 
 __all__ = ['TugMeteo']
 
+import time
+import random
+import logging
+import hashlib
+import threading
+from datetime import date, datetime, timedelta
+from functools import partial
+from itertools import islice
+from collections import deque
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor, wait
+
 import requests
+from requests.adapters import HTTPAdapter
 
+from .cache import ArchiveCache
+from .store import ArchiveStore
+from .breaker import CircuitBreaker
+from .metrics import MetricsRegistry
 from .helper import get_current_time_stamp, parse_meteo_page,\
-    generate_meteo_archive_urls, parse_meteo_archive, concat_meteo_archive
+    generate_meteo_archive_dates, generate_meteo_archive_url,\
+    parse_meteo_archive, concat_meteo_archive,\
+    get_meteo_archive_grouper, resample_meteo_archive,\
+    compact_meteo_archive, align_meteo_archives, pd
+
+
+_sensors = {
+    'temperature': {
+        'info': 'Temperature',
+        'RTT150': 'Temperature',
+        'T100': 'TEMPERATURE',
+        'T60': 'TEMPERATURE',
+        'unit': 'C'
+    },
+    'dome_temperature': {
+        'info': 'Dome Temperature',
+        'RTT150': 'Dome Temperature',
+        'T100': None,
+        'T60': 'Inside Temperature',
+        'unit': 'C'
+    },
+    'humidity': {
+        'info': 'Humidity',
+        'RTT150': 'Humidity',
+        'T100': 'HUMIDITY',
+        'T60': 'HUMIDITY',
+        'unit': 'RH'
+    },
+    'dome_humidity': {
+        'info': 'Dome Humidity',
+        'RTT150': 'Dome Humidity',
+        'T100': None,
+        'T60': 'Inside Humidity',
+        'unit': 'RH'
+    },
+    'pressure': {
+        'info': 'Pressure',
+        'RTT150': 'Barometer',
+        'T100': 'PRESSURE',
+        'T60': 'PRESSURE',
+        'unit': 'mb'
+    },
+    'wind_speed': {
+        'info': 'Wind Speed',
+        'RTT150': 'Wind',
+        'T100': 'WINDSPEED',
+        'T60': 'WINDSPEED',
+        'unit': 'km/h'
+    },
+    'wind_chill': {
+        'info': 'Wind Chill',
+        'RTT150': 'Wind Chill',
+        'T100': 'Wind Chill',
+        'T60': 'Wind Chill',
+        'unit': 'C'
+    },
+    'wind_direction': {
+        'info': 'Wind Direction',
+        'RTT150': None,
+        'T100': 'WINDDIR',
+        'T60': 'WINDDIR',
+        'unit': 'deg'
+    },
+    'dew_point': {
+        'info': 'Dew Point',
+        'RTT150': 'Dewpoint',
+        'T100': 'Dew Point',
+        'T60': 'Dew Point',
+        'unit': 'C'
+    },
+    'cumulus_base': {
+        'info': 'Est. Cumulus Base',
+        'RTT150': 'Est. Cumulus Base',
+        'T100': 'Est. Cumulus Base',
+        'T60': 'Est. Cumulus Base',
+        'unit': 'm'
+    },
+    'rain': {
+        'info': 'Rain',
+        'RTT150': None,
+        'T100': 'RAIN',
+        'T60': 'RAIN',
+        'unit': 'mm/h'
+    },
+    'uv_index': {
+        'info': 'UV Index',
+        'RTT150': None,
+        'T100': 'UV',
+        'T60': 'UV',
+        'unit': 'index'
+    },
+    'solar_radiation': {
+        'info': 'Solar Radiation',
+        'RTT150': None,
+        'T100': 'Solar Radiation',
+        'T60': 'Solar Radiation',
+        'unit': 'W / m^2'
+    },
+    'air_density': {
+        'info': 'Air Density',
+        'RTT150': None,
+        'T100': 'Air Density',
+        'T60': 'Air Density',
+        'unit': 'kg / m^3'
+    }
+}
+
+
+_transient_statuses = (500, 502, 503, 504)
+
+# Errors of a station that is down or serves a page that cannot be read.
+_page_errors = (requests.exceptions.RequestException, IndexError, KeyError,
+                ValueError)
+
+_logger = logging.getLogger(__name__)
 
 
 class TugMeteo(object):
 
-    def __init__(self):
+    def __init__(self, workers=8, archive_cache=None, max_age=0, history=0,
+                 base_urls=None, metrics=None, retries=2, backoff=0.25,
+                 failure_threshold=3, reset_timeout=30, archive_store=None):
         """
         TugMeteo
 
         TÜBİTAK National Observatory Meteorology Library
 
+        Parameters
+        ----------
+        workers : int
+            Default number of concurrent downloads used by
+            'get_meteo_archives'. All requests share one pooled HTTP session.
+            Default value is 8.
+
+        archive_cache : str or 'ArchiveCache'
+            On-disk cache of the daily archive files. If a 'str' is given,
+            an 'ArchiveCache' is created in that directory.
+            If None, archives are always downloaded.
+
+        max_age : int, float or dict
+            Maximum age of the cached station readings in seconds, either
+            one value for every station or a dict keyed by telescope name.
+            Sensor getters reuse readings younger than this instead of
+            downloading the station page again.
+            Default value is 0 (always download).
+
+        history : int
+            Number of readings kept per station in a 'MeteoHistory'.
+            Every newly downloaded reading is appended to it.
+            Default value is 0 (no history).
+
+        base_urls : str or dict
+            Base URLs of the stations, e.g. of a local stand-in server
+            ('tugmeteo.standin'). Each station page is read from
+            '<base>/' and its archive files from '<base>/ARC-*.txt'.
+            A 'str' is used as '<base_urls>/<telescope>' for every
+            station, a dict gives the base URL per telescope.
+            If None, the observatory hosts are used.
+
+        metrics : 'MetricsRegistry'
+            Registry of the request, parse and cache metrics. It can be
+            shared by several clients. If None, a new one is created.
+
+        retries : int
+            Retries of a request after a connection error or a 5xx
+            response. Timeouts are not retried.
+            Default value is 2.
+
+        backoff : int or float
+            Delay before the first retry in seconds. It doubles with
+            every retry.
+            Default value is 0.25.
+
+        failure_threshold : int
+            Consecutive connection errors or timeouts after which
+            requests to a host fail immediately (see 'CircuitBreaker').
+            Default value is 3.
+
+        reset_timeout : int or float
+            Seconds before a host with an open circuit is probed again.
+            Default value is 30.
+
+        archive_store : str or 'ArchiveStore'
+            Columnar store of the parsed archives used by
+            'query_meteo_archives'. If a 'str' is given, an
+            'ArchiveStore' is created in that directory (requires
+            'pyarrow').
 
         Methods
         -------
         get_meteo_archives(telescope='RTT150', start_date='', end_date='',
-                           date_format='%Y-%m-%d')
+                           date_format='%Y-%m-%d', workers=None,
+                           compact=False)
             Gets meteorology archive from database with 5 min interval.
 
-        get_last_meteo(telescope='all')
+        get_aligned_meteo_archives(telescopes='all', start_date='',
+                                   end_date='', date_format='%Y-%m-%d',
+                                   freq='5min', tolerance='150s',
+                                   workers=None)
+            Gets meteorology archives of several telescopes on a common
+            time grid.
+
+        iter_meteo_archives(telescope='RTT150', start_date='', end_date='',
+                            date_format='%Y-%m-%d', chunk_days=1,
+                            workers=None)
+            Iterates over meteorology archive in chunks of days.
+
+        get_meteo_statistics(telescope='RTT150', start_date='', end_date='',
+                             date_format='%Y-%m-%d', freq='1D',
+                             stats=('min', 'mean', 'max'), percentiles=None,
+                             columns=None, chunk_days=30, workers=None)
+            Returns resampled statistics of meteorology archive.
+
+        query_meteo_archives(telescope='RTT150', start_date='', end_date='',
+                             date_format='%Y-%m-%d', columns=None,
+                             workers=None)
+            Gets meteorology archive of a time range from the archive
+            store, downloading only the days missing in it.
+
+        update_meteo_archive(telescope='RTT150', date='',
+                             date_format='%Y-%m-%d', new_only=False)
+            Updates archive of a single day with the rows appended since
+            the previous call.
+
+        get_last_meteo(telescope='all', refresh=False)
             Return current all meteorological data.
 
+        get_last_meteo_within(deadline, telescope='all', refresh=False)
+            Returns current meteorological data that arrives within a
+            deadline, with the status of every station.
+
+        get_meteo_status(telescope='all')
+            Returns status of the readings in memory.
+
+        start_polling(interval=60, jitter=0.1, telescopes='all')
+            Starts polling meteorological stations in the background.
+
+        stop_polling(timeout=None)
+            Stops background polling.
+
+        close()
+            Stops polling and releases the threads and connections.
+
+        get_meteo_age(telescope='all')
+            Returns age of the latest readings in seconds.
+
+        get_meteo_history(telescope)
+            Returns history of the live readings of a station.
+
+        get_sensor_trend(sensor, telescope='all', seconds=600)
+            Returns trend of a sensor over the latest readings.
+
         get_temperature(telescope='all')
             Returns current temperature.
             Unit is Celsius [C].
@@ -82,6 +330,13 @@ class TugMeteo(object):
             Returns current air density.
             Unit is kg / m^3.
 
+        get_sensor_data(sensor, telescope='all')
+            Returns current data of a sensor.
+
+        get_sensors(sensors='all', telescopes='all', as_frame=True)
+            Returns current data of several sensors with one download
+            per station.
+
         Examples
         --------
         >>> from tugmeteo import TugMeteo
@@ -123,252 +378,1919 @@ class TugMeteo(object):
 
         super(TugMeteo, self).__init__()
 
+        if not isinstance(workers, int) or workers < 1:
+            raise ValueError("'workers' should be a positive 'int' object.")
+
+        if isinstance(archive_cache, str):
+            archive_cache = ArchiveCache(archive_cache)
+
+        if archive_cache is not None and \
+                not isinstance(archive_cache, ArchiveCache):
+            raise TypeError(
+                "'archive_cache' should be a 'str' or 'ArchiveCache' object.")
+
+        if isinstance(archive_store, str):
+            archive_store = ArchiveStore(archive_store)
+
+        if archive_store is not None and \
+                not isinstance(archive_store, ArchiveStore):
+            raise TypeError(
+                "'archive_store' should be a 'str' or 'ArchiveStore' object.")
+
+        if metrics is None:
+            metrics = MetricsRegistry()
+
+        if not isinstance(metrics, MetricsRegistry):
+            raise TypeError("'metrics' should be a 'MetricsRegistry' object.")
+
+        if not isinstance(retries, int) or retries < 0:
+            raise ValueError(
+                "'retries' should be a non-negative 'int' object.")
+
+        if not isinstance(backoff, (int, float)) or backoff < 0:
+            raise ValueError("'backoff' should be a non-negative number.")
+
+        if not isinstance(history, int) or history < 0:
+            raise ValueError(
+                "'history' should be a non-negative 'int' object.")
+
+        if not isinstance(failure_threshold, int) or failure_threshold < 1:
+            raise ValueError(
+                "'failure_threshold' should be a positive 'int' object.")
+
+        if not isinstance(reset_timeout, (int, float)) or reset_timeout < 0:
+            raise ValueError(
+                "'reset_timeout' should be a non-negative number.")
+
         self._telescopes = ['RTT150', 'T100', 'T60']
 
+        if not isinstance(max_age, dict):
+            max_age = dict.fromkeys(self._telescopes, max_age)
+
+        for tel, age in max_age.items():
+            if tel not in self._telescopes:
+                raise ValueError(
+                    "'max_age' keys must be 'RTT150', 'T100' or 'T60'.")
+
+            if not isinstance(age, (int, float)) or age < 0:
+                raise ValueError(
+                    "'max_age' should be a non-negative number.")
+
         self._telescopes_meteo_pages = {
             'RTT150': 'http://rtt150meteo.tug.tubitak.gov.tr',
             'T100': 'http://t100meteo.tug.tubitak.gov.tr',
             'T60': 'http://t60meteo.tug.tubitak.gov.tr/index.html/'}
 
-        self._last_meteos = {'RTT150': None, 'T100': None, 'T60': None}
+        self._archive_base_urls = {'RTT150': None, 'T100': None, 'T60': None}
+
+        if isinstance(base_urls, str):
+            base_urls = {tel: base_urls.rstrip('/') + '/' + tel
+                         for tel in self._telescopes}
+
+        if base_urls is not None:
+            for tel, url in base_urls.items():
+                if tel not in self._telescopes:
+                    raise ValueError(
+                        "'base_urls' keys must be 'RTT150', 'T100' or 'T60'.")
+
+                self._telescopes_meteo_pages[tel] = url.rstrip('/') + '/'
+                self._archive_base_urls[tel] = url
+
+        self._last_meteos = {'RTT150': None, 'T100': None, 'T60': None}
+
+        self._last_updates = {'RTT150': None, 'T100': None, 'T60': None}
+
+        self._page_validators = {'RTT150': None, 'T100': None, 'T60': None}
+
+        self._history = history
+
+        self._histories = {'RTT150': None, 'T100': None, 'T60': None}
+
+        self._pollers = dict()
+
+        self._poll_intervals = dict()
+
+        self._polling_stop = threading.Event()
+
+        # One refresh per station at a time for 'get_last_meteo_within';
+        # a late refresh is joined by the next call.
+        self._refresh_executor = ThreadPoolExecutor(
+            max_workers=len(self._telescopes),
+            thread_name_prefix='tugmeteo-refresh')
+        self._refresh_futures = dict()
+        self._refresh_lock = threading.Lock()
+
+        self._max_ages = {'RTT150': 0, 'T100': 0, 'T60': 0}
+        self._max_ages.update(max_age)
+
+        self._meteo_archives = {'RTT150': None, 'T100': None, 'T60': None}
+
+        self._live_archives = {'RTT150': None, 'T100': None, 'T60': None}
+
+        self._workers = workers
+
+        self._archive_cache = archive_cache
+
+        self._archive_store = archive_store
+
+        self._metrics = metrics
+
+        self._retries = retries
+        self._backoff = backoff
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+
+        self._breakers = dict()
+        self._breakers_lock = threading.Lock()
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(self._telescopes),
+                              pool_maxsize=workers)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
+    def _get_breaker(self, host):
+        """
+        Internal using only.
+        """
+
+        with self._breakers_lock:
+            breaker = self._breakers.get(host)
+
+            if breaker is None:
+                breaker = CircuitBreaker(self._failure_threshold,
+                                         self._reset_timeout)
+                self._breakers[host] = breaker
+
+        return breaker
+
+    def _fetch(self, url, headers=None):
+        """
+        Internal using only.
+        """
+
+        host = urlsplit(url).netloc
+        breaker = self._get_breaker(host)
+        extra = {'url': url}
+
+        respond = None
+
+        for attempt in range(self._retries + 1):
+            if attempt:
+                time.sleep(self._backoff * 2 ** (attempt - 1) *
+                           random.uniform(0.5, 1.5))
+
+            # An open breaker fails fast instead of waiting for a timeout.
+            if not breaker.allow():
+                self._metrics.inc('tugmeteo_http_requests_total',
+                                  extra=extra, host=host,
+                                  status='circuit_open')
+                return None
+
+            start = time.perf_counter()
+
+            try:
+                respond = self._session.get(url, headers=headers, timeout=5)
+            except requests.exceptions.RequestException as e:
+                breaker.record_failure()
+                self._metrics.inc('tugmeteo_http_requests_total',
+                                  extra=extra, host=host, status='error')
+
+                # Retrying a timeout would only double the stall.
+                if isinstance(e, requests.exceptions.Timeout):
+                    return None
+
+                respond = None
+                continue
+            except BaseException:
+                # Not a failure of the host, but a half-open breaker must
+                # not keep its probe slot taken.
+                breaker.release()
+                raise
+
+            elapsed = time.perf_counter() - start
+
+            # A server error is a failure of the host even though it
+            # answered; any other response shows that it is working.
+            if respond.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+            self._metrics.inc('tugmeteo_http_requests_total', extra=extra,
+                              host=host, status=respond.status_code)
+            self._metrics.inc('tugmeteo_http_response_bytes_total',
+                              len(respond.content), extra=extra, host=host)
+            self._metrics.observe('tugmeteo_http_request_seconds', elapsed,
+                                  extra=extra, host=host)
+            self._metrics.observe('tugmeteo_http_response_seconds',
+                                  respond.elapsed.total_seconds(),
+                                  extra=extra, host=host)
+
+            if respond.status_code in _transient_statuses:
+                continue
+
+            return respond
+
+        return respond
+
+    def _get_meteo_page(self, telescope):
+        """
+        Internal using only.
+        """
+
+        if telescope in self._telescopes:
+            validators = self._page_validators[telescope]
+
+            # Validators are useless without the readings they belong to.
+            if self._last_meteos[telescope] is None:
+                validators = None
+
+            headers = None
+            if validators is not None:
+                headers = dict()
+
+                if validators['etag'] is not None:
+                    headers['If-None-Match'] = validators['etag']
+
+                if validators['last_modified'] is not None:
+                    headers['If-Modified-Since'] = validators['last_modified']
+
+            respond = self._fetch(self._telescopes_meteo_pages[telescope],
+                                  headers=headers)
+
+            if respond is None:
+                return None
+
+            if respond.status_code == 304 and validators is not None:
+                return False, None
+
+            if not respond.ok:
+                return None
+
+            digest = hashlib.blake2b(respond.content,
+                                     digest_size=16).digest()
+
+            self._page_validators[telescope] = {
+                'etag': respond.headers.get('ETag'),
+                'last_modified': respond.headers.get('Last-Modified'),
+                'digest': digest}
+
+            if validators is not None and validators['digest'] == digest:
+                return False, None
+
+            with self._metrics.time('tugmeteo_decode_seconds', kind='page'):
+                page = respond.text
+
+            return True, page
+
+        return None
+
+    def _get_meteo_archive(self, telescope, date, not_found=None):
+        """
+        Internal using only.
+        """
+
+        if self._archive_cache is not None:
+            raw_archive = self._archive_cache.get(telescope, date)
+
+            self._metrics.inc('tugmeteo_cache_requests_total',
+                              result='miss' if raw_archive is None else 'hit')
+
+            if raw_archive is not None:
+                return raw_archive
+
+        respond = self._fetch(generate_meteo_archive_url(
+            telescope, date, self._archive_base_urls[telescope]))
+
+        if respond is None or not respond.ok:
+            if respond is not None and respond.status_code == 404 and \
+                    not_found is not None:
+                not_found.add(date)
+
+            return None
+
+        with self._metrics.time('tugmeteo_decode_seconds', kind='archive'):
+            raw_archive = respond.text
+
+        if self._archive_cache is not None:
+            self._archive_cache.set(telescope, date, raw_archive)
+
+        return raw_archive
+
+    def _get_meteo_archive_tail(self, telescope, live):
+        """
+        Internal using only.
+        """
+
+        url = generate_meteo_archive_url(telescope, live['date'],
+                                         self._archive_base_urls[telescope])
+
+        last_line = live['last_line']
+        start = live['offset'] - len(last_line)
+        respond = None
+
+        # The range starts at the last read line, so a response that does
+        # not begin with it shows that the file was replaced.
+        if last_line:
+            respond = self._fetch(
+                url, headers={'Range': 'bytes={}-'.format(start)})
+
+            if respond is None:
+                return None
+
+            if respond.status_code == 206:
+                if respond.content.startswith(last_line):
+                    return live['offset'], respond.content[len(last_line):]
+
+                respond = None
+            elif respond.status_code == 416:
+                respond = None
+
+        if respond is None:
+            respond = self._fetch(url)
+
+            if respond is None:
+                return None
+
+        if not respond.ok:
+            return None
+
+        content = respond.content
+
+        if last_line and content[start:live['offset']] == last_line:
+            return live['offset'], content[live['offset']:]
+
+        return 0, content
+
+    def _update(self, telescope, keep_last=False):
+        """
+        Internal using only.
+        """
+
+        fetched = self._get_meteo_page(telescope)
+
+        if fetched is not None:
+            modified, page = fetched
+
+            # An unchanged page is not parsed again.
+            if modified:
+                try:
+                    with self._metrics.time('tugmeteo_parse_seconds',
+                                            stage='page'):
+                        last_meteo = parse_meteo_page(page, telescope)
+                except Exception:
+                    # Otherwise the page would be answered 304 next time
+                    # and the old readings taken as up to date.
+                    self._page_validators[telescope] = None
+                    raise
+
+                if self._history:
+                    self._append_history(telescope, last_meteo)
+            else:
+                last_meteo = dict(self._last_meteos[telescope],
+                                  timestamp=get_current_time_stamp())
+
+            self._last_meteos[telescope] = last_meteo
+            self._last_updates[telescope] = time.monotonic()
+
+            self._metrics.inc('tugmeteo_pages_total', telescope=telescope,
+                              result='parsed' if modified else 'unchanged')
+
+            return True
+
+        if keep_last:
+            return False
+
+        self._last_meteos[telescope] = None
+        self._last_updates[telescope] = None
+
+        return False
+
+    def _refresh(self, telescope, refresh=False, keep_last=False):
+        """
+        Internal using only.
+        """
+
+        # Polled stations are read from memory.
+        if not refresh and telescope in self._pollers:
+            return self._is_fresh(telescope)
+
+        last_update = self._last_updates[telescope]
+
+        if not refresh and last_update is not None and \
+                time.monotonic() - last_update < self._max_ages[telescope]:
+            return True
+
+        return self._update(telescope, keep_last)
+
+    def _get_fresh_age(self, telescope):
+        """
+        Internal using only.
+        """
+
+        interval = self._poll_intervals.get(telescope)
+
+        # A polled station may miss one poll before it is stale.
+        if interval is not None and telescope in self._pollers:
+            return 2 * interval
+
+        return self._max_ages[telescope]
+
+    def _is_fresh(self, telescope):
+        """
+        Internal using only.
+        """
+
+        last_update = self._last_updates[telescope]
+
+        if self._last_meteos[telescope] is None or last_update is None:
+            return False
+
+        return time.monotonic() - last_update <= \
+            self._get_fresh_age(telescope)
+
+    def _get_meteo_status(self, telescope, updated):
+        """
+        Internal using only.
+        """
+
+        if updated:
+            return 'fresh'
+
+        if self._last_meteos[telescope] is not None:
+            return 'cached-stale'
+
+        return 'failed'
+
+    def _submit_refresh(self, telescope, refresh):
+        """
+        Internal using only.
+        """
+
+        with self._refresh_lock:
+            future = self._refresh_futures.get(telescope)
+
+            # A refresh that is still running is joined, not repeated.
+            if future is None or future.done():
+                future = self._refresh_executor.submit(
+                    self._refresh, telescope, refresh, True)
+                self._refresh_futures[telescope] = future
+
+        return future
+
+    def _refresh_until(self, telescopes, refresh, deadline):
+        """
+        Internal using only.
+        """
+
+        # Previous readings are kept, so a station that fails or misses
+        # the deadline can still be returned as stale. Late refreshes
+        # finish in the background and are used by the next call.
+        futures = {tel: self._submit_refresh(tel, refresh)
+                   for tel in telescopes}
+
+        wait(futures.values(), timeout=deadline)
+
+        meteos = dict()
+        status = dict()
+
+        for tel, future in futures.items():
+            updated = future.done() and future.exception() is None and \
+                future.result()
+
+            meteos[tel] = self._last_meteos[tel]
+            status[tel] = self._get_meteo_status(tel, updated)
+
+        return meteos, status
+
+    def _append_history(self, telescope, last_meteo):
+        """
+        Internal using only.
+        """
+
+        history = self._histories[telescope]
+
+        if history is None:
+            # numpy is loaded only when the history is enabled.
+            from .history import MeteoHistory
+
+            keywords = [k for k, v in last_meteo.items()
+                        if isinstance(v, (int, float))]
+            history = MeteoHistory(self._history, keywords)
+            self._histories[telescope] = history
+
+        history.append(last_meteo)
+
+    def _poll(self, telescope, interval, jitter, stop):
+        """
+        Internal using only.
+        """
+
+        while not stop.is_set():
+            try:
+                self._update(telescope, keep_last=True)
+            except _page_errors as e:
+                self._metrics.inc('tugmeteo_poll_errors_total',
+                                  telescope=telescope, kind='page')
+                _logger.warning('Polling %s failed: %r', telescope, e)
+            except Exception:
+                # The poller keeps running, but the error is not hidden.
+                self._metrics.inc('tugmeteo_poll_errors_total',
+                                  telescope=telescope, kind='unexpected')
+                _logger.exception('Polling %s failed unexpectedly.',
+                                  telescope)
+
+            delay = interval * (1 + random.uniform(-jitter, jitter))
+
+            stop.wait(delay)
+
+    def _get_meteo_info(self, telescope, info_keywords, key):
+        """
+        Internal using only.
+        """
+
+        if self.get_last_meteo(telescope) is not None:
+            return self._collect_meteo_info(telescope, info_keywords, key)
+        else:
+            return None
+
+    def _collect_meteo_info(self, telescope, info_keywords, key):
+        """
+        Internal using only.
+        """
+
+        info = dict()
+        info['timestamp'] = get_current_time_stamp()
+        info['info'] = key
+
+        info['unit'] = info_keywords['unit']
+
+        telescope = telescope.upper()
+
+        if telescope == 'ALL':
+            for tel in self._telescopes:
+                keyword = info_keywords[tel]
+                if keyword is not None:
+                    if self._last_meteos[tel] is not None:
+                        info[tel] = self._last_meteos[tel][keyword]
+                    else:
+                        info[tel] = None
+                else:
+                    info[tel] = None
+        else:
+            keyword = info_keywords[telescope]
+            if keyword is not None:
+                info['telescope'] = telescope
+                info['value'] = self._last_meteos[telescope][keyword]
+            else:
+                info[telescope] = None
+
+        return info
+
+    def _get_sensor_info(self, sensor, telescope):
+        """
+        Internal using only.
+        """
+
+        info_keywords = _sensors[sensor]
+
+        return self._get_meteo_info(telescope, info_keywords,
+                                    info_keywords['info'])
+
+    def _get_sensors_args(self, sensors, telescopes):
+        """
+        Internal using only.
+        """
+
+        if isinstance(sensors, str):
+            sensors = list(_sensors) if sensors == 'all' else [sensors]
+
+        for sensor in sensors:
+            if sensor not in _sensors:
+                raise ValueError("Unknown sensor '{}'.".format(sensor))
+
+        return list(sensors), self._get_telescopes_arg(telescopes)
+
+    def _get_telescopes_arg(self, telescopes):
+        """
+        Internal using only.
+        """
+
+        if isinstance(telescopes, str):
+            telescopes = [telescopes]
+
+        telescopes = [tel.upper() for tel in telescopes]
+
+        if 'ALL' in telescopes:
+            telescopes = list(self._telescopes)
+
+        for tel in telescopes:
+            if tel not in self._telescopes:
+                raise ValueError(
+                    "'telescopes' must be 'RTT150', 'T100', 'T60' or 'all'.")
+
+        return telescopes
+
+    def _collect_sensors(self, sensors, telescopes, as_frame):
+        """
+        Internal using only.
+        """
+
+        timestamp = get_current_time_stamp()
+
+        if not as_frame:
+            data = dict()
+            data['timestamp'] = timestamp
+            data['unit'] = {s: _sensors[s]['unit'] for s in sensors}
+
+            for tel in telescopes:
+                last_meteo = self._last_meteos[tel]
+                data[tel] = dict()
+
+                for sensor in sensors:
+                    keyword = _sensors[sensor][tel]
+
+                    if keyword is None or last_meteo is None:
+                        data[tel][sensor] = None
+                    else:
+                        data[tel][sensor] = last_meteo.get(keyword)
+
+            return data
+
+        rows = list()
+        for tel in telescopes:
+            last_meteo = self._last_meteos[tel]
+
+            for sensor in sensors:
+                keyword = _sensors[sensor][tel]
+
+                if keyword is None or last_meteo is None:
+                    value = None
+                else:
+                    value = last_meteo.get(keyword)
+
+                rows.append((timestamp, tel, sensor, _sensors[sensor]['info'],
+                             value, _sensors[sensor]['unit']))
+
+        t = pd.DataFrame(rows, columns=['timestamp', 'telescope', 'sensor',
+                                        'info', 'value', 'unit'])
+        t['value'] = pd.to_numeric(t['value'])
+
+        return t
+
+    def _parse_meteo_archive(self, raw_archive):
+        """
+        Internal using only.
+        """
+
+        with self._metrics.time('tugmeteo_parse_seconds', stage='archive'):
+            return parse_meteo_archive(raw_archive)
+
+    def _concat_meteo_archive(self, telescope, tables, columns=None):
+        """
+        Internal using only.
+        """
+
+        # The schema comes from the tables of this call only. 'columns'
+        # lets a caller keep one schema across several calls.
+        with self._metrics.time('tugmeteo_parse_seconds', stage='concat'):
+            t = concat_meteo_archive(tables, columns)
+
+        self._metrics.inc('tugmeteo_rows_total', len(t), telescope=telescope)
+
+        return t
+
+    def _get_meteo_archive_dates(self, telescope, start_date, end_date,
+                                date_format, workers):
+        """
+        Internal using only.
+        """
+
+        if not isinstance(telescope, str):
+            raise TypeError("'telescope' should be a 'str' object.")
+
+        telescope = telescope.upper()
+
+        if telescope not in self._telescopes:
+            raise ValueError(
+                "'telescope' must be one of 'RTT150', 'T100' or 'T60'.")
+
+        if not isinstance(start_date, str):
+            raise TypeError("'start_date' should be a 'str' object.")
+
+        if not isinstance(end_date, str):
+            raise TypeError("'end_date' should be a 'str' object.")
+
+        if workers is not None and (not isinstance(workers, int) or
+                                    workers < 1):
+            raise ValueError("'workers' should be a positive 'int' object.")
+
+        dates = generate_meteo_archive_dates(start_date, end_date,
+                                             date_format)
+
+        return telescope, dates
+
+    def _get_meteo_archive_list(self, telescope, dates, workers=None,
+                                not_found=None):
+        """
+        Internal using only.
+        """
+
+        if workers is None:
+            workers = self._workers
+
+        get_meteo_archive = partial(self._get_meteo_archive, telescope,
+                                    not_found=not_found)
+
+        if workers == 1 or len(dates) <= 1:
+            return [get_meteo_archive(d) for d in dates]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(get_meteo_archive, dates))
+
+    def _get_datetime_arg(self, value, name, date_format):
+        """
+        Internal using only.
+        """
+
+        if isinstance(value, datetime):
+            return value
+
+        if isinstance(value, date):
+            return datetime(value.year, value.month, value.day)
+
+        if not isinstance(value, str):
+            raise TypeError(
+                "'{}' should be a 'str' or 'datetime' object.".format(name))
+
+        if value == '':
+            return None
+
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError as error:
+            raise ValueError(error)
+
+    def _build_meteo_archive(self, telescope, raw_archives, compact=False):
+        """
+        Internal using only.
+        """
+
+        if compact not in (False, True, 'float32', 'int16'):
+            raise ValueError(
+                "'compact' must be one of False, True, 'float32' or 'int16'.")
+
+        raw_archives = [raw for raw in raw_archives if raw is not None]
+
+        if raw_archives:
+            tables = list()
+            for raw_archive in raw_archives:
+                table = self._parse_meteo_archive(raw_archive)
+                tables.append(table)
+
+            t = self._concat_meteo_archive(telescope, tables)
+
+            if compact:
+                t = compact_meteo_archive(
+                    t, 'float32' if compact is True else compact)
+
+            self._meteo_archives[telescope] = t
+
+            return t
+
+        return None
+
+    def get_meteo_archives(self, telescope='RTT150', start_date='', end_date='',
+                           date_format='%Y-%m-%d', workers=None,
+                           compact=False):
+        """
+        Gets meteorology archive from database with 5 min interval.
+
+        Daily archive files are downloaded concurrently and are always
+        returned in date order.
+
+        Parameters
+        ----------
+
+        telescope : str
+            The name of the meteorological station (telescope names).
+            Default value is 'RTT150'.
+
+        start_date : str
+            Start date of the archive.
+            It must be in the format specified by 'date_format'.
+            If None, return today's archive.
+
+        end_date : str
+            End date of the archive.
+            It must be in the format specified by 'date_format'.
+
+            If 'start_date' and 'end_date' are empty,
+                return today's archive.
+
+            If 'start_date' is not empty and 'end_date' is empty,
+                returns archive between 'start_date' and today.
+
+        date_format : str
+            Date format for 'start_date' and 'end_date' parameters.
+
+        workers : int
+            Number of concurrent downloads.
+            If None, the value given to the constructor is used.
+            1 downloads the files one after another.
+
+        compact : bool or str
+            If True or 'float32', sensor columns are stored as float32.
+            If 'int16', sensor columns are stored as scaled int16.
+            Compact archives are indexed by a sorted 'Timestamp' index and
+            can be converted back with 'helper.expand_meteo_archive'
+            without any change of values. Columns that cannot be stored
+            exactly keep float64.
+            Default value is False.
+
+        Returns
+        -------
+        'pandas.DataFrame'
+            Returned archive.
+
+        Examples
+        --------
+
+        >>> from tugmeteo import TugMeteo
+        >>>
+        >>> met = TugMeteo()
+        >>>
+        >>> # Returns data from the archive for 7 days.
+        >>> t = met.get_meteo_archives(telescope='T100',
+                                       start_date='2017-05-31',
+                                       end_date='2019-06-07')
+        >>>
+        >>> # Get today's archive (Default telescope is 'RTT150').
+        >>> t = met.get_meteo_archives()
+        >>>
+        >>> # Keep a year in a fraction of the memory.
+        >>> from tugmeteo.helper import get_meteo_archive_memory_usage
+        >>>
+        >>> t = met.get_meteo_archives(telescope='T100',
+                                       start_date='2018-01-01',
+                                       end_date='2019-01-01', compact=True)
+        >>> get_meteo_archive_memory_usage(t)['Total']
+        """
+
+        telescope, dates = self._get_meteo_archive_dates(
+            telescope, start_date, end_date, date_format, workers)
+
+        if dates is None:
+            return None
+
+        raw_archives = self._get_meteo_archive_list(telescope, dates,
+                                                    workers)
+
+        return self._build_meteo_archive(telescope, raw_archives, compact)
+
+    def get_aligned_meteo_archives(self, telescopes='all', start_date='',
+                                   end_date='', date_format='%Y-%m-%d',
+                                   freq='5min', tolerance='150s',
+                                   workers=None):
+        """
+        Gets meteorology archives of several telescopes on a common time grid.
+
+        Archives of the telescopes are downloaded at the same time and
+        every reading is matched to the nearest grid point within
+        'tolerance'.
+
+        Parameters
+        ----------
+        telescopes : str or list
+            Telescope name(s).
+            Each must be one of 'RTT150', 'T100', 'T60' or 'all'.
+            Default value is 'all'.
+
+        start_date : str
+            Start date of the archive.
+            It must be in the format specified by 'date_format'.
+
+        end_date : str
+            End date of the archive.
+            It must be in the format specified by 'date_format'.
+
+        date_format : str
+            Date format for 'start_date' and 'end_date' parameters.
+
+        freq : str
+            Spacing of the time grid.
+            Default value is '5min'.
+
+        tolerance : str
+            Maximum distance between a reading and its grid point.
+            Default value is '150s'.
+
+        workers : int
+            Number of concurrent downloads per telescope.
+            If None, the value given to the constructor is used.
+
+        Returns
+        -------
+        'pandas.DataFrame'
+            Aligned archive with a 'Timestamp' column and one
+            '<telescope>_<column>' column per telescope and sensor.
+            Grid points without any reading are dropped.
+
+        Examples
+        --------
+
+        >>> from tugmeteo import TugMeteo
+        >>>
+        >>> met = TugMeteo()
+        >>>
+        >>> t = met.get_aligned_meteo_archives(start_date='2019-05-01',
+                                               end_date='2019-06-01')
+        >>> (t.T100_Temp - t.T60_Temp).describe()
+        """
+
+        telescopes = self._get_telescopes_arg(telescopes)
+
+        with ThreadPoolExecutor(max_workers=len(telescopes)) as executor:
+            tables = executor.map(
+                lambda tel: self.get_meteo_archives(
+                    tel, start_date, end_date, date_format, workers),
+                telescopes)
+
+            archives = dict(zip(telescopes, tables))
+
+        return align_meteo_archives(archives, freq, tolerance)
+
+    def iter_meteo_archives(self, telescope='RTT150', start_date='',
+                            end_date='', date_format='%Y-%m-%d', chunk_days=1,
+                            workers=None):
+        """
+        Iterates over meteorology archive in chunks of days.
+
+        Each chunk is parsed and filtered as soon as its days are downloaded,
+        so only one chunk (plus at most 'workers' downloads in flight) is
+        held in memory at a time.
+
+        Parameters
+        ----------
+        telescope : str
+            The name of the meteorological station (telescope names).
+            Default value is 'RTT150'.
+
+        start_date : str
+            Start date of the archive.
+            It must be in the format specified by 'date_format'.
+
+        end_date : str
+            End date of the archive.
+            It must be in the format specified by 'date_format'.
+
+        date_format : str
+            Date format for 'start_date' and 'end_date' parameters.
+
+        chunk_days : int
+            Number of days in each yielded chunk.
+            Default value is 1.
+
+        workers : int
+            Number of concurrent downloads.
+            If None, the value given to the constructor is used.
+
+        Yields
+        ------
+        'pandas.DataFrame'
+            Archive of 'chunk_days' days in date order. Chunks without any
+            available day are skipped.
+
+        Examples
+        --------
+
+        >>> from tugmeteo import TugMeteo
+        >>>
+        >>> met = TugMeteo()
+        >>>
+        >>> for t in met.iter_meteo_archives(telescope='T100',
+                                             start_date='2015-01-01',
+                                             end_date='2020-01-01',
+                                             chunk_days=30):
+        >>>     print(t.Timestamp.iloc[0], t.Temp.mean())
+        """
+
+        if not isinstance(chunk_days, int) or chunk_days < 1:
+            raise ValueError("'chunk_days' should be a positive 'int' object.")
+
+        telescope, dates = self._get_meteo_archive_dates(
+            telescope, start_date, end_date, date_format, workers)
+
+        if dates is None:
+            return
+
+        if workers is None:
+            workers = self._workers
+
+        dates = iter(dates)
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+        pending = deque()
+
+        try:
+            for d in islice(dates, workers):
+                pending.append(
+                    executor.submit(self._get_meteo_archive, telescope, d))
+
+            tables = list()
+            columns = None
+            days = 0
+
+            while pending:
+                raw_archive = pending.popleft().result()
+
+                for d in islice(dates, 1):
+                    pending.append(
+                        executor.submit(self._get_meteo_archive, telescope, d))
+
+                if raw_archive is not None:
+                    tables.append(self._parse_meteo_archive(raw_archive))
+                    raw_archive = None
+
+                days += 1
+
+                if days == chunk_days:
+                    if tables:
+                        chunk = self._concat_meteo_archive(telescope, tables,
+                                                           columns)
+
+                        # Chunks of one iteration share a schema.
+                        columns = list(chunk.columns)
+
+                        yield chunk
+                        chunk = None
+
+                    tables = list()
+                    days = 0
+
+            if tables:
+                yield self._concat_meteo_archive(telescope, tables, columns)
+        finally:
+            for future in pending:
+                future.cancel()
+
+            executor.shutdown(wait=False)
+
+    def get_meteo_statistics(self, telescope='RTT150', start_date='',
+                             end_date='', date_format='%Y-%m-%d', freq='1D',
+                             stats=('min', 'mean', 'max'), percentiles=None,
+                             columns=None, chunk_days=30, workers=None):
+        """
+        Returns resampled statistics of meteorology archive.
+
+        The archive is processed in chunks of 'chunk_days' days. Every
+        time period that is complete is aggregated right away and its rows
+        are dropped, so only the aggregated result and the rows of a single
+        unfinished period are held in memory, however long the range is.
+
+        Parameters
+        ----------
+        telescope : str
+            The name of the meteorological station (telescope names).
+            Default value is 'RTT150'.
+
+        start_date : str
+            Start date of the archive.
+            It must be in the format specified by 'date_format'.
+
+        end_date : str
+            End date of the archive.
+            It must be in the format specified by 'date_format'.
+
+        date_format : str
+            Date format for 'start_date' and 'end_date' parameters.
+
+        freq : str
+            Length of the periods, as a pandas offset alias
+            ('1h', '1D', 'W', 'MS', ...).
+            Default value is '1D'.
+
+        stats : list
+            Statistics computed for every column. Each must be one of
+            'count', 'sum', 'min', 'max', 'mean', 'median', 'std', 'var',
+            'first' or 'last'.
+            Default value is ('min', 'mean', 'max').
+
+        percentiles : list
+            Quantiles between 0 and 1 to compute for every column.
+            They are named 'p<percent>', e.g. 0.9 -> 'p90'.
+
+        columns : list
+            Archive columns to aggregate. If None, all columns are used.
+
+        chunk_days : int
+            Number of days downloaded and parsed at a time.
+            Default value is 30.
+
+        workers : int
+            Number of concurrent downloads.
+            If None, the value given to the constructor is used.
+
+        Returns
+        -------
+        'pandas.DataFrame'
+            Statistics indexed by period start, with (column, statistic)
+            columns.
+
+        Examples
+        --------
+
+        >>> from tugmeteo import TugMeteo
+        >>>
+        >>> met = TugMeteo()
+        >>>
+        >>> s = met.get_meteo_statistics(telescope='T100',
+                                         start_date='2010-01-01',
+                                         end_date='2020-01-01',
+                                         freq='1D', columns=['Temp', 'Wind'],
+                                         percentiles=[0.1, 0.5, 0.9])
+        >>> s['Temp']['p90']
+        """
+
+        grouper = get_meteo_archive_grouper(freq)
+
+        parts = list()
+        pending = None
+
+        for t in self.iter_meteo_archives(telescope, start_date, end_date,
+                                          date_format, chunk_days, workers):
+            if columns is not None:
+                t = t[['Timestamp'] + list(columns)]
+
+            if pending is not None:
+                t = pd.concat([pending, t], ignore_index=True)
+
+            if t.empty:
+                continue
+
+            ids = t.groupby(grouper).ngroup().to_numpy()
+            last = ids == ids[-1]
+
+            if not last.all():
+                parts.append(resample_meteo_archive(
+                    t[~last], freq, stats, percentiles))
+
+            pending = t[last]
+
+        if pending is not None and not pending.empty:
+            parts.append(resample_meteo_archive(pending, freq, stats,
+                                                percentiles))
+
+        if parts:
+            return pd.concat(parts)
+
+        return None
+
+    def query_meteo_archives(self, telescope='RTT150', start_date='',
+                             end_date='', date_format='%Y-%m-%d',
+                             columns=None, workers=None):
+        """
+        Gets meteorology archive of a time range from the archive store.
+
+        Only the partitions of the range and the requested columns are
+        read from the store. Days missing in the store are downloaded and
+        parsed as in 'get_meteo_archives', then stored, so a range is
+        downloaded only once. Today's archive is still growing, so it is
+        downloaded on every call (see 'ArchiveCache') and never stored.
+        Days without an archive file (404) are recorded in the store and
+        not downloaded again (see 'ArchiveStore'); days that failed
+        otherwise are tried again by later calls.
+
+        Parameters
+        ----------
+        telescope : str
+            The name of the meteorological station (telescope names).
+            Default value is 'RTT150'.
+
+        start_date : str or 'datetime.datetime'
+            Start of the range. A 'str' must be in the format specified
+            by 'date_format'. If empty, the range starts today.
+
+        end_date : str or 'datetime.datetime'
+            End of the range (excluded). A 'str' must be in the format
+            specified by 'date_format'. If empty, the range ends today.
+
+        date_format : str
+            Date format for 'start_date' and 'end_date' parameters.
+
+        columns : list
+            Columns besides 'Timestamp'. Columns that the archive does
+            not have are filled with NaN. If None, all columns are
+            returned.
+
+        workers : int
+            Number of concurrent downloads of the missing days.
+            If None, the value given to the constructor is used.
+
+        Returns
+        -------
+        'pandas.DataFrame'
+            Rows with start_date <= 'Timestamp' < end_date in 'Timestamp'
+            order, or None if the range has no rows.
+
+        Examples
+        --------
+
+        >>> from tugmeteo import TugMeteo
+        >>>
+        >>> met = TugMeteo(archive_store='~/tugmeteo-store')
+        >>>
+        >>> # Downloads the missing days of the year once.
+        >>> t = met.query_meteo_archives(telescope='T100',
+                                         start_date='2018-01-01',
+                                         end_date='2019-01-01',
+                                         columns=['Temp', 'Humidity'])
+        >>>
+        >>> # A night, read from a single partition.
+        >>> from datetime import datetime
+        >>>
+        >>> t = met.query_meteo_archives(
+                'T100', datetime(2018, 7, 14, 18), datetime(2018, 7, 15, 6))
+        """
+
+        if self._archive_store is None:
+            raise ValueError(
+                "'archive_store' should be given to the constructor.")
+
+        if not isinstance(telescope, str):
+            raise TypeError("'telescope' should be a 'str' object.")
+
+        telescope = telescope.upper()
+
+        if telescope not in self._telescopes:
+            raise ValueError(
+                "'telescope' must be one of 'RTT150', 'T100' or 'T60'.")
+
+        if columns is not None:
+            if isinstance(columns, str) or \
+                    not all(isinstance(c, str) for c in columns):
+                raise TypeError("'columns' should be a 'list' of 'str'.")
+
+            columns = [c for c in columns if c != 'Timestamp']
+
+        if workers is not None and (not isinstance(workers, int) or
+                                    workers < 1):
+            raise ValueError("'workers' should be a positive 'int' object.")
+
+        today = date.today()
+
+        start = self._get_datetime_arg(start_date, 'start_date', date_format)
+        end = self._get_datetime_arg(end_date, 'end_date', date_format)
+
+        if start is None:
+            start = datetime(today.year, today.month, today.day)
+
+        if end is None:
+            end = datetime(today.year, today.month, today.day) + \
+                timedelta(days=1)
+
+        if start >= end:
+            return None
+
+        # The last row of a daily file may be stamped midnight of the next
+        # day, so the file of the day before 'start' is needed as well.
+        epsilon = timedelta(microseconds=1)
+
+        last = min((end - epsilon).date(), today)
+
+        dates = list()
+
+        d = (start - epsilon).date()
+
+        while d <= last:
+            dates.append(d)
+            d = d + timedelta(days=1)
+
+        past = [d for d in dates if d < today]
+
+        missing = self._archive_store.missing(telescope, past)
+
+        self._metrics.inc('tugmeteo_store_days_total',
+                          len(past) - len(missing), result='hit')
+        self._metrics.inc('tugmeteo_store_days_total', len(missing),
+                          result='miss')
+
+        downloads = missing + [d for d in dates if d == today]
+
+        not_found = set()
+
+        raw_archives = self._get_meteo_archive_list(telescope, downloads,
+                                                    workers, not_found)
+
+        stored = list()
+        tables = list()
+        live = None
+
+        for d, raw_archive in zip(downloads, raw_archives):
+            if raw_archive is None:
+                continue
+
+            table = self._parse_meteo_archive(raw_archive)
+
+            if d == today:
+                live = self._concat_meteo_archive(telescope, [table])
+            else:
+                stored.append(d)
+                tables.append(table)
+
+        # Days without a file are recorded, other failures are retried.
+        not_found = sorted(d for d in not_found if d < today)
+
+        if stored or not_found:
+            t = None
+            if tables:
+                t = self._concat_meteo_archive(telescope, tables)
+
+            self._archive_store.write(telescope, t, stored, not_found)
+
+        tables = list()
+
+        t = self._archive_store.read(telescope, start, end, columns)
+
+        if t is not None:
+            tables.append(t)
+
+        if live is not None:
+            live = live[((live['Timestamp'] >= start) &
+                         (live['Timestamp'] < end)).to_numpy()]
+
+            if columns is not None:
+                live = live.reindex(columns=['Timestamp'] + columns)
+
+            if not live.empty:
+                tables.append(live)
+
+        if not tables:
+            return None
+
+        if len(tables) == 1:
+            return tables[0]
+
+        return pd.concat(tables, ignore_index=True)
+
+    def update_meteo_archive(self, telescope='RTT150', date='',
+                             date_format='%Y-%m-%d', new_only=False):
+        """
+        Updates archive of a single day with the rows appended since the
+        previous call.
+
+        Only the unread tail of the archive file is downloaded with an
+        HTTP range request. If the server ignores the range, the whole
+        file is downloaded and only the rows after the previously read
+        ones are parsed.
+
+        Parameters
+        ----------
+        telescope : str
+            The name of the meteorological station (telescope names).
+            Default value is 'RTT150'.
+
+        date : str
+            Date of the archive.
+            It must be in the format specified by 'date_format'.
+            If empty, today's archive is updated.
+
+        date_format : str
+            Date format for 'date' parameter.
+
+        new_only : bool
+            If True, only the rows read by this call are returned.
+            Default value is False.
+
+        Returns
+        -------
+        'pandas.DataFrame'
+            Archive of the day read so far, or None if the archive
+            could not be downloaded.
+
+        Examples
+        --------
+
+        >>> from tugmeteo import TugMeteo
+        >>>
+        >>> met = TugMeteo()
+        >>>
+        >>> # Downloads today's archive.
+        >>> t = met.update_meteo_archive('T100')
+        >>>
+        >>> # Downloads only the rows written in the meantime.
+        >>> t = met.update_meteo_archive('T100')
+        """
+
+        if not isinstance(telescope, str):
+            raise TypeError("'telescope' should be a 'str' object.")
+
+        telescope = telescope.upper()
+
+        if telescope not in self._telescopes:
+            raise ValueError(
+                "'telescope' must be one of 'RTT150', 'T100' or 'T60'.")
+
+        if not isinstance(date, str):
+            raise TypeError("'date' should be a 'str' object.")
+
+        if date:
+            date = datetime.strptime(date, date_format).date()
+        else:
+            date = datetime.today().date()
+
+        live = self._live_archives[telescope]
+
+        if live is None or live['date'] != date:
+            live = {'date': date, 'offset': 0, 'header': b'',
+                    'last_line': b'', 'table': None}
+
+        tail = self._get_meteo_archive_tail(telescope, live)
+
+        if tail is None:
+            return None
+
+        offset, content = tail
+
+        if offset == 0:
+            live.update(offset=0, header=b'', last_line=b'', table=None)
+
+        # Header and unit lines are kept to parse the appended rows.
+        if not live['header']:
+            end = content.find(b'\n', content.find(b'\n') + 1) + 1
+
+            if end == 0:
+                return live['table']
+
+            live['header'] = content[:end]
+            live['offset'] = end
+            content = content[end:]
+
+        # An incomplete last line is read again by the next call.
+        end = content.rfind(b'\n') + 1
+        t = None
+
+        if end > 0:
+            rows = content[:end]
+
+            t = self._parse_meteo_archive(
+                (live['header'] + rows).decode('utf-8', 'replace'))
+            columns = None
+            if live['table'] is not None:
+                columns = list(live['table'].columns)
+
+            t = self._concat_meteo_archive(telescope, [t], columns)
+
+            if live['table'] is not None:
+                t_all = pd.concat([live['table'], t], ignore_index=True)
+            else:
+                t_all = t
+
+            live['table'] = t_all
+            live['offset'] += end
+            live['last_line'] = rows[rows.rfind(b'\n', 0, -1) + 1:]
+
+        self._live_archives[telescope] = live
+
+        if new_only:
+            return t
+
+        return live['table']
+
+    def get_last_meteo(self, telescope='all', refresh=False):
+        """
+        Return current all meteorological data.
+
+        Readings younger than 'max_age' seconds are returned from memory.
+
+        Parameters
+        ----------
+        telescope : str
+            Telescope name.
+            'telescope' must be one of 'RTT150', 'T100', 'T60' or 'all'.
+            Default value is 'all'.
+
+        refresh : bool
+            If True, station pages are downloaded even if the cached
+            readings are not older than 'max_age'.
+            Default value is False.
+
+        Returns
+        -------
+        Type of 'dict'
+
+        Examples
+        --------
+
+        >>> from tugmeteo import TugMeteo
+        >>>
+        >>> met = TugMeteo()
+        >>>
+        >>> data = met.get_last_meteo('RTT150')
+        >>> print(data)
+        {
+            'timestamp': '2019-05-31T22:55:33',
+            'telescope': 'RTT150',
+            'Temperature': 13.8,
+            'Dome Temperature': 14.7,
+            'Coude Temperature': 13.0,
+            'Humidity': 43.0,
+            'Dome Humidity': 42.0,
+            'Coude Humidity': 57.0,
+            'Barometer': 757.7,
+            'Wind': 10.0,
+            'Wind Chill': 13.8,
+            'Dewpoint': 1.5,
+            'High Temperature': 17.2,
+            'Low Temperature': 11.7,
+            'High Humidity': 54.0,
+            'Low Humidity': 32.0,
+            'High Barometer': 759.7,
+            'Low Barometer': 757.0,
+            'High Wind': 37.0,
+            'Est. Cumulus Base': 1547.0
+        }
+        """
+
+        telescope = telescope.upper()
+
+        if telescope == 'ALL':
+            self._telescope = telescope
+
+            for telescope in self._telescopes:
+                self._refresh(telescope, refresh)
+
+            return self._last_meteos
+
+        if telescope in self._telescopes:
+            self._telescope = telescope
+
+            self._refresh(telescope, refresh)
+
+            return self._last_meteos[telescope]
+
+        return None
+
+    def get_last_meteo_within(self, deadline, telescope='all',
+                              refresh=False):
+        """
+        Returns current meteorological data that arrives within a
+        deadline, with the status of every station.
+
+        Stations are downloaded at the same time. A station that fails or
+        does not answer in time keeps its previous readings; its download
+        goes on in the background and is used by the next call.
+
+        Parameters
+        ----------
+        deadline : int or float
+            Maximum duration of the call in seconds.
+
+        telescope : str
+            Telescope name.
+            'telescope' must be one of 'RTT150', 'T100', 'T60' or 'all'.
+            Default value is 'all'.
+
+        refresh : bool
+            If True, station pages are downloaded even if the cached
+            readings are not older than 'max_age'.
+            Default value is False.
+
+        Returns
+        -------
+        type of 'tuple'
+            Readings and their status: 'fresh', 'cached-stale' if the
+            previous readings are returned, or 'failed' if there are
+            none. Both are dicts keyed by telescope name if telescope is
+            'all'.
+
+        Examples
+        --------
+        >>> from tugmeteo import TugMeteo
+        >>>
+        >>> met = TugMeteo()
+        >>>
+        >>> # Whatever has arrived after 2 seconds.
+        >>> data, status = met.get_last_meteo_within(2)
+        >>> print(status)
+        {'RTT150': 'fresh', 'T100': 'cached-stale', 'T60': 'failed'}
+        """
+
+        if not isinstance(deadline, (int, float)) or deadline < 0:
+            raise ValueError("'deadline' should be a non-negative number.")
+
+        telescope = telescope.upper()
+
+        if telescope == 'ALL':
+            telescopes = list(self._telescopes)
+        elif telescope in self._telescopes:
+            telescopes = [telescope]
+        else:
+            return None
+
+        self._telescope = telescope
+
+        meteos, status = self._refresh_until(telescopes, refresh, deadline)
 
-        self._meteo_archives = {'RTT150': None, 'T100': None, 'T60': None}
+        if telescope == 'ALL':
+            return meteos, status
 
-    def _get_meteo_page(self, telescope):
+        return meteos[telescope], status[telescope]
+
+    def get_meteo_status(self, telescope='all'):
         """
-        Internal using only.
+        Returns status of the readings in memory.
+
+        Readings are 'fresh' while they are not older than 'max_age'
+        seconds, or than two poll intervals while the station is polled.
+
+        Parameters
+        ----------
+        telescope : str
+            Telescope name.
+            'telescope' must be one of 'RTT150', 'T100', 'T60' or 'all'.
+            Default value is 'all'.
+
+        Returns
+        -------
+        type of 'str' or 'dict'
+            'fresh', 'cached-stale' if the readings are older, or 'failed'
+            if there are no readings. A dict keyed by telescope name if
+            telescope is 'all'.
+
+        Examples
+        --------
+        >>> from tugmeteo import TugMeteo
+        >>>
+        >>> met = TugMeteo()
+        >>> met.start_polling(interval=30)
+        >>>
+        >>> print(met.get_meteo_status())
+        {'RTT150': 'fresh', 'T100': 'cached-stale', 'T60': 'failed'}
         """
 
-        if telescope in self._telescopes:
-            try:
-                respond = requests.get(
-                    self._telescopes_meteo_pages[telescope],
-                    timeout=5)
-            except requests.exceptions.RequestException:
-                return None
+        telescope = telescope.upper()
 
-            return respond.text
+        if telescope == 'ALL':
+            return {tel: self._get_meteo_status(tel, self._is_fresh(tel))
+                    for tel in self._telescopes}
+
+        if telescope in self._telescopes:
+            return self._get_meteo_status(telescope,
+                                          self._is_fresh(telescope))
 
         return None
 
-    def _update(self, telescope):
-        """
-        Internal using only.
+    def start_polling(self, interval=60, jitter=0.1, telescopes='all'):
         """
+        Starts polling meteorological stations in the background.
 
-        page = self._get_meteo_page(telescope)
+        Every station is polled by its own daemon thread. While a station
+        is polled, 'get_last_meteo' and the sensor getters return its
+        latest readings from memory without any download. A failed poll
+        keeps the previous readings; their age is returned by
+        'get_meteo_age'.
 
-        if page is not None:
-            last_meteo = parse_meteo_page(page, telescope)
-            self._last_meteos[telescope] = last_meteo
+        Parameters
+        ----------
+        interval : int, float or dict
+            Seconds between polls, either one value for every station or
+            a dict keyed by telescope name.
+            Default value is 60.
+
+        jitter : float
+            Random spread of the interval as a fraction of it, so that
+            stations are not polled in lockstep.
+            Default value is 0.1.
+
+        telescopes : str or list
+            Telescope name(s) to poll.
+            Default value is 'all'.
 
-            return True
+        Examples
+        --------
+        >>> from tugmeteo import TugMeteo
+        >>>
+        >>> met = TugMeteo()
+        >>> met.start_polling(interval={'RTT150': 30, 'T100': 60, 'T60': 60})
+        >>>
+        >>> # Returns immediately.
+        >>> t = met.get_temperature('all')
+        >>> age = met.get_meteo_age('all')
+        >>>
+        >>> met.stop_polling()
+        """
 
-        self._last_meteos[telescope] = None
+        telescopes = self._get_telescopes_arg(telescopes)
 
-        return False
+        if not isinstance(interval, dict):
+            interval = dict.fromkeys(telescopes, interval)
 
-    def _get_meteo_info(self, telescope, info_keywords, key):
-        """
-        Internal using only.
-        """
+        for tel in telescopes:
+            if not isinstance(interval.get(tel), (int, float)) or \
+                    interval[tel] <= 0:
+                raise ValueError("'interval' should be a positive number.")
 
-        info = dict()
-        info['timestamp'] = get_current_time_stamp()
-        info['info'] = key
+        if not isinstance(jitter, (int, float)) or not 0 <= jitter < 1:
+            raise ValueError("'jitter' should be a number in [0, 1).")
 
-        info['unit'] = info_keywords['unit']
+        if self._pollers:
+            self.stop_polling()
 
-        telescope = telescope.upper()
+        self._polling_stop = threading.Event()
 
-        if self.get_last_meteo(telescope) is not None:
-            if telescope == 'ALL':
-                for tel in self._telescopes:
-                    keyword = info_keywords[tel]
-                    if keyword is not None:
-                        if self._last_meteos[tel] is not None:
-                            info[tel] = self._last_meteos[tel][keyword]
-                        else:
-                            info[tel] = None
-                    else:
-                        info[tel] = None
-            else:
-                keyword = info_keywords[telescope]
-                if keyword is not None:
-                    info['telescope'] = telescope
-                    info['value'] = self._last_meteos[telescope][keyword]
-                else:
-                    info[telescope] = None
+        for tel in telescopes:
+            self._poll_intervals[tel] = interval[tel] * (1 + jitter)
 
-            return info
-        else:
-            return None
+            poller = threading.Thread(
+                target=self._poll,
+                args=(tel, interval[tel], jitter, self._polling_stop),
+                name='tugmeteo-poller-' + tel, daemon=True)
+            self._pollers[tel] = poller
+            poller.start()
 
-    def get_meteo_archives(self, telescope='RTT150', start_date='', end_date='',
-                           date_format='%Y-%m-%d'):
+    def stop_polling(self, timeout=None):
         """
-        Gets meteorology archive from database with 5 min interval.
+        Stops background polling started by 'start_polling'.
 
         Parameters
         ----------
+        timeout : int or float
+            Maximum seconds to wait for every poller to finish its
+            current download. If None, waits until they finish.
+        """
 
-        telescope : str
-            The name of the meteorological station (telescope names).
-            Default value is 'RTT150'.
+        self._polling_stop.set()
 
-        start_date : str
-            Start date of the archive.
-            It must be in the format specified by 'date_format'.
-            If None, return today's archive.
+        pollers = list(self._pollers.values())
+        self._pollers = dict()
+        self._poll_intervals = dict()
 
-        end_date : str
-            End date of the archive.
-            It must be in the format specified by 'date_format'.
+        for poller in pollers:
+            poller.join(timeout)
 
-            If 'start_date' and 'end_date' are empty,
-                return today's archive.
+    def close(self):
+        """
+        Stops polling and releases the threads and connections.
 
-            If 'start_date' is not empty and 'end_date' is empty,
-                returns archive between 'start_date' and today.
+        Refreshes that are still running are not waited for. The client
+        should not be used afterwards.
+        """
 
-        date_format : str
-            Date format for 'start_date' and 'end_date' parameters.
+        self.stop_polling(timeout=0)
 
-        Returns
-        -------
-        'pandas.DataFrame'
-            Returned archive.
+        self._refresh_executor.shutdown(wait=False, cancel_futures=True)
 
-        Examples
-        --------
+        self._session.close()
 
-        >>> from tugmeteo import TugMeteo
-        >>>
-        >>> met = TugMeteo()
-        >>>
-        >>> # Returns data from the archive for 7 days.
-        >>> t = met.get_meteo_archives(telescope='T100',
-                                       start_date='2017-05-31',
-                                       end_date='2019-06-07')
-        >>>
-        >>> # Get today's archive (Default telescope is 'RTT150').
-        >>> t = met.get_meteo_archives()
+    @property
+    def polling(self):
+        """
+        Telescopes that are polled in the background.
         """
 
-        if not isinstance(telescope, str):
-            raise TypeError("'telescope' should be a 'str' object.")
+        return list(self._pollers)
 
-        telescope = telescope.upper()
+    def get_meteo_age(self, telescope='all'):
+        """
+        Returns age of the latest readings in seconds.
 
-        if telescope not in self._telescopes:
-            raise ValueError(
-                "'telescope' must be one of 'RTT150', 'T100' or 'T60'.")
+        Parameters
+        ----------
+        telescope : str
+            Telescope name.
+            'telescope' must be one of 'RTT150', 'T100', 'T60' or 'all'.
+            Default value is 'all'.
 
-        if not isinstance(start_date, str):
-            raise TypeError("'start_date' should be a 'str' object.")
+        Returns
+        -------
+        type of 'float' or 'dict'
+            Seconds since the readings were downloaded, or None if there
+            are no readings. A dict keyed by telescope name if telescope
+            is 'all'.
+        """
 
-        if not isinstance(end_date, str):
-            raise TypeError("'end_date' should be a 'str' object.")
+        now = time.monotonic()
 
-        urls = generate_meteo_archive_urls(telescope, start_date,
-                                           end_date, date_format)
+        ages = dict()
+        for tel in self._get_telescopes_arg(telescope):
+            last_update = self._last_updates[tel]
+            ages[tel] = None if last_update is None else now - last_update
 
-        if urls is None:
-            return None
+        if telescope.upper() == 'ALL':
+            return ages
 
-        raw_archives = list()
-        for url in urls:
-            r = None
-            try:
-                r = requests.get(url, timeout=5)
-                if not r.ok:
-                    continue
-            except requests.exceptions.RequestException:
-                continue
+        return ages[telescope.upper()]
 
-            if r is not None:
-                raw_archives.append(r.text)
+    @property
+    def breakers(self):
+        """
+        States of the circuit breakers keyed by host.
+        """
 
-        if raw_archives:
-            tables = list()
-            for raw_archive in raw_archives:
-                table = parse_meteo_archive(raw_archive)
-                tables.append(table)
+        with self._breakers_lock:
+            breakers = dict(self._breakers)
 
-            t = concat_meteo_archive(tables)
+        return {host: b.state for host, b in breakers.items()}
 
-            self._meteo_archives[telescope] = t
+    @property
+    def metrics(self):
+        """
+        'MetricsRegistry' of the client.
+        """
 
-            return t
+        return self._metrics
 
-        return None
+    def get_meteo_history(self, telescope):
+        """
+        Returns history of the live readings of a station.
+
+        Parameters
+        ----------
+        telescope : str
+            Telescope name.
+            'telescope' must be one of 'RTT150', 'T100' or 'T60'.
 
-    def get_last_meteo(self, telescope='all'):
+        Returns
+        -------
+        'MeteoHistory'
+            History of the station, or None if the history is disabled
+            or there is no reading yet.
         """
-        Return current all meteorological data.
+
+        return self._histories.get(telescope.upper())
+
+    def get_sensor_trend(self, sensor, telescope='all', seconds=600):
+        """
+        Returns trend of a sensor over the latest readings.
+
+        Requires the history to be enabled with the 'history' parameter.
 
         Parameters
         ----------
+        sensor : str
+            Sensor name accepted by 'get_sensor_data'.
+
         telescope : str
             Telescope name.
             'telescope' must be one of 'RTT150', 'T100', 'T60' or 'all'.
             Default value is 'all'.
 
+        seconds : int or float
+            Length of the trend window in seconds.
+            Default value is 600.
+
         Returns
         -------
-        Type of 'dict'
+        type of 'dict'
+            Mean, minimum, maximum and slope (unit per second) of the
+            sensor, keyed by telescope name.
 
         Examples
         --------
-
         >>> from tugmeteo import TugMeteo
         >>>
-        >>> met = TugMeteo()
+        >>> met = TugMeteo(history=720)
+        >>> met.start_polling(interval=5)
         >>>
-        >>> data = met.get_last_meteo('RTT150')
-        >>> print(data)
+        >>> wind = met.get_sensor_trend('wind_speed', 'T100', seconds=600)
+        >>> print(wind)
         {
-            'timestamp': '2019-05-31T22:55:33',
-            'telescope': 'RTT150',
-            'Temperature': 13.8,
-            'Dome Temperature': 14.7,
-            'Coude Temperature': 13.0,
-            'Humidity': 43.0,
-            'Dome Humidity': 42.0,
-            'Coude Humidity': 57.0,
-            'Barometer': 757.7,
-            'Wind': 10.0,
-            'Wind Chill': 13.8,
-            'Dewpoint': 1.5,
-            'High Temperature': 17.2,
-            'Low Temperature': 11.7,
-            'High Humidity': 54.0,
-            'Low Humidity': 32.0,
-            'High Barometer': 759.7,
-            'Low Barometer': 757.0,
-            'High Wind': 37.0,
-            'Est. Cumulus Base': 1547.0
+            'timestamp': '2019-05-31T23:18:41',
+            'info': 'Wind Speed',
+            'unit': 'km/h',
+            'T100': {'mean': 12.4, 'min': 6.0, 'max': 31.0,
+                     'slope': 0.0041}
         }
         """
 
-        telescope = telescope.upper()
-
-        if telescope == 'ALL':
-            self._telescope = telescope
+        if sensor not in _sensors:
+            raise ValueError("Unknown sensor '{}'.".format(sensor))
 
-            for telescope in self._telescopes:
-                self._update(telescope)
+        info_keywords = _sensors[sensor]
 
-            return self._last_meteos
+        info = dict()
+        info['timestamp'] = get_current_time_stamp()
+        info['info'] = info_keywords['info']
+        info['unit'] = info_keywords['unit']
 
-        if telescope in self._telescopes:
-            self._telescope = telescope
+        for tel in self._get_telescopes_arg(telescope):
+            keyword = info_keywords[tel]
+            history = self._histories[tel]
 
-            self._update(telescope)
+            if keyword is None or history is None or \
+                    keyword not in history.keywords:
+                info[tel] = None
+                continue
 
-            return self._last_meteos[telescope]
+            info[tel] = {
+                'mean': history.mean(keyword, seconds),
+                'min': history.min(keyword, seconds),
+                'max': history.max(keyword, seconds),
+                'slope': history.slope(keyword, seconds)}
 
-        return None
+        return info
 
     def get_temperature(self, telescope='all'):
         """
@@ -406,14 +2328,7 @@ class TugMeteo(object):
         }
         """
 
-        info_keywords = {
-            'RTT150': 'Temperature',
-            'T100': 'TEMPERATURE',
-            'T60': 'TEMPERATURE',
-            'unit': 'C'
-        }
-
-        return self._get_meteo_info(telescope, info_keywords, 'Temperature')
+        return self._get_sensor_info('temperature', telescope)
 
     def get_dome_temperature(self, telescope='all'):
         """
@@ -451,15 +2366,7 @@ class TugMeteo(object):
         }
         """
 
-        info_keywords = {
-            'RTT150': 'Dome Temperature',
-            'T100': None,
-            'T60': 'Inside Temperature',
-            'unit': 'C'
-        }
-
-        return self._get_meteo_info(telescope, info_keywords,
-                                    'Dome Temperature')
+        return self._get_sensor_info('dome_temperature', telescope)
 
     def get_humidity(self, telescope='all'):
         """
@@ -497,14 +2404,7 @@ class TugMeteo(object):
         }
         """
 
-        info_keywords = {
-            'RTT150': 'Humidity',
-            'T100': 'HUMIDITY',
-            'T60': 'HUMIDITY',
-            'unit': 'RH'
-        }
-
-        return self._get_meteo_info(telescope, info_keywords, 'Humidity')
+        return self._get_sensor_info('humidity', telescope)
 
     def get_dome_humidity(self, telescope='all'):
         """
@@ -542,14 +2442,7 @@ class TugMeteo(object):
         }
         """
 
-        info_keywords = {
-            'RTT150': 'Dome Humidity',
-            'T100': None,
-            'T60': 'Inside Humidity',
-            'unit': 'RH'
-        }
-
-        return self._get_meteo_info(telescope, info_keywords, 'Dome Humidity')
+        return self._get_sensor_info('dome_humidity', telescope)
 
     def get_pressure(self, telescope='all'):
         """
@@ -587,14 +2480,7 @@ class TugMeteo(object):
         }
         """
 
-        info_keywords = {
-            'RTT150': 'Barometer',
-            'T100': 'PRESSURE',
-            'T60': 'PRESSURE',
-            'unit': 'mb'
-        }
-
-        return self._get_meteo_info(telescope, info_keywords, 'Pressure')
+        return self._get_sensor_info('pressure', telescope)
 
     def get_wind_speed(self, telescope='all'):
         """
@@ -632,14 +2518,7 @@ class TugMeteo(object):
         }
         """
 
-        info_keywords = {
-            'RTT150': 'Wind',
-            'T100': 'WINDSPEED',
-            'T60': 'WINDSPEED',
-            'unit': 'km/h'
-        }
-
-        return self._get_meteo_info(telescope, info_keywords, 'Wind Speed')
+        return self._get_sensor_info('wind_speed', telescope)
 
     def get_wind_chill(self, telescope='all'):
         """
@@ -677,14 +2556,7 @@ class TugMeteo(object):
         }
         """
 
-        info_keywords = {
-            'RTT150': 'Wind Chill',
-            'T100': 'Wind Chill',
-            'T60': 'Wind Chill',
-            'unit': 'C'
-        }
-
-        return self._get_meteo_info(telescope, info_keywords, 'Wind Chill')
+        return self._get_sensor_info('wind_chill', telescope)
 
     def get_wind_direction(self, telescope='all'):
         """
@@ -722,14 +2594,7 @@ class TugMeteo(object):
         }
         """
 
-        info_keywords = {
-            'RTT150': None,
-            'T100': 'WINDDIR',
-            'T60': 'WINDDIR',
-            'unit': 'deg'
-        }
-
-        return self._get_meteo_info(telescope, info_keywords, 'Wind Direction')
+        return self._get_sensor_info('wind_direction', telescope)
 
     def get_dew_point(self, telescope='all'):
         """
@@ -767,14 +2632,7 @@ class TugMeteo(object):
         }
         """
 
-        info_keywords = {
-            'RTT150': 'Dewpoint',
-            'T100': 'Dew Point',
-            'T60': 'Dew Point',
-            'unit': 'C'
-        }
-
-        return self._get_meteo_info(telescope, info_keywords, 'Dew Point')
+        return self._get_sensor_info('dew_point', telescope)
 
     def get_cumulus_base(self, telescope='all'):
         """
@@ -812,15 +2670,7 @@ class TugMeteo(object):
         }
         """
 
-        info_keywords = {
-            'RTT150': 'Est. Cumulus Base',
-            'T100': 'Est. Cumulus Base',
-            'T60': 'Est. Cumulus Base',
-            'unit': 'm'
-        }
-
-        return self._get_meteo_info(telescope, info_keywords,
-                                    'Est. Cumulus Base')
+        return self._get_sensor_info('cumulus_base', telescope)
 
     def get_rain(self, telescope='all'):
         """
@@ -858,14 +2708,7 @@ class TugMeteo(object):
         }
         """
 
-        info_keywords = {
-            'RTT150': None,
-            'T100': 'RAIN',
-            'T60': 'RAIN',
-            'unit': 'mm/h'
-        }
-
-        return self._get_meteo_info(telescope, info_keywords, 'Rain')
+        return self._get_sensor_info('rain', telescope)
 
     def get_uv_index(self, telescope='all'):
         """
@@ -903,14 +2746,7 @@ class TugMeteo(object):
         }
         """
 
-        info_keywords = {
-            'RTT150': None,
-            'T100': 'UV',
-            'T60': 'UV',
-            'unit': 'index'
-        }
-
-        return self._get_meteo_info(telescope, info_keywords, 'UV Index')
+        return self._get_sensor_info('uv_index', telescope)
 
     def get_solar_radiation(self, telescope='all'):
         """
@@ -948,15 +2784,7 @@ class TugMeteo(object):
         }
         """
 
-        info_keywords = {
-            'RTT150': None,
-            'T100': 'Solar Radiation',
-            'T60': 'Solar Radiation',
-            'unit': 'W / m^2'
-        }
-
-        return self._get_meteo_info(telescope, info_keywords,
-                                    'Solar Radiation')
+        return self._get_sensor_info('solar_radiation', telescope)
 
     def get_air_density(self, telescope='all'):
         """
@@ -994,14 +2822,7 @@ class TugMeteo(object):
         }
         """
 
-        info_keywords = {
-            'RTT150': None,
-            'T100': 'Air Density',
-            'T60': 'Air Density',
-            'unit': 'kg / m^3'
-        }
-
-        return self._get_meteo_info(telescope, info_keywords, 'Air Density')
+        return self._get_sensor_info('air_density', telescope)
 
     def get_sensor_data(self, sensor, telescope='all'):
         """
@@ -1040,46 +2861,59 @@ class TugMeteo(object):
         }
         """
 
-        if sensor == 'temperature':
-            return self.get_temperature(telescope)
+        if sensor in _sensors:
+            return self._get_sensor_info(sensor, telescope)
 
-        if sensor == 'dome_temperature':
-            return self.get_dome_temperature(telescope)
-
-        if sensor == 'humidity':
-            return self.get_humidity(telescope)
-
-        if sensor == 'dome_humidity':
-            return self.get_dome_humidity(telescope)
-
-        if sensor == 'pressure':
-            return self.get_pressure(telescope)
+        return {}
 
-        if sensor == 'wind_speed':
-            return self.get_wind_speed(telescope)
+    def get_sensors(self, sensors='all', telescopes='all', as_frame=True):
+        """
+        Return current data of several sensors at once.
 
-        if sensor == 'wind_chill':
-            return self.get_wind_chill(telescope)
+        Every station is downloaded at most once, however many sensors
+        are requested.
 
-        if sensor == 'wind_direction':
-            return self.get_wind_direction(telescope)
+        Parameters
+        ----------
+        sensors : str or list
+            Sensor name(s) accepted by 'get_sensor_data' or 'all'.
+            Default value is 'all'.
 
-        if sensor == 'dew_point':
-            return self.get_dew_point(telescope)
+        telescopes : str or list
+            Telescope name(s).
+            Each must be one of 'RTT150', 'T100', 'T60' or 'all'.
+            Default value is 'all'.
 
-        if sensor == 'cumulus_base':
-            return self.get_cumulus_base(telescope)
+        as_frame : bool
+            If True, returns a tidy 'pandas.DataFrame' with one row per
+            telescope and sensor. Otherwise returns a 'dict' keyed by
+            telescope and sensor.
+            Default value is True.
 
-        if sensor == 'rain':
-            return self.get_rain(telescope)
+        Returns
+        -------
+        'pandas.DataFrame' or type of 'dict'
+            Sensor data. Sensors that a station does not have are None
+            (NaN in the 'pandas.DataFrame').
 
-        if sensor == 'uv_index':
-            return self.get_uv_index(telescope)
+        Examples
+        --------
+        >>> from tugmeteo import TugMeteo
+        >>>
+        >>> met = TugMeteo()
+        >>>
+        >>> t = met.get_sensors(['temperature', 'wind_speed'], ['T100', 'T60'])
+        >>> print(t)
+                     timestamp telescope       sensor         info  value  unit
+        0  2019-05-31T23:18:41      T100  temperature  Temperature   13.5     C
+        1  2019-05-31T23:18:41      T100   wind_speed   Wind Speed   24.1  km/h
+        2  2019-05-31T23:18:41       T60  temperature  Temperature   13.8     C
+        3  2019-05-31T23:18:41       T60   wind_speed   Wind Speed   11.3  km/h
+        """
 
-        if sensor == 'solar_radiation':
-            return self.get_solar_radiation(telescope)
+        sensors, telescopes = self._get_sensors_args(sensors, telescopes)
 
-        if sensor == 'air_density':
-            return self.get_air_density(telescope)
+        for tel in telescopes:
+            self._refresh(tel)
 
-        return {}
+        return self._collect_sensors(sensors, telescopes, as_frame)
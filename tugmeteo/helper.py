@@ -1,16 +1,39 @@
 #!/usr/bin/env python
 
 __all__ = ['get_current_time_stamp', 'parse_meteo_page',
-           'parse_meteo_archive', 'concat_meteo_archive',
-           'generate_meteo_archive_urls']
-
+           'parse_meteo_archive', 'get_meteo_archive_columns',
+           'concat_meteo_archive', 'generate_meteo_archive_dates',
+           'generate_meteo_archive_url', 'generate_meteo_archive_urls',
+           'get_meteo_archive_grouper', 'resample_meteo_archive',
+           'compact_meteo_archive', 'expand_meteo_archive',
+           'get_meteo_archive_memory_usage', 'align_meteo_archives']
+
+import re
+import importlib
 from io import StringIO
+from html import unescape as html_unescape
 from datetime import datetime, timedelta
 
-from bs4 import BeautifulSoup
 
-import numpy as np
-import pandas as pd
+class _LazyModule(object):
+    # Imports the module on first attribute access, so that
+    # 'import tugmeteo' and the live readings do not load pandas, numpy
+    # and bs4.
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+
+        return getattr(self._module, attr)
+
+
+pd = _LazyModule('pandas')
+np = _LazyModule('numpy')
+bs4 = _LazyModule('bs4')
 
 
 def get_current_time_stamp():
@@ -18,12 +41,161 @@ def get_current_time_stamp():
     return t.strftime('%Y-%m-%dT%H:%M:%S')
 
 
-def parse_meteo_page(html, telescope):
+_ignored_markup_pattern = re.compile(
+    r'<!--.*?-->|<(script|style)\b.*?</\1\s*>', re.I | re.S)
+
+_tag_pattern = re.compile(r'<(/?)(table|strong|b)(?=[\s/>])([^>]*)>', re.I)
+
+_attribute_pattern = re.compile(
+    r'([^\s=/>]+)(?:\s*=\s*("[^"]*"|\'[^\']*\'|[^\s>]+))?')
+
+_markup_pattern = re.compile(r'<[^>]*>')
+
+_meteo_table_attributes = {
+    'cellspacing': '1', 'cellpadding': '0', 'width': '100%', 'align': 'left'}
+
+
+def _get_element_text(html, span):
+    return html_unescape(_markup_pattern.sub('', html[span[0]:span[1]]))
+
+
+def _find_meteo_elements(html):
+    """
+    Finds the meteorology table and the 'strong' and 'b' elements of a page.
+
+    Returns the text of the 'strong' and 'b' elements inside the first
+    meteorology table and the text of every 'b' element of the page, in
+    document order, as BeautifulSoup would give them.
+    """
+
+    html = _ignored_markup_pattern.sub('', html)
+
+    spans = {'table': list(), 'strong': list(), 'b': list()}
+    stacks = {'table': list(), 'strong': list(), 'b': list()}
+    table = None
+
+    for m in _tag_pattern.finditer(html):
+        name = m.group(2).lower()
+
+        if m.group(1):
+            if stacks[name]:
+                index = stacks[name].pop()
+                spans[name][index][1] = m.start()
+                spans[name][index][3] = m.end()
+            continue
+
+        if m.group(3).rstrip().endswith('/'):
+            spans[name].append([m.end(), m.end(), m.start(), m.end()])
+            continue
+
+        if name == 'table' and table is None:
+            attributes = dict()
+            for a in _attribute_pattern.finditer(m.group(3)):
+                value = a.group(2) or ''
+                if value[:1] in ('"', "'"):
+                    value = value[1:-1]
+                attributes[a.group(1).lower()] = html_unescape(value)
+
+            if all(attributes.get(k) == v
+                   for k, v in _meteo_table_attributes.items()):
+                table = len(spans['table'])
+
+        stacks[name].append(len(spans[name]))
+        spans[name].append([m.end(), None, m.start(), None])
+
+    if table is None:
+        raise IndexError('Meteorology table could not be found.')
+
+    for name in stacks:
+        if stacks[name]:
+            raise ValueError("Unclosed '{}' element.".format(name))
+
+    table_start, table_end = spans['table'][table][2], spans['table'][table][3]
+
+    def inside_table(span):
+        return table_start < span[2] and span[3] <= table_end
+
+    table_strongs = [_get_element_text(html, x) for x in spans['strong']
+                     if inside_table(x)]
+    table_bs = [_get_element_text(html, x) for x in spans['b']
+                if inside_table(x)]
+    page_bs = [_get_element_text(html, x) for x in spans['b']]
+
+    return table_strongs, table_bs, page_bs
+
+
+def _parse_rtt150_page(table_strongs, table_bs, page_bs, last_meteo):
+    keywords = list()
+
+    for x in table_strongs:
+        keywords.append(x.strip().replace(':', ''))
+
+    for i, val in enumerate(table_bs):
+        val = val.replace('\n', '').replace('\xa0', '').split(' ')
+
+        if i != 7:
+            last_meteo[keywords[i]] = float(val[0])
+        else:
+            last_meteo[keywords[i]] = float(val[-2])
+
+    return last_meteo
+
+
+def _parse_t100_page(table_strongs, table_bs, page_bs, last_meteo):
+    for x in table_strongs:
+        x = x.split('=')
+
+        keyword = x[0].strip()
+        value = x[-1].strip()
+
+        last_meteo[keyword] = float(value)
+
+    for x in page_bs[12:29][0::2]:
+        x = x.split('=')
+
+        keyword = x[0].strip()
+        value = x[-1].strip()
+
+        last_meteo[keyword] = float(value)
+
+    return last_meteo
+
+
+def _parse_t60_page(table_strongs, table_bs, page_bs, last_meteo):
+    for x in table_strongs:
+        x = x.split('=')
+
+        keyword = x[0].strip()
+        value = x[-1].strip()
+
+        try:
+            last_meteo[keyword] = float(value)
+        except ValueError:
+            continue
+
+    for x in page_bs[15:32][0::2]:
+        x = x.split('=')
+
+        keyword = x[0].strip()
+        value = x[-1].strip()
+
+        last_meteo[keyword] = float(value)
+
+    return last_meteo
+
+
+_meteo_page_parsers = {
+    'RTT150': _parse_rtt150_page,
+    'T100': _parse_t100_page,
+    'T60': _parse_t60_page}
+
+
+def _parse_meteo_page_bs4(html, telescope):
     last_meteo = dict()
 
     last_meteo['timestamp'] = get_current_time_stamp()
 
-    soup = BeautifulSoup(html, 'html.parser')
+    soup = bs4.BeautifulSoup(html, 'html.parser')
     table = soup.findAll('table', {
         'cellspacing': '1', 'cellpadding': '0',
         'width': '100%', 'align': 'left'})[0]
@@ -90,7 +262,52 @@ def parse_meteo_page(html, telescope):
         return last_meteo
 
 
-def generate_meteo_archive_urls(telescope, start_date, end_date, date_format):
+def parse_meteo_page(html, telescope, engine='fast'):
+    """
+    Parses a live meteorology page of a station.
+
+    Parameters
+    ----------
+    html : str
+        Page content.
+
+    telescope : str
+        Telescope name. It must be one of 'RTT150', 'T100' or 'T60'.
+
+    engine : str
+        'fast' extracts the readings with a targeted tokenizer, 'bs4'
+        builds a full BeautifulSoup tree. Both return the same 'dict'.
+        Pages that the 'fast' engine cannot read are handed over to 'bs4'.
+        Default value is 'fast'.
+
+    Returns
+    -------
+    type of 'dict'
+        Readings of the station.
+    """
+
+    if engine == 'bs4':
+        return _parse_meteo_page_bs4(html, telescope)
+
+    if engine != 'fast':
+        raise ValueError("'engine' must be one of 'fast' or 'bs4'.")
+
+    last_meteo = dict()
+
+    last_meteo['timestamp'] = get_current_time_stamp()
+    last_meteo['telescope'] = telescope if telescope in ('RTT150', 'T100')\
+        else 'T60'
+
+    try:
+        elements = _find_meteo_elements(html)
+
+        return _meteo_page_parsers[last_meteo['telescope']](
+            *elements, last_meteo=last_meteo)
+    except (IndexError, KeyError, ValueError):
+        return _parse_meteo_page_bs4(html, telescope)
+
+
+def generate_meteo_archive_dates(start_date, end_date, date_format):
     if (start_date != '') and (end_date == ''):
         try:
             start_date = datetime.strptime(start_date, date_format)
@@ -115,66 +332,308 @@ def generate_meteo_archive_urls(telescope, start_date, end_date, date_format):
     if start_date >= end_date:
         return None
 
-    urls = list()
-
-    if telescope == 'RTT150':
-        url_template = 'http://rtt150meteo.tug.tubitak.gov.tr/ARC-'
-    elif telescope == 'T100':
-        url_template =\
-            'http://t100meteo.tug.tubitak.gov.tr/index.html/Archive/ARC-'
-    else:
-        url_template =\
-            'http://t60meteo.tug.tubitak.gov.tr/index.html/Archive/ARC-'
+    dates = list()
 
     d = start_date
 
     while d < end_date:
-        year, month, day = d.year, d.month, d.day
-        url = url_template + str(year) + '-' + str(month).zfill(2) +\
-            '-' + str(day).zfill(2) + '.txt'
-
-        urls.append(url)
+        dates.append(d.date())
         d = d + timedelta(days=1)
 
+    return dates
+
+
+_meteo_archive_base_urls = {
+    'RTT150': 'http://rtt150meteo.tug.tubitak.gov.tr',
+    'T100': 'http://t100meteo.tug.tubitak.gov.tr/index.html/Archive',
+    'T60': 'http://t60meteo.tug.tubitak.gov.tr/index.html/Archive'}
+
+
+def generate_meteo_archive_url(telescope, date, base_url=None):
+    if base_url is None:
+        base_url = _meteo_archive_base_urls.get(
+            telescope, _meteo_archive_base_urls['T60'])
+
+    year, month, day = date.year, date.month, date.day
+    url = base_url.rstrip('/') + '/ARC-' + str(year) + '-' +\
+        str(month).zfill(2) + '-' + str(day).zfill(2) + '.txt'
+
+    return url
+
+
+def generate_meteo_archive_urls(telescope, start_date, end_date, date_format,
+                                base_url=None):
+    dates = generate_meteo_archive_dates(start_date, end_date, date_format)
+
+    if dates is None:
+        return None
+
+    urls = list()
+
+    for d in dates:
+        urls.append(generate_meteo_archive_url(telescope, d, base_url))
+
     return urls
 
 
-def parse_meteo_archive(raw_archive):
-    t = pd.read_csv(StringIO(raw_archive), sep='\t')
+def parse_meteo_archive(raw_archive, dtype=None):
+    end = raw_archive.find('\n')
+    header = raw_archive[:end if end >= 0 else None].rstrip('\r').split('\t')
+
+    # All archive columns of every telescope are numeric, so the inferred
+    # dtypes are the same as a per-telescope mapping and cheaper to get.
+    if dtype is not None:
+        dtype = dict.fromkeys(header[1:], dtype)
 
-    t.rename(columns={'--Timestamp---': 'Timestamp'}, inplace=True)
-    t['Timestamp'] = pd.to_datetime(t['Timestamp'], format='%Y%m%d %H:%M',
-                                    errors='coerce')
+    t = pd.read_csv(StringIO(raw_archive), sep='\t', skiprows=[1],
+                    dtype=dtype, parse_dates=[0], date_format='%Y%m%d %H:%M')
 
-    t = t.drop(t.index[0])
-    t.index = np.arange(0, len(t))
+    t.columns = ['Timestamp'] + [column.strip() for column in header[1:]]
 
-    mask = t['Timestamp'].notna()
-    t = t[mask]
+    if t['Timestamp'].dtype.kind != 'M':
+        t['Timestamp'] = pd.to_datetime(t['Timestamp'], format='%Y%m%d %H:%M',
+                                        errors='coerce')
 
-    for key in t.columns[1:].values:
-        t[key] = pd.to_numeric(t[key])
+        t = t[t['Timestamp'].notna().to_numpy()]
+
+    for key in t.columns[1:]:
+        if t[key].dtype.kind not in 'iuf':
+            t[key] = pd.to_numeric(t[key])
 
     return t
 
 
-def concat_meteo_archive(tables):
-    t = pd.concat(tables)
-    t.index = np.arange(0, len(t))
+def _get_meteo_archive_header(columns):
+    return [column.strip() for column in columns]
+
+
+def _get_meteo_archive_columns(headers, columns=None):
+    columns = ['Timestamp'] if columns is None else list(columns)
+    known = set(columns)
+
+    for header in headers:
+        for column in header[1:]:
+            if column not in known:
+                known.add(column)
+                columns.append(column)
+
+    return columns
+
+
+def get_meteo_archive_columns(tables, columns=None):
+    return _get_meteo_archive_columns(
+        [_get_meteo_archive_header(table.columns.tolist())
+         for table in tables], columns)
+
+
+def concat_meteo_archive(tables, columns=None):
+    raw_headers = [table.columns.tolist() for table in tables]
+    headers = [_get_meteo_archive_header(raw) for raw in raw_headers]
+    columns = _get_meteo_archive_columns(headers, columns)
+
+    aligned = list()
+    absent = dict()
+
+    for table, raw, header in zip(tables, raw_headers, headers):
+        if header != columns:
+            known = set(header)
+            absent[len(aligned)] = [column not in known
+                                    for column in columns[1:]]
+
+            table = table.set_axis(header, axis=1).reindex(columns=columns)
+        elif raw != columns:
+            table = table.set_axis(header, axis=1)
+
+        aligned.append(table)
+
+    # pandas fills one preallocated block per dtype, table by table, so
+    # integer columns stay integer.
+    t = pd.concat(aligned, ignore_index=True)
+
+    valid = (t.iloc[:, 1:] > -50).to_numpy()
+
+    # Columns that a day does not have are NaN, not invalid.
+    if absent:
+        offsets = np.cumsum([0] + [len(table) for table in aligned])
+
+        for i, row in absent.items():
+            valid[offsets[i]:offsets[i + 1]] |= row
+
+    mask = valid.all(axis=1)
+
+    if mask.all():
+        return t
+
+    return t[mask]
+
+
+_meteo_archive_statistics = ('count', 'sum', 'min', 'max', 'mean', 'median',
+                             'std', 'var', 'first', 'last')
+
+
+def get_meteo_archive_grouper(freq):
+    offset = pd.tseries.frequencies.to_offset(freq)
+
+    if isinstance(offset, pd.tseries.offsets.Tick):
+        return pd.Grouper(key='Timestamp', freq=offset, origin='epoch')
+
+    return pd.Grouper(key='Timestamp', freq=offset)
+
+
+def resample_meteo_archive(t, freq='1D', stats=('min', 'mean', 'max'),
+                           percentiles=None):
+    for stat in stats:
+        if stat not in _meteo_archive_statistics:
+            raise ValueError("Unknown statistic '{}'.".format(stat))
+
+    g = t.groupby(get_meteo_archive_grouper(freq))
+
+    results = list()
+    keys = list()
+
+    for stat in stats:
+        results.append(getattr(g, stat)())
+        keys.append(stat)
+
+    for q in percentiles or ():
+        results.append(g.quantile(q))
+        keys.append('p{:g}'.format(q * 100))
+
+    r = pd.concat(results, axis=1, keys=keys)
+    r = r.swaplevel(axis=1)
+
+    columns = [c for c in t.columns if c != 'Timestamp']
+
+    return r[columns]
+
+
+# np.iinfo(np.int16).min
+_int16_missing = -32768
+
+
+def _get_decimals(values, max_decimals=6):
+    values = values[~np.isnan(values)]
+
+    for decimals in range(max_decimals + 1):
+        if np.array_equal(np.round(values, decimals), values):
+            return decimals
+
+    return None
+
+
+def compact_meteo_archive(t, dtype='float32'):
+    if dtype not in ('float32', 'int16'):
+        raise ValueError("'dtype' must be one of 'float32' or 'int16'.")
+
+    if 'Timestamp' in t.columns:
+        t = t.set_index('Timestamp')
+
+    if not t.index.is_monotonic_increasing:
+        t = t.sort_index(kind='stable')
+
+    columns = dict()
+    decimals = dict()
+    scales = dict()
+
+    for key in t.columns:
+        values = t[key].to_numpy(dtype=np.float64)
+        d = _get_decimals(values)
+
+        compact = None
+
+        if d is not None and dtype == 'int16':
+            scaled = np.round(values * 10 ** d)
+            finite = scaled[~np.isnan(scaled)]
+
+            if finite.size == 0 or (finite.min() > _int16_missing and
+                                    finite.max() <= np.iinfo(np.int16).max):
+                compact = np.where(np.isnan(scaled), _int16_missing,
+                                   scaled).astype(np.int16)
+                scales[key] = d
+
+        if compact is None and d is not None:
+            compact = values.astype(np.float32)
+
+            if not np.array_equal(np.round(compact.astype(np.float64), d),
+                                  values, equal_nan=True):
+                compact = None
+
+        if compact is None:
+            compact = values
+        else:
+            decimals[key] = d
+
+        columns[key] = compact
+
+    r = pd.DataFrame(columns, index=t.index, copy=False)
+    r.attrs['decimals'] = decimals
+    r.attrs['scales'] = scales
+
+    return r
+
+
+def expand_meteo_archive(t):
+    decimals = t.attrs.get('decimals', dict())
+    scales = t.attrs.get('scales', dict())
+
+    columns = dict()
+    columns['Timestamp'] = t.index.to_numpy()
+
+    for key in t.columns:
+        values = t[key].to_numpy()
+
+        if key in scales:
+            missing = values == _int16_missing
+            values = values / 10 ** scales[key]
+            values[missing] = np.nan
+        else:
+            values = values.astype(np.float64)
+
+        if key in decimals:
+            values = np.round(values, decimals[key])
+
+        columns[key] = values
+
+    return pd.DataFrame(columns, copy=False)
+
+
+def get_meteo_archive_memory_usage(t):
+    usage = t.memory_usage(index=True, deep=True)
+    usage['Total'] = usage.sum()
+
+    return usage
+
+
+def align_meteo_archives(archives, freq='5min', tolerance='150s'):
+    archives = {k: t for k, t in archives.items() if t is not None and
+                not t.empty}
+
+    if not archives:
+        return None
+
+    start = min(t['Timestamp'].min() for t in archives.values())
+    end = max(t['Timestamp'].max() for t in archives.values())
+
+    grid = pd.date_range(start.floor(freq), end.ceil(freq), freq=freq)
+
+    r = pd.DataFrame({'Timestamp': grid})
+    r['Timestamp'] = r['Timestamp'].astype(
+        next(iter(archives.values()))['Timestamp'].dtype)
 
-    header = list()
-    for column in t.columns:
-        header.append(column.strip())
+    tolerance = pd.Timedelta(tolerance)
 
-    t.columns = header
+    for key, t in archives.items():
+        if not t['Timestamp'].is_monotonic_increasing:
+            t = t.sort_values('Timestamp', kind='stable')
 
-    masks = list()
-    for column in t.columns[1:]:
-        masks.append(t[column] > -50)
+        t = t.rename(columns={c: key + '_' + c for c in t.columns[1:]})
+        t['Timestamp'] = t['Timestamp'].astype(r['Timestamp'].dtype)
 
-    m = masks[0]
+        r = pd.merge_asof(r, t, on='Timestamp', direction='nearest',
+                          tolerance=tolerance)
 
-    for mask in masks[1:]:
-        m = m & mask
+    data = r.columns[1:]
+    r = r[r[data].notna().any(axis=1).to_numpy()]
+    r.index = np.arange(0, len(r))
 
-    return t[m]
+    return r
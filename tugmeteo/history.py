@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+
+__all__ = ['MeteoHistory']
+
+import time
+import threading
+
+import numpy as np
+
+
+class MeteoHistory(object):
+
+    def __init__(self, capacity, keywords):
+        """
+        MeteoHistory
+
+        Fixed capacity history of the live readings of a station.
+
+        Readings are kept in a numpy array with one column per keyword.
+        The array is stored twice back to back, so the latest readings
+        are always a contiguous slice of it and every window is returned
+        as a view without copying. Appends write both copies of the array,
+        so a view of n readings stays valid for only 'capacity' - n
+        further appends; copy it to keep it longer.
+
+        Parameters
+        ----------
+        capacity : int
+            Maximum number of readings kept. Older readings are dropped.
+
+        keywords : list
+            Reading keywords, e.g. the keys returned by 'get_last_meteo'.
+
+        Examples
+        --------
+        >>> from tugmeteo import TugMeteo
+        >>>
+        >>> met = TugMeteo(history=720)
+        >>> met.start_polling(interval=5)
+        >>>
+        >>> h = met.get_meteo_history('T100')
+        >>> gust = h.max('WINDSPEED', seconds=600)
+        >>> trend = h.slope('PRESSURE', seconds=3600)
+        """
+
+        super(MeteoHistory, self).__init__()
+
+        if not isinstance(capacity, int) or capacity < 1:
+            raise ValueError("'capacity' should be a positive 'int' object.")
+
+        self._capacity = capacity
+        self._keywords = list(keywords)
+        self._columns = {k: i for i, k in enumerate(self._keywords)}
+
+        self._times = np.full(2 * capacity, np.nan)
+        self._values = np.full((2 * capacity, len(self._keywords)), np.nan)
+
+        self._count = 0
+
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def keywords(self):
+        return list(self._keywords)
+
+    def __len__(self):
+        return min(self._count, self._capacity)
+
+    def append(self, meteo, t=None):
+        """
+        Appends a reading.
+
+        Parameters
+        ----------
+        meteo : dict
+            Reading keyed by keyword. Missing and non-numeric values are
+            stored as NaN.
+
+        t : float
+            Time of the reading in seconds since the epoch.
+            If None, the current time is used.
+        """
+
+        if t is None:
+            t = time.time()
+
+        row = [meteo.get(k) for k in self._keywords]
+        row = [v if isinstance(v, (int, float)) else np.nan for v in row]
+
+        with self._lock:
+            i = self._count % self._capacity
+
+            self._times[i] = t
+            self._times[i + self._capacity] = t
+            self._values[i] = row
+            self._values[i + self._capacity] = row
+
+            self._count += 1
+
+    def _get_slice(self, seconds, count):
+        """
+        Internal using only.
+        """
+
+        with self._lock:
+            size = min(self._count, self._capacity)
+            end = self._count % self._capacity + self._capacity
+
+        if count is not None:
+            size = min(size, count)
+
+        start = end - size
+
+        if seconds is not None and size:
+            since = self._times[end - 1] - seconds
+            start += int(np.searchsorted(self._times[start:end], since))
+
+        return slice(start, end)
+
+    def window(self, seconds=None, count=None):
+        """
+        Returns the latest readings.
+
+        Parameters
+        ----------
+        seconds : int or float
+            Only readings not older than 'seconds' before the latest
+            reading are returned.
+
+        count : int
+            Maximum number of readings returned.
+
+        Returns
+        -------
+        tuple of 'numpy.ndarray'
+            Times (n,) and values (n, len(keywords)), oldest first.
+            Both are views of the history, valid for 'capacity' - n
+            further appends.
+        """
+
+        s = self._get_slice(seconds, count)
+
+        return self._times[s], self._values[s]
+
+    def get(self, keyword, seconds=None, count=None):
+        """
+        Returns the latest readings of a keyword.
+
+        Returns
+        -------
+        tuple of 'numpy.ndarray'
+            Times and values, oldest first. Both are views of the history,
+            valid for 'capacity' - n further appends.
+        """
+
+        s = self._get_slice(seconds, count)
+
+        return self._times[s], self._values[s, self._columns[keyword]]
+
+    def mean(self, keyword, seconds=None, count=None):
+        """
+        Returns mean of a keyword over the latest readings.
+        """
+
+        _, v = self.get(keyword, seconds, count)
+
+        if np.isnan(v).all():
+            return None
+
+        return float(np.nanmean(v))
+
+    def min(self, keyword, seconds=None, count=None):
+        """
+        Returns minimum of a keyword over the latest readings.
+        """
+
+        _, v = self.get(keyword, seconds, count)
+
+        if np.isnan(v).all():
+            return None
+
+        return float(np.nanmin(v))
+
+    def max(self, keyword, seconds=None, count=None):
+        """
+        Returns maximum of a keyword over the latest readings, e.g. the
+        gust of the wind speed.
+        """
+
+        _, v = self.get(keyword, seconds, count)
+
+        if np.isnan(v).all():
+            return None
+
+        return float(np.nanmax(v))
+
+    def slope(self, keyword, seconds=None, count=None):
+        """
+        Returns least-squares slope of a keyword over the latest readings
+        in units per second.
+        """
+
+        t, v = self.get(keyword, seconds, count)
+
+        valid = ~np.isnan(v)
+
+        if np.count_nonzero(valid) < 2:
+            return None
+
+        t = t[valid] - t[valid].mean()
+        v = v[valid] - v[valid].mean()
+
+        denominator = np.dot(t, t)
+
+        if denominator == 0:
+            return None
+
+        return float(np.dot(t, v) / denominator)
+
+    def clear(self):
+        """
+        Removes all readings.
+        """
+
+        with self._lock:
+            self._times[:] = np.nan
+            self._values[:] = np.nan
+            self._count = 0
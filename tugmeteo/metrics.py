@@ -0,0 +1,247 @@
+#!/usr/bin/env python
+
+__all__ = ['MetricsRegistry']
+
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+
+
+_default_buckets = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+                    0.5, 1.0, 2.5, 5.0, 10.0)
+
+_descriptions = {
+    'tugmeteo_http_requests_total':
+        'HTTP requests by host and status.',
+    'tugmeteo_http_response_bytes_total':
+        'Bytes of HTTP response bodies by host.',
+    'tugmeteo_http_request_seconds':
+        'Time of HTTP requests including the body download.',
+    'tugmeteo_http_response_seconds':
+        'Time until HTTP response headers (connect and wait).',
+    'tugmeteo_decode_seconds':
+        'Time of decoding response bodies to text.',
+    'tugmeteo_parse_seconds':
+        'Time of parse and concat stages.',
+    'tugmeteo_rows_total':
+        'Archive rows produced by telescope.',
+    'tugmeteo_pages_total':
+        'Station pages by telescope and result (parsed or unchanged).',
+    'tugmeteo_cache_requests_total':
+        'Archive cache lookups by result (hit or miss).',
+    'tugmeteo_poll_errors_total':
+        'Errors of background polling by telescope and kind.',
+    'tugmeteo_store_days_total':
+        'Days of archive store queries by result (hit or miss).'}
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+
+    return '{' + ','.join(
+        '{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"'))
+        for k, v in labels) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry(object):
+
+    def __init__(self, buckets=_default_buckets):
+        """
+        MetricsRegistry
+
+        Thread-safe registry of counters and histograms with labels.
+
+        'TugMeteo' records the latency, status and size of every HTTP
+        request, the time of decoding, parsing and concatenating, the
+        number of rows produced and the archive cache hits. Metrics can
+        be exported in the Prometheus text format, and hooks receive
+        every recorded value as it happens.
+
+        Parameters
+        ----------
+        buckets : tuple
+            Upper bounds of the histogram buckets in seconds.
+
+        Examples
+        --------
+        >>> from tugmeteo import TugMeteo, MetricsRegistry
+        >>>
+        >>> metrics = MetricsRegistry()
+        >>> met = TugMeteo(metrics=metrics)
+        >>> t = met.get_meteo_archives('T100', '2019-01-01', '2019-02-01')
+        >>>
+        >>> print(metrics.to_prometheus())
+        >>>
+        >>> # Slow requests as they happen.
+        >>> def hook(name, value, labels):
+        ...     if name == 'tugmeteo_http_request_seconds' and value > 1:
+        ...         print(labels['url'], value)
+        >>>
+        >>> metrics.add_hook(hook)
+        """
+
+        super(MetricsRegistry, self).__init__()
+
+        self._buckets = tuple(sorted(buckets))
+
+        self._lock = threading.Lock()
+        self._counters = dict()
+        self._histograms = dict()
+        self._hooks = list()
+
+    def add_hook(self, hook):
+        """
+        Adds a hook called as hook(name, value, labels) for every
+        recorded value.
+
+        'labels' may contain extra keys that are not exported, e.g.
+        'url' for the HTTP metrics.
+        """
+
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook):
+        """
+        Removes a hook added by 'add_hook'.
+        """
+
+        self._hooks.remove(hook)
+
+    def _call_hooks(self, name, value, labels, extra):
+        """
+        Internal using only.
+        """
+
+        if self._hooks:
+            labels = dict(labels, **extra)
+
+            for hook in list(self._hooks):
+                hook(name, value, labels)
+
+    def inc(self, name, value=1, extra=None, **labels):
+        """
+        Increases a counter.
+        """
+
+        key = (name, tuple(sorted(labels.items())))
+
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+        self._call_hooks(name, value, labels, extra or {})
+
+    def observe(self, name, value, extra=None, **labels):
+        """
+        Records a value in a histogram.
+        """
+
+        key = (name, tuple(sorted(labels.items())))
+
+        with self._lock:
+            histogram = self._histograms.get(key)
+
+            if histogram is None:
+                histogram = [[0] * (len(self._buckets) + 1), 0.0, 0]
+                self._histograms[key] = histogram
+
+            histogram[0][bisect.bisect_left(self._buckets, value)] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+        self._call_hooks(name, value, labels, extra or {})
+
+    @contextmanager
+    def time(self, name, **labels):
+        """
+        Records the time of a 'with' block in a histogram.
+        """
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def get(self, name, **labels):
+        """
+        Returns value of a counter, or (count, sum) of a histogram.
+        """
+
+        key = (name, tuple(sorted(labels.items())))
+
+        with self._lock:
+            if key in self._histograms:
+                histogram = self._histograms[key]
+                return histogram[2], histogram[1]
+
+            return self._counters.get(key, 0)
+
+    def clear(self):
+        """
+        Removes all recorded values.
+        """
+
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def to_prometheus(self):
+        """
+        Returns all metrics in the Prometheus text exposition format.
+
+        Returns
+        -------
+        type of 'str'
+        """
+
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(
+                (key, ([list(h[0]), h[1], h[2]]))
+                for key, h in self._histograms.items())
+
+        lines = list()
+        seen = set()
+
+        for (name, labels), value in counters:
+            if name not in seen:
+                seen.add(name)
+                if name in _descriptions:
+                    lines.append('# HELP {} {}'.format(
+                        name, _descriptions[name]))
+                lines.append('# TYPE {} counter'.format(name))
+
+            lines.append('{}{} {}'.format(
+                name, _format_labels(labels), _format_value(value)))
+
+        for (name, labels), (counts, total, count) in histograms:
+            if name not in seen:
+                seen.add(name)
+                if name in _descriptions:
+                    lines.append('# HELP {} {}'.format(
+                        name, _descriptions[name]))
+                lines.append('# TYPE {} histogram'.format(name))
+
+            cumulative = 0
+            for bound, n in zip(self._buckets + (float('inf'),), counts):
+                cumulative += n
+                lines.append('{}_bucket{} {}'.format(
+                    name,
+                    _format_labels(labels + (('le', _format_value(bound)),)),
+                    cumulative))
+
+            lines.append('{}_sum{} {}'.format(
+                name, _format_labels(labels), _format_value(total)))
+            lines.append('{}_count{} {}'.format(
+                name, _format_labels(labels), count))
+
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,488 @@
+#!/usr/bin/env python
+
+__all__ = ['MeteoServer']
+
+import json
+import time
+import hashlib
+import argparse
+import threading
+from datetime import datetime, timedelta
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+import requests
+
+from .core import TugMeteo, _sensors
+
+
+class _UpstreamError(Exception):
+    """
+    Internal using only.
+
+    Raised if the stations could not be reached. It is answered with 502
+    and, like any error, is not cached.
+    """
+
+
+class _CoalescingCache(object):
+
+    def __init__(self, max_entries=256):
+        """
+        Internal using only.
+
+        Caches responses until they expire. Concurrent requests for the
+        same key wait for a single computation instead of starting their
+        own. Expired responses are dropped when a response is added, and
+        at most 'max_entries' responses are kept (least recently used
+        first out).
+        """
+
+        super(_CoalescingCache, self).__init__()
+
+        self._max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._responses = OrderedDict()
+        self._pending = dict()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._responses)
+
+    def _add(self, key, expires, response):
+        """
+        Internal using only.
+        """
+
+        now = time.monotonic()
+
+        for k in [k for k, v in self._responses.items() if v[0] <= now]:
+            del self._responses[k]
+
+        self._responses[key] = (expires, response)
+        self._responses.move_to_end(key)
+
+        while len(self._responses) > self._max_entries:
+            self._responses.popitem(last=False)
+
+    def get(self, key, func):
+        """
+        Returns cached response of 'key' or computes it with 'func'.
+
+        'func' must return a tuple of (response, max_age).
+        """
+
+        with self._lock:
+            cached = self._responses.get(key)
+
+            if cached is not None and cached[0] > time.monotonic():
+                self._responses.move_to_end(key)
+                return cached[1], cached[0] - time.monotonic()
+
+            future = self._pending.get(key)
+            owner = future is None
+
+            if owner:
+                future = Future()
+                self._pending[key] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            response, max_age = func()
+        except BaseException as e:
+            with self._lock:
+                del self._pending[key]
+
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            if max_age > 0:
+                self._add(key, time.monotonic() + max_age, response)
+
+            del self._pending[key]
+
+        future.set_result((response, max_age))
+
+        return response, max_age
+
+
+class _MeteoRequestHandler(BaseHTTPRequestHandler):
+
+    server_version = 'tugmeteo'
+
+    def log_message(self, format, *args):
+        if self.server.gateway.verbose:
+            super(_MeteoRequestHandler, self).log_message(format, *args)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        parts = [p for p in url.path.split('/') if p]
+
+        if parts == ['metrics']:
+            body = self.server.gateway.get_metrics().encode()
+            self._send(200, body, 0, 'text/plain; version=0.0.4')
+            return
+
+        try:
+            body, max_age = self.server.gateway.get_response(parts, query)
+        except (_UpstreamError, requests.exceptions.RequestException) as e:
+            self._send_error(502, 'upstream error: {}'.format(e))
+            return
+        except (ValueError, KeyError) as e:
+            self._send_error(400, str(e))
+            return
+        except Exception as e:
+            self.log_error('%s: %s', type(e).__name__, e)
+            self._send_error(500, 'internal error')
+            return
+
+        if body is None:
+            self._send_error(404, 'not found')
+            return
+
+        self._send(200, body, max_age)
+
+    def _send_error(self, status, message):
+        self._send(status, json.dumps({'error': message}).encode(), 0)
+
+    def _send(self, status, body, max_age, content_type='application/json'):
+        etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+        if status == 200 and self.headers.get('If-None-Match') == etag:
+            status = 304
+            body = b''
+
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+
+        if status in (200, 304):
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control',
+                             'public, max-age={}'.format(int(max_age)))
+        else:
+            self.send_header('Cache-Control', 'no-store')
+
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MeteoServer(object):
+
+    def __init__(self, host='127.0.0.1', port=8080, interval=60,
+                 archive_cache=None, archive_ttl=300, meteo=None,
+                 verbose=False, base_urls=None):
+        """
+        MeteoServer
+
+        Caching HTTP/JSON gateway in front of the meteorological
+        stations.
+
+        Every station is polled once per 'interval' seconds regardless
+        of the number of clients. Archive ranges are cached, and
+        concurrent requests for the same resource are answered by a
+        single upstream download. Responses carry 'ETag' and
+        'Cache-Control' headers. Errors are answered with a JSON
+        '{"error": ...}' body and are never cached.
+
+        Endpoints
+        ---------
+        /meteo
+        /meteo/<telescope>
+            Latest readings, as returned by 'get_last_meteo'.
+
+        /sensors/<sensor>?telescope=all
+            Latest data of a sensor, as returned by 'get_sensor_data'.
+
+        /archive/<telescope>?start=YYYY-MM-DD&end=YYYY-MM-DD
+            Meteorology archive in the 'split' orientation of
+            'pandas.DataFrame.to_json'. Answered 404 if the range has no
+            archive files, and 502 if they could not be downloaded.
+
+        /metrics
+            Upstream request, parse and cache metrics of the client in
+            the Prometheus text format.
+
+        Parameters
+        ----------
+        host : str
+            Address to listen on.
+            Default value is '127.0.0.1'.
+
+        port : int
+            Port to listen on.
+            Default value is 8080.
+
+        interval : int or float
+            Seconds between polls of every station.
+            Default value is 60.
+
+        archive_cache : str or 'ArchiveCache'
+            On-disk cache of the daily archive files.
+
+        archive_ttl : int or float
+            Lifetime of the cached archive ranges whose files may still
+            change (today's file, or one that just ended) or appear later
+            (a missing file), in seconds. Other ranges are kept for a
+            day. Ranges with failed downloads are not cached.
+            Default value is 300.
+
+        meteo : 'TugMeteo'
+            Client used for the upstream requests. If None, a new one is
+            created.
+
+        verbose : bool
+            If True, requests are logged to stderr.
+
+        base_urls : str or dict
+            Base URLs of the stations. See 'TugMeteo'.
+
+        Examples
+        --------
+        >>> from tugmeteo.server import MeteoServer
+        >>>
+        >>> server = MeteoServer(port=8080, archive_cache='~/.cache/tugmeteo')
+        >>> server.serve_forever()
+
+        $ curl http://127.0.0.1:8080/sensors/temperature?telescope=T100
+        """
+
+        super(MeteoServer, self).__init__()
+
+        if meteo is None:
+            meteo = TugMeteo(archive_cache=archive_cache,
+                             base_urls=base_urls)
+
+        if not isinstance(meteo, TugMeteo):
+            raise TypeError("'meteo' should be a 'TugMeteo' object.")
+
+        if not isinstance(interval, (int, float)) or interval <= 0:
+            raise ValueError("'interval' should be a positive number.")
+
+        if not isinstance(archive_ttl, (int, float)) or archive_ttl < 0:
+            raise ValueError("'archive_ttl' should be a non-negative number.")
+
+        self._meteo = meteo
+        self._interval = interval
+        self._archive_ttl = archive_ttl
+        self.verbose = verbose
+
+        self._cache = _CoalescingCache()
+
+        self._httpd = ThreadingHTTPServer((host, port), _MeteoRequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.gateway = self
+
+    @property
+    def address(self):
+        return self._httpd.server_address
+
+    def _get_max_age(self, telescope):
+        """
+        Internal using only.
+        """
+
+        age = self._meteo.get_meteo_age(telescope)
+
+        if isinstance(age, dict):
+            ages = [a for a in age.values() if a is not None]
+            age = max(ages) if ages else None
+
+        if age is None:
+            return 0
+
+        return max(0, self._interval - age)
+
+    def _get_meteo(self, telescope):
+        """
+        Internal using only.
+        """
+
+        telescope = self._meteo._get_telescopes_arg(telescope)
+        telescope = 'all' if len(telescope) > 1 else telescope[0]
+
+        meteo = self._meteo.get_last_meteo(telescope)
+
+        return json.dumps(meteo).encode(), self._get_max_age(telescope)
+
+    def _get_sensor(self, sensor, telescope):
+        """
+        Internal using only.
+        """
+
+        if sensor not in _sensors:
+            return None, 0
+
+        telescope = self._meteo._get_telescopes_arg(telescope)
+        telescope = 'all' if len(telescope) > 1 else telescope[0]
+
+        data = self._meteo.get_sensor_data(sensor, telescope)
+
+        return json.dumps(data).encode(), self._get_max_age(telescope)
+
+    def _get_archive(self, telescope, start_date, end_date):
+        """
+        Internal using only.
+        """
+
+        meteo = self._meteo
+
+        telescope, dates = meteo._get_meteo_archive_dates(
+            telescope, start_date, end_date, '%Y-%m-%d', None)
+
+        if dates is None:
+            return None, 0
+
+        # Days answered 404 are missing, other failures are errors.
+        not_found = set()
+
+        raw_archives = meteo._get_meteo_archive_list(telescope, dates,
+                                                     not_found=not_found)
+
+        failed = any(raw_archive is None and d not in not_found
+                     for d, raw_archive in zip(dates, raw_archives))
+
+        t = meteo._build_meteo_archive(telescope, raw_archives)
+
+        if t is None:
+            if failed:
+                raise _UpstreamError(
+                    "archive of '{}' could not be downloaded.".format(
+                        telescope))
+
+            return None, 0
+
+        # Files are final an hour after their day is over (the last row
+        # is stamped midnight), like in 'ArchiveCache'.
+        final = datetime.now() >= datetime.combine(
+            max(dates), datetime.min.time()) + timedelta(days=1, hours=1)
+
+        if failed:
+            # Part of the range is missing, so it is not cached.
+            max_age = 0
+        elif final and not not_found:
+            max_age = 86400
+        else:
+            max_age = self._archive_ttl
+
+        body = t.to_json(orient='split', index=False, date_format='iso')
+
+        return body.encode(), max_age
+
+    def get_metrics(self):
+        """
+        Returns metrics of the upstream client in the Prometheus text
+        format.
+        """
+
+        return self._meteo.metrics.to_prometheus()
+
+    def get_response(self, parts, query):
+        """
+        Returns JSON body and its lifetime in seconds for a request path.
+
+        Parameters
+        ----------
+        parts : list
+            Segments of the request path.
+
+        query : dict
+            Query parameters.
+
+        Returns
+        -------
+        tuple
+            Body as 'bytes' (None if not found) and max-age in seconds.
+        """
+
+        if not parts:
+            return None, 0
+
+        if parts[0] == 'meteo' and len(parts) <= 2:
+            telescope = parts[1] if len(parts) == 2 else 'all'
+
+            # Readings come from the pollers, so there is nothing to
+            # coalesce.
+            return self._get_meteo(telescope)
+
+        if parts[0] == 'sensors' and len(parts) == 2:
+            return self._get_sensor(parts[1], query.get('telescope', 'all'))
+
+        if parts[0] == 'archive' and len(parts) == 2:
+            telescope = parts[1].upper()
+            start_date = query.get('start', '')
+            end_date = query.get('end', '')
+
+            for date in (start_date, end_date):
+                if date:
+                    datetime.strptime(date, '%Y-%m-%d')
+
+            key = ('archive', telescope, start_date, end_date)
+
+            return self._cache.get(
+                key, lambda: self._get_archive(telescope, start_date,
+                                               end_date))
+
+        return None, 0
+
+    def serve_forever(self):
+        """
+        Starts polling the stations and serves requests until
+        'shutdown' is called.
+        """
+
+        self._meteo.start_polling(interval=self._interval)
+
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._meteo.stop_polling(timeout=1)
+
+    def shutdown(self):
+        """
+        Stops serving requests and closes the server and its client.
+        """
+
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+        self._meteo.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m tugmeteo.server',
+        description='Caching HTTP/JSON gateway for TUG meteorology data.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--interval', type=float, default=60,
+                        help='seconds between polls of every station')
+    parser.add_argument('--archive-cache', default=None,
+                        help='directory of the archive file cache')
+    parser.add_argument('--base-url', default=None,
+                        help='base URL of a stand-in server')
+    parser.add_argument('--verbose', action='store_true')
+
+    args = parser.parse_args(argv)
+
+    server = MeteoServer(args.host, args.port, args.interval,
+                         args.archive_cache, verbose=args.verbose,
+                         base_urls=args.base_url)
+
+    print('Serving on http://{}:{}'.format(*server.address))
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
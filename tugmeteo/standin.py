@@ -0,0 +1,438 @@
+#!/usr/bin/env python
+
+__all__ = ['StandInServer']
+
+import re
+import time
+import zlib
+import random
+import hashlib
+import argparse
+import threading
+from functools import lru_cache
+from datetime import date, datetime
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .synthetic import generate_meteo_page, generate_meteo_archive
+
+
+_archive_path_pattern = re.compile(
+    r'^/(RTT150|T100|T60)/ARC-(\d{4})-(\d\d)-(\d\d)\.txt$', re.I)
+
+_page_path_pattern = re.compile(r'^/(RTT150|T100|T60)(?:/(?:index\.html)?)?$',
+                                re.I)
+
+
+@lru_cache(maxsize=4096)
+def _get_archive(telescope, day):
+    return generate_meteo_archive(telescope, day).encode()
+
+
+class _StandInRequestHandler(BaseHTTPRequestHandler):
+
+    server_version = 'tugmeteo-standin'
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        if self.server.standin.verbose:
+            super(_StandInRequestHandler, self).log_message(format, *args)
+
+    def do_GET(self):
+        standin = self.server.standin
+        path = self.path.split('?')[0]
+
+        standin._wait_latency()
+
+        if standin._fail():
+            self._send(500, b'Internal Server Error')
+            return
+
+        match = _archive_path_pattern.match(path)
+        if match is not None:
+            telescope = match.group(1).upper()
+            try:
+                day = date(*map(int, match.groups()[1:]))
+            except ValueError:
+                self._send(404, b'Not Found')
+                return
+
+            body = standin._get_archive(telescope, day)
+
+            if body is None:
+                self._send(404, b'Not Found')
+            else:
+                self._send_body(body)
+            return
+
+        match = _page_path_pattern.match(path)
+        if match is not None:
+            body, modified = standin._get_page(match.group(1).upper())
+            self._send_body(body, modified, 'text/html; charset=iso-8859-9')
+            return
+
+        self._send(404, b'Not Found')
+
+    def _send_body(self, body, modified=None, content_type='text/plain'):
+        etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        headers = {'ETag': etag}
+
+        if self.server.standin.ranges:
+            headers['Accept-Ranges'] = 'bytes'
+
+        if modified is not None:
+            headers['Last-Modified'] = formatdate(modified, usegmt=True)
+
+        if self.headers.get('If-None-Match') == etag or (
+                modified is not None and
+                self.headers.get('If-Modified-Since') ==
+                headers['Last-Modified']):
+            self._send(304, b'', headers)
+            return
+
+        match = re.match(r'^bytes=(\d+)-$', self.headers.get('Range', ''))
+        if match is not None and self.server.standin.ranges:
+            start = int(match.group(1))
+
+            if start >= len(body):
+                headers['Content-Range'] = 'bytes */{}'.format(len(body))
+                self._send(416, b'', headers)
+                return
+
+            headers['Content-Range'] = 'bytes {}-{}/{}'.format(
+                start, len(body) - 1, len(body))
+            self._send(206, body[start:], headers, content_type)
+            return
+
+        self._send(200, body, headers, content_type)
+
+    def _send(self, status, body, headers=None, content_type='text/plain'):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+
+        if headers is not None:
+            for key, value in headers.items():
+                self.send_header(key, value)
+
+        self.end_headers()
+
+        self.server.standin._count(status, len(body))
+        self.server.standin._write(self.wfile, body)
+
+
+class StandInServer(object):
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0,
+                 bandwidth=None, error_rate=0.0, missing_days=None,
+                 missing_rate=0.0, page_period=60, seed=0, verbose=False,
+                 ranges=True):
+        """
+        StandInServer
+
+        Local stand-in of the observatory hosts for offline and
+        reproducible end-to-end tests.
+
+        Station pages and daily archive files are generated by
+        'tugmeteo.synthetic'. Pages are served at '/<telescope>/' and
+        change every 'page_period' seconds. Archive files are served at
+        '/<telescope>/ARC-YYYY-MM-DD.txt'; today's file only contains
+        the rows up to now. Responses support 'ETag', 'Last-Modified'
+        and open ended 'Range' requests.
+
+        Parameters
+        ----------
+        host : str
+            Address to listen on.
+            Default value is '127.0.0.1'.
+
+        port : int
+            Port to listen on. 0 picks a free port.
+            Default value is 0.
+
+        latency : float or tuple
+            Delay before every response in seconds, or a (min, max)
+            range of uniformly distributed delays.
+            Default value is 0.0.
+
+        bandwidth : int
+            Transfer rate of every response in bytes per second.
+            If None, it is not limited.
+
+        error_rate : float
+            Fraction of requests answered with 500.
+            Default value is 0.0.
+
+        missing_days : list
+            Dates ('datetime.date' or 'YYYY-MM-DD') whose archive files
+            are answered with 404.
+
+        missing_rate : float
+            Fraction of the days whose archive files are answered with
+            404. The same days are missing for the same 'seed'.
+            Default value is 0.0.
+
+        page_period : int or float
+            Seconds between changes of the station pages.
+            Default value is 60.
+
+        seed : int
+            Seed of the errors and the missing days.
+            Default value is 0.
+
+        verbose : bool
+            If True, requests are logged to stderr.
+
+        ranges : bool
+            If False, 'Range' headers are ignored and whole files are
+            answered with 200, like hosts without range support.
+            Default value is True.
+
+        Examples
+        --------
+        >>> from tugmeteo import TugMeteo
+        >>> from tugmeteo.standin import StandInServer
+        >>>
+        >>> with StandInServer(latency=(0.05, 0.2), error_rate=0.01) as s:
+        ...     met = TugMeteo(base_urls=s.url)
+        ...     t = met.get_meteo_archives('T100', '2019-01-01', '2019-02-01')
+        ...     print(s.stats)
+        """
+
+        super(StandInServer, self).__init__()
+
+        if isinstance(latency, (int, float)):
+            latency = (latency, latency)
+
+        if not 0 <= error_rate <= 1:
+            raise ValueError("'error_rate' should be in [0, 1].")
+
+        if not 0 <= missing_rate <= 1:
+            raise ValueError("'missing_rate' should be in [0, 1].")
+
+        self._latency = tuple(latency)
+        self._bandwidth = bandwidth
+        self._error_rate = error_rate
+        self._missing_days = set(
+            d if isinstance(d, date) else
+            datetime.strptime(d, '%Y-%m-%d').date()
+            for d in (missing_days or ()))
+        self._missing_rate = missing_rate
+        self._page_period = page_period
+        self._seed = seed
+        self.verbose = verbose
+        self.ranges = ranges
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = dict()
+        self.reset_stats()
+
+        self._thread = None
+
+        self._httpd = ThreadingHTTPServer((host, port),
+                                          _StandInRequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.standin = self
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+
+        return 'http://{}:{}'.format(host, port)
+
+    @property
+    def stats(self):
+        """
+        Number of requests, responses per status and bytes sent.
+        """
+
+        with self._lock:
+            stats = dict(self._stats)
+            stats['status'] = dict(self._stats['status'])
+
+        return stats
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats = {'requests': 0, 'bytes': 0, 'status': dict()}
+
+    def _count(self, status, size):
+        """
+        Internal using only.
+        """
+
+        with self._lock:
+            self._stats['requests'] += 1
+            self._stats['bytes'] += size
+            self._stats['status'][status] = \
+                self._stats['status'].get(status, 0) + 1
+
+    def _wait_latency(self):
+        """
+        Internal using only.
+        """
+
+        low, high = self._latency
+
+        if high > 0:
+            with self._lock:
+                delay = self._random.uniform(low, high)
+
+            time.sleep(delay)
+
+    def _fail(self):
+        """
+        Internal using only.
+        """
+
+        if not self._error_rate:
+            return False
+
+        with self._lock:
+            return self._random.random() < self._error_rate
+
+    def _write(self, wfile, body):
+        """
+        Internal using only.
+        """
+
+        try:
+            if not self._bandwidth:
+                wfile.write(body)
+                return
+
+            chunk = max(1024, int(self._bandwidth / 20))
+
+            for i in range(0, len(body), chunk):
+                part = body[i:i + chunk]
+                wfile.write(part)
+                time.sleep(len(part) / self._bandwidth)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up, e.g. after its timeout.
+            pass
+
+    def _is_missing(self, telescope, day):
+        """
+        Internal using only.
+        """
+
+        if day in self._missing_days:
+            return True
+
+        if self._missing_rate:
+            key = '{}:{}:{}'.format(self._seed, telescope, day.isoformat())
+            return zlib.crc32(key.encode()) / 2 ** 32 < self._missing_rate
+
+        return False
+
+    def _get_archive(self, telescope, day):
+        """
+        Internal using only.
+        """
+
+        today = date.today()
+
+        if day > today or self._is_missing(telescope, day):
+            return None
+
+        body = _get_archive(telescope, day)
+
+        if day == today:
+            now = datetime.now()
+            rows = (now.hour * 60 + now.minute) // 5
+            body = b''.join(body.splitlines(True)[:2 + rows])
+
+        return body
+
+    def _get_page(self, telescope):
+        """
+        Internal using only.
+        """
+
+        period = int(time.time() // self._page_period)
+        seed = zlib.crc32('{}:{}'.format(telescope, period).encode())
+
+        body = generate_meteo_page(telescope, seed=seed)
+
+        return body.encode('latin-1'), period * self._page_period
+
+    def start(self):
+        """
+        Starts serving in a background thread.
+        """
+
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._httpd.serve_forever, name='tugmeteo-standin',
+                daemon=True)
+            self._thread.start()
+
+        return self
+
+    def serve_forever(self):
+        """
+        Serves requests until 'stop' is called.
+        """
+
+        self._httpd.serve_forever()
+
+    def stop(self):
+        """
+        Stops serving requests and closes the server.
+        """
+
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m tugmeteo.standin',
+        description='Local stand-in of the TUG meteorology hosts.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency', type=float, nargs='+', default=[0.0],
+                        help='delay in seconds, or a min and max delay')
+    parser.add_argument('--bandwidth', type=int, default=None,
+                        help='bytes per second of every response')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--missing-rate', type=float, default=0.0)
+    parser.add_argument('--missing-days', nargs='*', default=None,
+                        help='YYYY-MM-DD dates answered with 404')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-ranges', action='store_true',
+                        help='ignore Range headers')
+    parser.add_argument('--verbose', action='store_true')
+
+    args = parser.parse_args(argv)
+
+    latency = args.latency[0] if len(args.latency) == 1 else \
+        tuple(args.latency[:2])
+
+    server = StandInServer(args.host, args.port, latency, args.bandwidth,
+                           args.error_rate, args.missing_days,
+                           args.missing_rate, seed=args.seed,
+                           verbose=args.verbose, ranges=not args.no_ranges)
+
+    print('Serving on {} (use TugMeteo(base_urls=...))'.format(server.url))
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
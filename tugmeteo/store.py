@@ -0,0 +1,465 @@
+#!/usr/bin/env python
+
+__all__ = ['ArchiveStore']
+
+import os
+import time
+import tempfile
+import threading
+from datetime import date, datetime, timedelta
+
+from .helper import pd
+
+# pyarrow is an optional dependency of the store only (see
+# 'requirements-store.txt') and is imported when a store is created.
+
+
+_days_key = b'tugmeteo.days'
+
+_not_found_key = b'tugmeteo.not_found'
+
+# A file that is still missing this long after its day is not uploaded late.
+_not_found_settle = 7 * 86400
+
+_extensions = {'parquet': '.parquet', 'feather': '.feather'}
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        import pyarrow.feather
+    except ImportError:
+        raise ImportError(
+            "'ArchiveStore' requires 'pyarrow', an optional dependency "
+            "(pip install -r requirements-store.txt).")
+
+    return pyarrow
+
+
+def _next_month(month):
+    return (month + timedelta(days=32)).replace(day=1)
+
+
+def _in_month(d, month):
+    return (d.year, d.month) == (month.year, month.month)
+
+
+def _iter_months(first, last):
+    month = date(first.year, first.month, 1)
+
+    while month <= last:
+        yield month
+
+        month = _next_month(month)
+
+
+class ArchiveStore(object):
+
+    def __init__(self, directory, format='parquet', not_found_ttl=86400):
+        """
+        ArchiveStore
+
+        On-disk columnar store of parsed archives, partitioned by
+        telescope and month.
+
+        Partitions are stored as '<directory>/<telescope>/YYYY-MM.parquet'
+        (or '.feather') and hold the parsed rows of every stored day of
+        the month, sorted by 'Timestamp'. The stored days are recorded in
+        the partition metadata, so the missing days of a range are found
+        without reading any rows. Only days that were over when they were
+        written are stored; they never change again. Queries read only
+        the partitions of their range and only the requested columns.
+
+        Days without an archive file (404) are recorded as well, so they
+        are not downloaded again. A file may still be uploaded late, so
+        a day recorded within a week after it ended is missing again
+        after 'not_found_ttl' seconds.
+
+        The store requires 'pyarrow', an optional dependency installed
+        with 'requirements-store.txt'; without it an 'ImportError' is
+        raised.
+
+        Parameters
+        ----------
+        directory : str
+            Store directory. It is created if it does not exist.
+
+        format : str
+            'parquet' or 'feather' (Arrow IPC).
+            Default value is 'parquet'.
+
+        not_found_ttl : int or float
+            Seconds after which a recently recorded day without an
+            archive file is downloaded again.
+            Default value is 86400.
+
+        Examples
+        --------
+        >>> from tugmeteo import TugMeteo, ArchiveStore
+        >>>
+        >>> met = TugMeteo(archive_store=ArchiveStore('~/tugmeteo-store'))
+        >>>
+        >>> # Downloads the year once, later queries read the store.
+        >>> t = met.query_meteo_archives('T100', '2018-01-01', '2019-01-01',
+                                         columns=['Temp', 'Humidity'])
+        """
+
+        super(ArchiveStore, self).__init__()
+
+        if not isinstance(directory, str):
+            raise TypeError("'directory' should be a 'str' object.")
+
+        if format not in _extensions:
+            raise ValueError("'format' must be one of 'parquet' or 'feather'.")
+
+        if not isinstance(not_found_ttl, (int, float)) or not_found_ttl < 0:
+            raise ValueError(
+                "'not_found_ttl' should be a non-negative number.")
+
+        _import_pyarrow()
+
+        self._directory = os.path.abspath(os.path.expanduser(directory))
+        self._format = format
+        self._not_found_ttl = not_found_ttl
+
+        self._lock = threading.Lock()
+
+        os.makedirs(self._directory, exist_ok=True)
+
+    @property
+    def directory(self):
+        return self._directory
+
+    @property
+    def format(self):
+        return self._format
+
+    @property
+    def not_found_ttl(self):
+        return self._not_found_ttl
+
+    def _get_path(self, telescope, month):
+        """
+        Internal using only.
+        """
+
+        name = month.strftime('%Y-%m') + _extensions[self._format]
+
+        return os.path.join(self._directory, telescope, name)
+
+    def _read_schema(self, path):
+        """
+        Internal using only.
+        """
+
+        pa = _import_pyarrow()
+
+        try:
+            if self._format == 'parquet':
+                return pa.parquet.read_schema(path)
+
+            with pa.memory_map(path) as source:
+                return pa.ipc.open_file(source).schema
+        except (OSError, pa.ArrowInvalid):
+            return None
+
+    def _read_table(self, path, columns=None):
+        """
+        Internal using only.
+        """
+
+        pa = _import_pyarrow()
+
+        if self._format == 'parquet':
+            return pa.parquet.read_table(path, columns=columns).to_pandas()
+
+        return pa.feather.read_table(path, columns=columns).to_pandas()
+
+    def _get_days(self, schema):
+        """
+        Internal using only.
+        """
+
+        if schema is None or schema.metadata is None or \
+                _days_key not in schema.metadata:
+            return set()
+
+        days = schema.metadata[_days_key].decode()
+
+        return set(date.fromisoformat(d) for d in days.split(',') if d)
+
+    def _get_not_found(self, schema):
+        """
+        Internal using only.
+        """
+
+        if schema is None or schema.metadata is None or \
+                _not_found_key not in schema.metadata:
+            return dict()
+
+        not_found = dict()
+
+        for item in schema.metadata[_not_found_key].decode().split(','):
+            if item:
+                d, checked = item.split('@')
+                not_found[date.fromisoformat(d)] = float(checked)
+
+        return not_found
+
+    def _is_not_found(self, d, checked, now):
+        """
+        Internal using only.
+        """
+
+        end = datetime(d.year, d.month, d.day) + timedelta(days=1)
+
+        if checked - end.timestamp() >= _not_found_settle:
+            return True
+
+        return now - checked < self._not_found_ttl
+
+    def _write_table(self, path, t, days, not_found):
+        """
+        Internal using only.
+        """
+
+        pa = _import_pyarrow()
+
+        table = pa.Table.from_pandas(t, preserve_index=False)
+
+        metadata = dict(table.schema.metadata or {})
+        metadata[_days_key] = ','.join(
+            d.isoformat() for d in sorted(days)).encode()
+        metadata[_not_found_key] = ','.join(
+            '{}@{:.0f}'.format(d.isoformat(), not_found[d])
+            for d in sorted(not_found)).encode()
+
+        table = table.replace_schema_metadata(metadata)
+
+        directory = os.path.dirname(path)
+
+        os.makedirs(directory, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        os.close(fd)
+        try:
+            if self._format == 'parquet':
+                pa.parquet.write_table(table, tmp_path)
+            else:
+                pa.feather.write_feather(table, tmp_path)
+
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def missing(self, telescope, dates):
+        """
+        Returns the dates that are neither stored nor known to have no
+        archive file.
+
+        Only the metadata of the partitions is read.
+
+        Parameters
+        ----------
+        telescope : str
+            Telescope name.
+
+        dates : list
+            Dates ('datetime.date').
+
+        Returns
+        -------
+        type of 'list'
+        """
+
+        stored = dict()
+        not_found = dict()
+        missing = list()
+
+        now = time.time()
+
+        for d in dates:
+            month = date(d.year, d.month, 1)
+
+            if month not in stored:
+                schema = self._read_schema(self._get_path(telescope, month))
+
+                stored[month] = self._get_days(schema)
+                not_found[month] = self._get_not_found(schema)
+
+            if d in stored[month]:
+                continue
+
+            checked = not_found[month].get(d)
+
+            if checked is None or not self._is_not_found(d, checked, now):
+                missing.append(d)
+
+        return missing
+
+    def write(self, telescope, t, dates, not_found=None):
+        """
+        Stores parsed archive of some days.
+
+        Rows are merged into the partitions of their months, replacing
+        stored rows with the same 'Timestamp'.
+
+        Parameters
+        ----------
+        telescope : str
+            Telescope name.
+
+        t : 'pandas.DataFrame'
+            Parsed archive of the days, e.g. of 'get_meteo_archives'.
+            It may be None or empty if the days have no rows.
+
+        dates : list
+            Dates ('datetime.date') of the archive. They are recorded as
+            stored, so they should be over.
+
+        not_found : list
+            Dates ('datetime.date') without an archive file (404).
+        """
+
+        if not_found is None:
+            not_found = list()
+
+        months = dict()
+
+        for d in list(dates) + list(not_found):
+            months.setdefault(date(d.year, d.month, 1), list())
+
+        if t is not None and not t.empty:
+            timestamps = t['Timestamp']
+            keys = timestamps.dt.year * 12 + timestamps.dt.month - 1
+
+            for key, rows in t.groupby(keys.to_numpy(), sort=False):
+                months.setdefault(date(key // 12, key % 12 + 1, 1),
+                                  list()).append(rows)
+
+        now = time.time()
+
+        with self._lock:
+            for month, tables in months.items():
+                path = self._get_path(telescope, month)
+                schema = self._read_schema(path)
+
+                days = self._get_days(schema)
+                days.update(d for d in dates if _in_month(d, month))
+
+                month_not_found = self._get_not_found(schema)
+                month_not_found.update(
+                    (d, now) for d in not_found if _in_month(d, month))
+
+                for d in days:
+                    month_not_found.pop(d, None)
+
+                if schema is not None:
+                    tables.insert(0, self._read_table(path))
+
+                if tables:
+                    r = pd.concat(tables, ignore_index=True)
+                    r = r.drop_duplicates('Timestamp', keep='last')
+                    r = r.sort_values('Timestamp', kind='stable')
+                    r = r.reset_index(drop=True)
+                else:
+                    r = pd.DataFrame({'Timestamp': pd.to_datetime([])})
+
+                self._write_table(path, r, days, month_not_found)
+
+    def read(self, telescope, start, end, columns=None):
+        """
+        Returns stored rows of a time range.
+
+        Parameters
+        ----------
+        telescope : str
+            Telescope name.
+
+        start : 'datetime.datetime'
+            Start of the range.
+
+        end : 'datetime.datetime'
+            End of the range (excluded).
+
+        columns : list
+            Columns besides 'Timestamp'. Columns missing in the store are
+            filled with NaN. If None, all columns are returned.
+
+        Returns
+        -------
+        'pandas.DataFrame'
+            Rows in 'Timestamp' order, or None if there are none.
+        """
+
+        if start >= end:
+            return None
+
+        tables = list()
+
+        for month in _iter_months(start.date(),
+                                  (end - timedelta(microseconds=1)).date()):
+            path = self._get_path(telescope, month)
+            schema = self._read_schema(path)
+
+            if schema is None:
+                continue
+
+            names = None
+            if columns is not None:
+                names = ['Timestamp'] + [c for c in columns
+                                         if c in schema.names]
+
+            t = self._read_table(path, names)
+
+            next_month = _next_month(month)
+
+            month_start = datetime(month.year, month.month, 1)
+            month_end = datetime(next_month.year, next_month.month, 1)
+
+            if start > month_start or end < month_end:
+                t = t[((t['Timestamp'] >= start) &
+                       (t['Timestamp'] < end)).to_numpy()]
+
+            if not t.empty:
+                tables.append(t)
+
+        if not tables:
+            return None
+
+        t = pd.concat(tables, ignore_index=True)
+
+        if columns is not None:
+            t = t.reindex(columns=['Timestamp'] + list(columns))
+
+        return t
+
+    def clear(self, telescope=None):
+        """
+        Removes stored partitions.
+
+        Parameters
+        ----------
+        telescope : str
+            Telescope name. If None, all telescopes are cleared.
+        """
+
+        extension = _extensions[self._format]
+
+        with self._lock:
+            for root, _, names in os.walk(self._directory):
+                if telescope is not None and \
+                        os.path.basename(root) != telescope:
+                    continue
+
+                for name in names:
+                    if not name.endswith(extension):
+                        continue
+
+                    try:
+                        os.remove(os.path.join(root, name))
+                    except OSError:
+                        continue
@@ -0,0 +1,305 @@
+#!/usr/bin/env python
+
+__all__ = ['generate_meteo_page', 'generate_meteo_archive']
+
+import random
+from datetime import datetime, timedelta
+
+
+_rtt150_keywords = [
+    ('Temperature', -10.0, 25.0, '&deg;C'),
+    ('Dome Temperature', -5.0, 25.0, '&deg;C'),
+    ('Coude Temperature', -5.0, 25.0, '&deg;C'),
+    ('Humidity', 5.0, 100.0, '%'),
+    ('Dome Humidity', 5.0, 100.0, '%'),
+    ('Coude Humidity', 5.0, 100.0, '%'),
+    ('Barometer', 740.0, 765.0, 'mb'),
+    ('Wind', 0.0, 90.0, 'km/h'),
+    ('Wind Chill', -20.0, 25.0, '&deg;C'),
+    ('Dewpoint', -25.0, 10.0, '&deg;C'),
+    ('High Temperature', -5.0, 30.0, '&deg;C'),
+    ('Low Temperature', -15.0, 20.0, '&deg;C'),
+    ('High Humidity', 20.0, 100.0, '%'),
+    ('Low Humidity', 5.0, 60.0, '%'),
+    ('High Barometer', 745.0, 765.0, 'mb'),
+    ('Low Barometer', 740.0, 760.0, 'mb'),
+    ('High Wind', 0.0, 140.0, 'km/h'),
+    ('Est. Cumulus Base', 500.0, 3000.0, 'm')]
+
+_davis_current_keywords = [
+    ('TEMPERATURE', -10.0, 25.0),
+    ('Inside Temperature', -5.0, 25.0),
+    ('HUMIDITY', 5.0, 100.0),
+    ('Inside Humidity', 5.0, 100.0),
+    ('PRESSURE', 740.0, 765.0),
+    ('WINDSPEED', 0.0, 90.0),
+    ('WINDDIR', 0.0, 359.0),
+    ('RAIN', 0.0, 5.0),
+    ('UV', 0.0, 11.0),
+    ('Solar Radiation', 0.0, 1100.0),
+    ('Air Density', 0.9, 1.1),
+    ('Est. Cumulus Base', 500.0, 3000.0)]
+
+_davis_daily_keywords = [
+    ('Wind Chill', -20.0, 25.0, '&deg;C'),
+    ('Dew Point', -25.0, 10.0, '&deg;C'),
+    ('High Temperature', -5.0, 30.0, '&deg;C'),
+    ('Low Temperature', -15.0, 20.0, '&deg;C'),
+    ('High Humidity', 20.0, 100.0, '%'),
+    ('Low Humidity', 5.0, 60.0, '%'),
+    ('High Barometer', 745.0, 765.0, 'mb'),
+    ('Low Barometer', 740.0, 760.0, 'mb'),
+    ('High Wind', 0.0, 140.0, 'km/h')]
+
+_archive_columns = {
+    'RTT150': [
+        ('Temp', -10.0, 25.0, 1, 'C'),
+        ('Chill', -20.0, 25.0, 1, 'C'),
+        ('HIndex', -10.0, 25.0, 1, 'C'),
+        ('Humid', 5.0, 100.0, 0, '%'),
+        ('Dewpt', -25.0, 10.0, 1, 'C'),
+        ('Wind', 0.0, 90.0, 0, 'kmh'),
+        ('HiWind', 0.0, 140.0, 0, 'kmh'),
+        ('Barom', 740.0, 765.0, 1, 'mb')],
+    'T100': [
+        ('Temp', -10.0, 25.0, 1, 'C'),
+        ('Chill', -20.0, 25.0, 1, 'C'),
+        ('HIndex', -10.0, 25.0, 1, 'C'),
+        ('Humid', 5.0, 100.0, 0, '%'),
+        ('Dewpt', -25.0, 10.0, 1, 'C'),
+        ('Wind', 0.0, 90.0, 0, 'kmh'),
+        ('HiWind', 0.0, 140.0, 0, 'kmh'),
+        ('WindDir', 0.0, 359.0, 0, 'deg'),
+        ('Rain', 0.0, 5.0, 1, 'mm'),
+        ('Barom', 740.0, 765.0, 1, 'mb'),
+        ('Solar', 0.0, 1100.0, 0, 'wm2'),
+        ('ET', 0.0, 0.1, 3, 'mm'),
+        ('UV', 0.0, 11.0, 1, 'idx')]}
+
+_archive_columns['T60'] = _archive_columns['T100']
+
+_wind_directions = ['N', 'NNE', 'NE', 'ENE', 'E', 'ESE', 'SE', 'SSE',
+                    'S', 'SSW', 'SW', 'WSW', 'W', 'WNW', 'NW', 'NNW']
+
+_page_header = '''<!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 4.01 Transitional//EN"
+  "http://www.w3.org/TR/html4/loose.dtd">
+<html>
+<head>
+<meta http-equiv="Content-Type" content="text/html; charset=iso-8859-9">
+<meta http-equiv="refresh" content="60">
+<title>{title}</title>
+<style type="text/css">
+body {{ font-family: Verdana, Arial; font-size: 11px; }}
+b {{ color: #003366; }}
+</style>
+</head>
+<body bgcolor="#FFFFFF">
+<table width="760" border="0" align="center" cellpadding="2"
+       cellspacing="0">
+  <tr>
+    <td align="center"><b>TUBITAK National Observatory</b>
+      <br><b>{title}</b></td>
+  </tr>
+</table>
+'''
+
+_page_footer = '''<table width="760" border="0" align="center">
+  <tr><td align="center"><font size="1">Updated every minute.
+  <!-- <b>not a reading</b> -->
+  </font></td></tr>
+</table>
+</body>
+</html>
+'''
+
+
+def _random_value(rng, low, high, digits=1):
+    return round(rng.uniform(low, high), digits)
+
+
+def _generate_rtt150_page(rng, values):
+    rows = list()
+    for i, (keyword, low, high, unit) in enumerate(_rtt150_keywords):
+        value = values.get(keyword, _random_value(rng, low, high))
+        if i == 7:
+            text = 'from {} at {:g} {}'.format(
+                rng.choice(_wind_directions), value, unit)
+        else:
+            text = '{}&nbsp; {}'.format(value, unit)
+
+        values[keyword] = float(value)
+        rows.append(
+            '    <tr>\n'
+            '      <td width="45%"><font size="2"><strong>{}:</strong>'
+            '</font></td>\n'
+            '      <td><font size="2"><b>{}</b></font></td>\n'
+            '    </tr>\n'.format(keyword, text))
+
+    return (_page_header.format(title='RTT150 Weather Station') +
+            '<table width="760" align="center"><tr><td>\n'
+            '  <table cellspacing="1" cellpadding="0" width="100%" '
+            'align="left" border="0">\n' + ''.join(rows) +
+            '  </table>\n</td></tr></table>\n' + _page_footer)
+
+
+def _generate_davis_page(rng, values, title, leading, text_rows):
+    rows = list()
+
+    for i in range(leading - 2):
+        rows.append('<a href="#{0}"><b>Link {0}</b></a>\n'.format(i))
+
+    current = list()
+    for keyword, low, high in _davis_current_keywords:
+        digits = 0 if keyword in ('WINDDIR', 'Solar Radiation') else 1
+        digits = 3 if keyword == 'Air Density' else digits
+        value = values.get(keyword, _random_value(rng, low, high, digits))
+
+        values[keyword] = float(value)
+        current.append(
+            '    <tr><td><font size="2"><strong>{} = {}</strong>'
+            '</font></td></tr>\n'.format(keyword, value))
+
+    for text in text_rows:
+        current.append(
+            '    <tr><td><strong>{}</strong></td></tr>\n'.format(text))
+
+    daily = list()
+    for keyword, low, high, unit in _davis_daily_keywords:
+        value = values.get(keyword, _random_value(rng, low, high))
+
+        values[keyword] = float(value)
+        daily.append(
+            '    <tr><td><b>{} = {}</b></td><td><b>{}</b></td></tr>\n'.format(
+                keyword, value, unit))
+
+    return (_page_header.format(title=title) + ''.join(rows) +
+            '\n<table cellspacing="1" cellpadding="0" width="100%" '
+            'align="left">\n' + ''.join(current) + '</table>\n'
+            '<table width="100%">\n' + ''.join(daily) + '</table>\n' +
+            _page_footer)
+
+
+def generate_meteo_page(telescope, values=None, seed=None):
+    """
+    Generates a live meteorology page in the layout of a station.
+
+    Pages are synthetic stand-ins of the real station pages, produced in
+    the same markup that 'parse_meteo_page' reads.
+
+    Parameters
+    ----------
+    telescope : str
+        Telescope name. It must be one of 'RTT150', 'T100' or 'T60'.
+
+    values : dict
+        Readings to put on the page, keyed by the keywords returned by
+        'parse_meteo_page'. Missing readings are random.
+        The dict is updated with the readings that were used.
+
+    seed : int
+        Seed of the random readings.
+
+    Returns
+    -------
+    type of 'str'
+        HTML page.
+
+    Examples
+    --------
+    >>> from tugmeteo.helper import parse_meteo_page
+    >>> from tugmeteo.synthetic import generate_meteo_page
+    >>>
+    >>> values = dict()
+    >>> html = generate_meteo_page('T60', values, seed=1)
+    >>> meteo = parse_meteo_page(html, 'T60')
+    """
+
+    if values is None:
+        values = dict()
+
+    rng = random.Random(seed)
+
+    telescope = telescope.upper()
+
+    if telescope == 'RTT150':
+        return _generate_rtt150_page(rng, values)
+    elif telescope == 'T100':
+        return _generate_davis_page(rng, values, 'T100 Weather Station', 12,
+                                    [])
+    elif telescope == 'T60':
+        return _generate_davis_page(rng, values, 'T60 Weather Station', 15,
+                                    ['FORECAST = Mostly clear'])
+
+    raise ValueError("'telescope' must be one of 'RTT150', 'T100' or 'T60'.")
+
+
+def generate_meteo_archive(telescope, date, interval=5, invalid_rate=0.0,
+                           seed=None):
+    """
+    Generates a daily 'ARC-YYYY-MM-DD.txt' archive file of a station.
+
+    Files are synthetic stand-ins of the real archive files: a padded
+    header line, a unit line and one tab separated row per 'interval'
+    minutes, from the first interval after midnight up to the next
+    midnight.
+
+    Parameters
+    ----------
+    telescope : str
+        Telescope name. It must be one of 'RTT150', 'T100' or 'T60'.
+
+    date : 'datetime.date'
+        Date of the archive.
+
+    interval : int
+        Minutes between rows.
+        Default value is 5.
+
+    invalid_rate : float
+        Fraction of rows that carry an invalid (below -50) reading.
+        Default value is 0.0.
+
+    seed : int
+        Seed of the random readings. If None, it is derived from the date.
+
+    Returns
+    -------
+    type of 'str'
+        Archive file content.
+    """
+
+    telescope = telescope.upper()
+
+    if telescope not in _archive_columns:
+        raise ValueError(
+            "'telescope' must be one of 'RTT150', 'T100' or 'T60'.")
+
+    columns = _archive_columns[telescope]
+
+    if seed is None:
+        seed = date.toordinal()
+
+    rng = random.Random(seed)
+
+    lines = list()
+    lines.append('--Timestamp---\t' + '\t'.join(
+        ' {:>6} '.format(c[0]) for c in columns))
+    lines.append('yyyymmdd hh:mm\t' + '\t'.join(
+        ' {:>6} '.format(c[4]) for c in columns))
+
+    t = datetime(date.year, date.month, date.day)
+    end = t + timedelta(days=1)
+    t = t + timedelta(minutes=interval)
+
+    while t <= end:
+        values = ['{:.{}f}'.format(rng.uniform(low, high), digits)
+                  for _, low, high, digits, _ in columns]
+
+        if invalid_rate and rng.random() < invalid_rate:
+            values[rng.randrange(len(values))] = '-99.9'
+
+        lines.append(t.strftime('%Y%m%d %H:%M') + '\t' + '\t'.join(values))
+
+        t = t + timedelta(minutes=interval)
+
+    return '\r\n'.join(lines) + '\r\n'